@@ -0,0 +1,683 @@
+"""
+End-to-end load test of the API: scenario mixes against the real app.
+
+    python -m benchmarks.load --backend memory --output load.json
+    python -m benchmarks.load --backend mongo --transport uvicorn --concurrency 200
+    python -m benchmarks.load --baseline before.json --output after.json
+
+Scenarios (all by default, or pick with --scenario):
+    login_storm      POST /auth/login (bcrypt-bound)
+    refresh_churn    POST /auth/refresh, each client following its own
+                     rotating token chain
+    event_browsing   GET /events and GET /events/{id}, 4:1
+    registration     POST /registrations flash crowd on a single event
+    checkin_burst    POST /attendance/batch from gate devices (mongo only:
+                     attendance storage is not behind the repositories)
+
+Transports:
+    asgi     requests go straight into the ASGI app in this process;
+             CPU per request covers client and app together
+    uvicorn  the app runs in a child uvicorn process on localhost; CPU
+             per request is the server's alone (Linux /proc)
+
+Backends:
+    memory   in-process repositories: the framework, auth and
+             serialization cost with no database latency
+    mongo    MONGO_URI with a throwaway `<MONGO_DB_NAME>_bench` database
+             that is dropped afterwards
+
+The fixture (users, events, refresh tokens, registrations) is derived
+from --users / --events alone, so the client and a child server build
+the same one independently. Background workers (log shipping, stats
+reconciliation...) are not started: only the request path is measured.
+
+Results are one JSON document (stdout, or --output) with RPS, mean /
+p50 / p95 / p99 / max latency, status counts and CPU ms per request per
+scenario, tagged with the git commit. --baseline compares against an
+earlier run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from uuid import NAMESPACE_URL, uuid5
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# Environment (before the app is imported)
+# -------------------------------------------------------------------
+
+BENCH_API_KEY = "bench-api-key"
+BENCH_PASSWORD = "bench-password"
+
+os.environ.setdefault("CLIENT_API_KEY", BENCH_API_KEY)
+# every simulated client shares one IP: measure the service, not the limiter
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ["MONGO_DB_NAME"] = f"{os.getenv('MONGO_DB_NAME', 'horizon').removesuffix('_bench')}_bench"
+
+
+def ensure_jwt_keys() -> None:
+    """
+    Generates a throwaway RSA key pair when none is configured.
+    """
+    if os.getenv("JWT_PRIVATE_KEY") and os.getenv("JWT_PUBLIC_KEY"):
+        return
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    os.environ["JWT_PRIVATE_KEY"] = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    os.environ["JWT_PUBLIC_KEY"] = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+
+# -------------------------------------------------------------------
+# Fixture
+# -------------------------------------------------------------------
+
+CHECKIN_BATCH = 20
+
+_BASE_TIME = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def bench_id(kind: str, index: int) -> str:
+    return str(uuid5(NAMESPACE_URL, f"bench/{kind}/{index}"))
+
+
+class Fixture:
+
+    def __init__(self, users: int, events: int):
+        self.users = users
+        self.events = max(events, 2)
+
+    def user_id(self, index: int) -> str:
+        return bench_id("user", index)
+
+    def email(self, index: int) -> str:
+        return f"bench{index}@bench.awslpu.in"
+
+    def university_uid(self, index: int) -> str:
+        return f"BENCH{index:07d}"
+
+    def device_id(self, index: int) -> str:
+        return f"bench-device-{index}"
+
+    def refresh_token(self, index: int) -> str:
+        return f"bench-refresh-{index}-{bench_id('refresh', index)}"
+
+    def event_id(self, index: int) -> str:
+        return bench_id("event", index)
+
+    # event 0 takes the registration flash crowd, event 1 the check-ins
+    @property
+    def registration_event(self) -> str:
+        return self.event_id(0)
+
+    @property
+    def checkin_event(self) -> str:
+        return self.event_id(1)
+
+    async def seed(self) -> None:
+        from core.auth.passwords import hash_password
+        from db.codec import encode_id
+        from db.repositories.backend import get_repositories
+        from models.auth.utils import hash_refresh_token
+
+        repositories = get_repositories()
+        now = datetime.now(timezone.utc)
+        # one bcrypt hash shared by everyone: seeding stays fast, login stays realistic
+        password_hash = hash_password(BENCH_PASSWORD)
+
+        for index in range(self.users):
+            user_key = encode_id(self.user_id(index))
+            await repositories.users.insert({
+                "_id": user_key,
+                "first_name": "Bench",
+                "last_name": f"User{index}",
+                "email": self.email(index),
+                "phone_number": "9000000000",
+                "university_name": "Bench University",
+                "university_uid": self.university_uid(index),
+                "graduation_year": 2030,
+                "degree_program": "B.Tech",
+                "hostel": f"H{index % 8}",
+                "password_hash": password_hash,
+                "role": "attendee",
+                "auth_provider": "local",
+                "provider_id": None,
+                "email_verified": True,
+                "schema_version": 2,
+                "created_at": now,
+                "updated_at": now,
+            })
+            await repositories.refresh_tokens.insert({
+                "token_hash": hash_refresh_token(self.refresh_token(index)),
+                "user_id": user_key,
+                "role": "attendee",
+                "device_id": self.device_id(index),
+                "expires_at": now + timedelta(days=1),
+                "revoked": False,
+                "created_at": now,
+            })
+
+        creator = encode_id(self.user_id(0))
+        for index in range(self.events):
+            start = _BASE_TIME + timedelta(days=index)
+            await repositories.events.insert({
+                "_id": encode_id(self.event_id(index)),
+                "title": f"Bench Event {index}",
+                "level": "beginner",
+                "start_time": start,
+                "end_time": start + timedelta(hours=3),
+                "location": "Main Auditorium",
+                "banner_url": "https://awslpu.in/banner.png",
+                "registration_mode": "internal",
+                "meetup_url": None,
+                "price": None,
+                "currency": None,
+                "capacity": self.users + 1,
+                "short_description": "Benchmark event",
+                "description": "Generated by benchmarks.load. " * 20,
+                "agenda": None,
+                "rules": None,
+                "contact_email": None,
+                "status": "published",
+                "attendance_enabled": index == 1,
+                "certificate_enabled": False,
+                "registered_count": self.users if index == 1 else 0,
+                "created_by": creator,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        checkin_event = encode_id(self.checkin_event)
+        for start in range(0, self.users, 1000):
+            await repositories.registrations.insert_many([
+                {"event_id": checkin_event, "university_uid": self.university_uid(index), "registered_at": now}
+                for index in range(start, min(start + 1000, self.users))
+            ])
+
+
+# -------------------------------------------------------------------
+# Scenarios
+# -------------------------------------------------------------------
+
+def set_cookie_value(response, name: str) -> str | None:
+    for header in response.headers.get_list("set-cookie"):
+        cookie, _, _ = header.partition(";")
+        key, _, value = cookie.partition("=")
+        if key.strip() == name:
+            return value.strip().strip('"')
+    return None
+
+
+class Scenario(ABC):
+    name = ""
+    expected_status = 200
+    default_requests = 2000
+    mongo_only = False
+
+    def __init__(self, fixture: Fixture):
+        self.fixture = fixture
+
+    def clients(self, concurrency: int) -> int:
+        return concurrency
+
+    def requests(self, requested: int | None) -> int:
+        return requested or self.default_requests
+
+    def prepare(self, requests: int) -> None:
+        """
+        Untimed setup (client-side work such as minting tokens).
+        """
+
+    @abstractmethod
+    async def call(self, client, worker: int, index: int):
+        """
+        One timed request; returns the response.
+        """
+
+
+class LoginStorm(Scenario):
+    name = "login_storm"
+    default_requests = 200
+
+    async def call(self, client, worker, index):
+        user = index % self.fixture.users
+        return await client.post("/auth/login", json={
+            "email": self.fixture.email(user),
+            "password": BENCH_PASSWORD,
+            "device_id": self.fixture.device_id(user),
+        }, headers={"X-DEVICE-ID": self.fixture.device_id(user)})
+
+
+class RefreshChurn(Scenario):
+    name = "refresh_churn"
+
+    def __init__(self, fixture):
+        super().__init__(fixture)
+        # worker -> current refresh token of its chain
+        self.tokens: dict[int, str] = {}
+
+    def clients(self, concurrency):
+        # one token chain per client, one seeded token per user
+        return min(concurrency, self.fixture.users)
+
+    async def call(self, client, worker, index):
+        token = self.tokens.get(worker) or self.fixture.refresh_token(worker)
+        response = await client.post(
+            "/auth/refresh",
+            headers={
+                "X-DEVICE-ID": self.fixture.device_id(worker),
+                "Cookie": f"refresh_token={token}",
+            },
+        )
+        rotated = set_cookie_value(response, "refresh_token")
+        if rotated:
+            self.tokens[worker] = rotated
+        return response
+
+
+class EventBrowsing(Scenario):
+    name = "event_browsing"
+    default_requests = 5000
+
+    async def call(self, client, worker, index):
+        if index % 5 == 0:
+            return await client.get("/events/" + self.fixture.event_id(index % self.fixture.events))
+        return await client.get("/events")
+
+
+class RegistrationFlashCrowd(Scenario):
+    name = "registration"
+    expected_status = 201
+
+    def __init__(self, fixture):
+        super().__init__(fixture)
+        self.tokens: list[str] = []
+
+    def requests(self, requested):
+        # one registration per user: repeats would only measure the 400 path
+        return min(requested or self.fixture.users, self.fixture.users)
+
+    def prepare(self, requests):
+        from core.auth.jwt import create_access_token
+        from models.auth.enums import UserRole
+
+        self.tokens = [
+            create_access_token(user_id=self.fixture.user_id(user), role=UserRole.attendee)
+            for user in range(requests)
+        ]
+
+    async def call(self, client, worker, index):
+        return await client.post(
+            "/registrations",
+            json={
+                "event_id": self.fixture.registration_event,
+                "university_uid": self.fixture.university_uid(index),
+            },
+            headers={"Authorization": f"Bearer {self.tokens[index]}"},
+        )
+
+
+class CheckinBurst(Scenario):
+    name = "checkin_burst"
+    mongo_only = True
+
+    def __init__(self, fixture):
+        super().__init__(fixture)
+        self.token = ""
+
+    def prepare(self, requests):
+        from core.auth.jwt import create_access_token
+        from models.auth.enums import UserRole
+
+        self.token = create_access_token(user_id=self.fixture.user_id(0), role=UserRole.manager)
+
+    async def call(self, client, worker, index):
+        first = index * CHECKIN_BATCH
+        return await client.post(
+            "/attendance/batch",
+            json={"scans": [
+                {
+                    "event_id": self.fixture.checkin_event,
+                    "university_uid": self.fixture.university_uid((first + offset) % self.fixture.users),
+                    "action": "checkin",
+                }
+                for offset in range(CHECKIN_BATCH)
+            ]},
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (LoginStorm, RefreshChurn, EventBrowsing, RegistrationFlashCrowd, CheckinBurst)
+}
+
+
+# -------------------------------------------------------------------
+# Measurement
+# -------------------------------------------------------------------
+
+def percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def process_cpu_seconds(pid: int | None) -> float | None:
+    """
+    CPU time of this process, or of a child server on Linux.
+    """
+    if pid is None:
+        return time.process_time()
+
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            # fields after the parenthesised command name; utime and stime are 14 and 15
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+async def run_scenario(scenario: Scenario, client, requests: int, concurrency: int, server_pid: int | None) -> dict:
+    workers = scenario.clients(concurrency)
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    next_index = 0
+
+    async def worker(number: int) -> None:
+        nonlocal next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+
+            start = time.perf_counter()
+            try:
+                response = await scenario.call(client, number, index)
+                statuses[str(response.status_code)] += 1
+            except Exception as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    cpu_before = process_cpu_seconds(server_pid)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(workers)))
+    elapsed = time.perf_counter() - start
+    cpu_after = process_cpu_seconds(server_pid)
+
+    latencies.sort()
+    completed = len(latencies)
+    cpu_ms = (
+        round((cpu_after - cpu_before) * 1000 / completed, 3)
+        if completed and cpu_before is not None and cpu_after is not None
+        else None
+    )
+
+    return {
+        "scenario": scenario.name,
+        "requests": completed,
+        "concurrency": workers,
+        "errors": completed - statuses.get(str(scenario.expected_status), 0),
+        "statuses": dict(sorted(statuses.items())),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(completed / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / completed, 3) if completed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "cpu_ms_per_request": cpu_ms,
+    }
+
+
+# -------------------------------------------------------------------
+# App lifecycle
+# -------------------------------------------------------------------
+
+async def prepare_app(backend: str, fixture: Fixture):
+    """
+    Imports the app, selects the backend and seeds the fixture.
+    """
+    ensure_jwt_keys()
+
+    from db.repositories.backend import use_backend
+    from core.registrations.ingest import registration_ingestor, REGISTRATION_WRITE_BEHIND
+    from main import app
+
+    use_backend(backend)
+
+    if backend == "mongo":
+        from db.indexes import create_indexes
+        from db.mongo import get_database, get_mongo_client
+
+        await get_mongo_client().drop_database(get_database().name)
+        await create_indexes()
+
+    await fixture.seed()
+
+    if REGISTRATION_WRITE_BEHIND:
+        registration_ingestor.start()
+
+    return app
+
+
+async def release_app(backend: str) -> None:
+    from core.registrations.ingest import registration_ingestor
+    from core.events.live import close_broadcasters
+
+    await registration_ingestor.stop()
+    close_broadcasters()
+
+    if backend == "mongo":
+        from db.mongo import get_database, get_mongo_client, reset_connection_cache
+
+        await get_mongo_client().drop_database(get_database().name)
+        await get_mongo_client().close()
+        reset_connection_cache()
+
+
+async def serve(args) -> None:
+    """
+    Child process of --transport uvicorn.
+    """
+    import uvicorn
+
+    fixture = Fixture(args.users, args.events)
+    app = await prepare_app(args.backend, fixture)
+
+    server = uvicorn.Server(uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=args.port,
+        lifespan="off",
+        log_level="warning",
+        access_log=False,
+        backlog=4096,
+    ))
+    try:
+        await server.serve()
+    finally:
+        await release_app(args.backend)
+
+
+async def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 120) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Benchmark server exited with status {process.returncode}")
+            try:
+                if (await client.get("/openapi.json")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError("Benchmark server did not become ready")
+
+
+# -------------------------------------------------------------------
+# Reporting
+# -------------------------------------------------------------------
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(results: list[dict], baseline: dict | None) -> None:
+    previous = {result["scenario"]: result for result in (baseline or {}).get("scenarios", [])}
+
+    for result in results:
+        if "skipped" in result:
+            print(f"{result['scenario']:<16} skipped: {result['skipped']}", file=sys.stderr)
+            continue
+
+        cpu = result["cpu_ms_per_request"]
+        line = (
+            f"{result['scenario']:<16} {result['rps']:>9.1f} req/s   "
+            f"p50 {result['p50_ms']:>8.2f}   p95 {result['p95_ms']:>8.2f}   p99 {result['p99_ms']:>8.2f} ms   "
+            f"cpu {cpu if cpu is not None else '-':>7} ms/req   errors {result['errors']}"
+        )
+
+        before = previous.get(result["scenario"])
+        if before and before.get("rps") and before.get("p99_ms"):
+            line += (
+                f"   [rps {(result['rps'] / before['rps'] - 1) * 100:+.1f}%"
+                f"  p99 {(result['p99_ms'] / before['p99_ms'] - 1) * 100:+.1f}%]"
+            )
+        print(line, file=sys.stderr)
+
+
+async def main(args) -> None:
+    import httpx
+
+    fixture = Fixture(args.users, args.events)
+    names = args.scenario or list(SCENARIOS)
+    server = None
+    server_pid = None
+
+    if args.transport == "asgi":
+        app = await prepare_app(args.backend, fixture)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        base_url = "http://bench"
+    else:
+        ensure_jwt_keys()
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "benchmarks.load", "--serve",
+                "--backend", args.backend,
+                "--users", str(args.users),
+                "--events", str(args.events),
+                "--port", str(args.port),
+            ],
+            env=os.environ.copy(),
+        )
+        server_pid = server.pid
+        base_url = f"http://127.0.0.1:{args.port}"
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency),
+        )
+
+    results = []
+    try:
+        if server:
+            await wait_until_ready(base_url, server)
+
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url=base_url,
+            headers={"X-API-KEY": os.environ["CLIENT_API_KEY"], "X-DEVICE-ID": "bench-client"},
+            timeout=args.timeout,
+        ) as client:
+            for name in names:
+                scenario = SCENARIOS[name](fixture)
+                if scenario.mongo_only and args.backend != "mongo":
+                    results.append({"scenario": name, "skipped": "needs --backend mongo"})
+                    continue
+
+                print(f"running {name}...", file=sys.stderr)
+                requests = scenario.requests(args.requests)
+                scenario.prepare(requests)
+                results.append(await run_scenario(scenario, client, requests, args.concurrency, server_pid))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+        else:
+            await release_app(args.backend)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "backend": args.backend,
+        "transport": args.transport,
+        "cpu_scope": "server process" if server else "client and app (one process)",
+        "users": fixture.users,
+        "events": fixture.events,
+        "scenarios": results,
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    print_summary(results, baseline)
+
+    document = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(document + "\n")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=("memory", "mongo"), default="memory")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="requests per scenario (default: per scenario)")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    asyncio.run(serve(args) if args.serve else main(args))
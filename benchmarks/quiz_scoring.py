@@ -0,0 +1,80 @@
+"""
+Batch quiz scoring on a synthetic answer set (no database).
+
+    python -m benchmarks.quiz_scoring --participants 10000 --questions 50
+
+Generates per-user answer groups shaped like the output of
+`answer_groups` (core/quiz/scoring.py) and times the two stages
+separately: building the users x questions matrices from chunks of
+groups, and the vectorized scoring. The grouping itself (server side),
+database reads and result writes are not included.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from uuid import uuid4
+
+from core.quiz.scoring import AnswerMatrixBuilder, score_matrix, SCORING_CHUNK_SIZE
+
+OPTION_IDS = ["A", "B", "C", "D"]
+
+
+def synthetic_quiz(questions: int) -> list[dict]:
+    return [
+        {
+            "question": f"Question {q}",
+            "options": [{"id": option_id, "text": option_id} for option_id in OPTION_IDS],
+            "correct_option_id": random.choice(OPTION_IDS),
+        }
+        for q in range(questions)
+    ]
+
+
+def synthetic_groups(participants: int, questions: int, answer_rate: float) -> tuple[list[dict], int]:
+    groups = []
+    for user_id in sorted(uuid4() for _ in range(participants)):
+        answered = [q for q in range(questions) if random.random() < answer_rate]
+        groups.append({
+            "_id": user_id,
+            "questions": answered,
+            "options": [random.choice(OPTION_IDS) for _ in answered],
+            "latencies": [random.randint(300, 20000) for _ in answered],
+        })
+    return groups, sum(len(group["questions"]) for group in groups)
+
+
+def main(participants: int, questions: int, answer_rate: float, runs: int) -> None:
+    quiz = synthetic_quiz(questions)
+    groups, answers = synthetic_groups(participants, questions, answer_rate)
+    print(f"{participants} participants x {questions} questions, {answers} answers")
+
+    build_times, score_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        builder = AnswerMatrixBuilder(quiz)
+        for offset in range(0, len(groups), SCORING_CHUNK_SIZE):
+            builder.add(groups[offset:offset + SCORING_CHUNK_SIZE])
+        choices, latency = builder.build()
+        built = time.perf_counter()
+
+        score_matrix(choices, latency, builder.correct, len(OPTION_IDS), passing_score_percentage=60)
+        scored = time.perf_counter()
+
+        build_times.append((built - start) * 1000)
+        score_times.append((scored - built) * 1000)
+
+    print(f"{'build matrix':<14} median {statistics.median(build_times):>8.1f} ms")
+    print(f"{'score':<14} median {statistics.median(score_times):>8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--participants", type=int, default=10000)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--answer-rate", type=float, default=0.9)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.participants, args.questions, args.answer_rate, args.runs)
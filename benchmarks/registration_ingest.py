@@ -0,0 +1,87 @@
+"""
+Direct vs write-behind registration writes against a real MongoDB.
+
+    python -m benchmarks.registration_ingest --requests 5000 --concurrency 500
+
+Uses MONGO_URI and a throwaway `<MONGO_DB_NAME>_bench` database that is
+dropped afterwards. Both modes issue exactly the write the
+`POST /registrations` route does, so the difference is pool checkouts
+and round trips, not request handling.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ["MONGO_DB_NAME"] = f"{os.getenv('MONGO_DB_NAME', 'horizon')}_bench"
+
+from db.codec import encode_id
+from db.collections import registration_collection
+from db.indexes import create_indexes
+from db.mongo import get_database, get_mongo_client
+from core.registrations.ingest import RegistrationIngestor
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(label: str, write, requests: int, concurrency: int) -> None:
+    await registration_collection().delete_many({})
+
+    event_id = encode_id(uuid4())
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        doc = {
+            "event_id": event_id,
+            "university_uid": f"bench-{index}",
+            "registered_at": datetime.now(timezone.utc),
+        }
+        async with semaphore:
+            start = time.perf_counter()
+            await write(doc)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<14} {requests / elapsed:>10.0f} req/s   "
+        f"p50 {statistics.median(latencies):>7.2f} ms   "
+        f"p99 {percentile(latencies, 99):>7.2f} ms"
+    )
+
+
+async def main(requests: int, concurrency: int, flush_ms: int) -> None:
+    await create_indexes()
+
+    await run("direct", registration_collection().insert_one, requests, concurrency)
+
+    ingestor = RegistrationIngestor(max_queue=requests, flush_interval_ms=flush_ms)
+    ingestor.start()
+    await run("write-behind", ingestor.submit, requests, concurrency)
+    await ingestor.stop()
+
+    await get_mongo_client().drop_database(get_database().name)
+    await get_mongo_client().close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--flush-ms", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.flush_ms))
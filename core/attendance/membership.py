@@ -0,0 +1,180 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from db.codec import encode_id, decode_id
+from db.collections import event_collection, registration_collection
+
+# -------------------------------------------------------------------
+# Registrant membership index
+#
+# For every event open for attendance this worker keeps the exact set
+# of registered university_uids, loaded with one cursor pass and kept
+# current by register / cancel / import. A check-in hit is a set lookup.
+# A miss is confirmed against `registrations` before it is rejected,
+# because another worker may have taken the registration.
+#
+# An exact set is used rather than a Bloom filter. At campus scale
+# (tens of thousands of registrants) it costs a few MB. It also gives
+# no false positives for this worker's own writes.
+#
+# Cancellations made through another worker are not seen here, so a
+# loaded set is only trusted for MEMBERSHIP_TTL_SECONDS. After that it
+# is reloaded on next use, and check-ins are confirmed against the
+# database until the reload finishes. Consistency bound: a registration
+# cancelled through another worker can still be checked in here for at
+# most MEMBERSHIP_TTL_SECONDS (plus the reload time). New registrations
+# are never missed (misses always go to the database).
+#
+# Memberships are evicted once the event has ended (plus
+# MEMBERSHIP_EVICT_GRACE_MINUTES) or attendance is disabled. A sweeper
+# re-checks both every MEMBERSHIP_SWEEP_SECONDS.
+# -------------------------------------------------------------------
+
+MEMBERSHIP_SWEEP_SECONDS = int(os.getenv("MEMBERSHIP_SWEEP_SECONDS", "30"))
+MEMBERSHIP_EVICT_GRACE_MINUTES = int(os.getenv("MEMBERSHIP_EVICT_GRACE_MINUTES", "60"))
+MEMBERSHIP_TTL_SECONDS = int(os.getenv("MEMBERSHIP_TTL_SECONDS", "60"))
+MEMBERSHIP_LOAD_BATCH = 5000
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class EventMembers:
+
+    def __init__(self, ends_at: datetime):
+        self.uids: set[str] = set()
+        self.ends_at = ends_at
+        self.ready = False
+        self.loaded_at: float | None = None
+        # cancellations seen while the load was still running
+        self.removed_while_loading: set[str] = set()
+
+    @property
+    def stale(self) -> bool:
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at > MEMBERSHIP_TTL_SECONDS
+
+    @property
+    def expired(self) -> bool:
+        grace = timedelta(minutes=MEMBERSHIP_EVICT_GRACE_MINUTES)
+        return datetime.now(timezone.utc) > self.ends_at + grace
+
+
+class MembershipIndex:
+
+    def __init__(self):
+        self._events: dict[str, EventMembers] = {}
+        # running loads, referenced until done (the loop keeps only weak ones)
+        self._loads: set[asyncio.Task] = set()
+
+    def get(self, event_id: str) -> set[str] | None:
+        """
+        The registrant set for an event, or None if it is not loaded (or
+        is being reloaded).
+        """
+        members = self._events.get(event_id)
+        if members is None or not members.ready:
+            return None
+
+        if members.stale:
+            self._reload(event_id, members)
+            return None
+        return members.uids
+
+    def warm(self, event_id: str, ends_at: datetime) -> None:
+        """
+        Starts loading an event's registrants in the background (once).
+        """
+        if event_id in self._events:
+            return
+
+        members = EventMembers(_as_utc(ends_at))
+        if members.expired:
+            return
+
+        self._events[event_id] = members
+        self._start_load(event_id, members)
+
+    def _reload(self, event_id: str, previous: EventMembers) -> None:
+        # a fresh set takes the old one's place at once, so register /
+        # cancel during the reload are applied to it
+        members = EventMembers(previous.ends_at)
+        self._events[event_id] = members
+        self._start_load(event_id, members)
+
+    def _start_load(self, event_id: str, members: EventMembers) -> None:
+        task = asyncio.create_task(self._load(event_id, members))
+        self._loads.add(task)
+        task.add_done_callback(self._loads.discard)
+
+    async def _load(self, event_id: str, members: EventMembers) -> None:
+        try:
+            cursor = registration_collection().find(
+                {"event_id": encode_id(event_id)},
+                {"_id": 0, "university_uid": 1},
+                batch_size=MEMBERSHIP_LOAD_BATCH,
+            )
+            async for doc in cursor:
+                members.uids.add(doc["university_uid"])
+        except Exception as exc:
+            print(f"Membership load failed for {event_id}: {exc}")
+            if self._events.get(event_id) is members:
+                del self._events[event_id]
+            return
+
+        members.uids -= members.removed_while_loading
+        members.removed_while_loading.clear()
+        members.loaded_at = time.monotonic()
+        members.ready = True
+
+    def add(self, event_id: str, university_uids: list[str]) -> None:
+        members = self._events.get(event_id)
+        if members:
+            members.uids.update(university_uids)
+            members.removed_while_loading.difference_update(university_uids)
+
+    def discard(self, event_id: str, university_uid: str) -> None:
+        members = self._events.get(event_id)
+        if members:
+            members.uids.discard(university_uid)
+            if not members.ready:
+                members.removed_while_loading.add(university_uid)
+
+    def evict(self, event_id: str) -> None:
+        self._events.pop(event_id, None)
+
+    async def sweep(self) -> None:
+        if not self._events:
+            return
+
+        cursor = event_collection().find(
+            {
+                "_id": {"$in": [encode_id(event_id) for event_id in self._events]},
+                "attendance_enabled": True,
+            },
+            {"end_time": 1},
+        )
+        open_events = {decode_id(doc["_id"]): _as_utc(doc["end_time"]) async for doc in cursor}
+
+        for event_id, members in list(self._events.items()):
+            if event_id not in open_events:
+                self.evict(event_id)
+                continue
+
+            members.ends_at = open_events[event_id]
+            if members.expired:
+                self.evict(event_id)
+
+
+membership_index = MembershipIndex()
+
+
+async def membership_sweeper() -> None:
+    while True:
+        await asyncio.sleep(MEMBERSHIP_SWEEP_SECONDS)
+        try:
+            await membership_index.sweep()
+        except Exception as exc:
+            print(f"Membership sweep failed: {exc}")
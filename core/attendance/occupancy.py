@@ -0,0 +1,176 @@
+import asyncio
+import os
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from db.codec import encode_id
+from db.collections import attendance_analytics_collection, attendance_collection
+from models.attendance.enums import ActionType
+
+# -------------------------------------------------------------------
+# Live occupancy analytics
+#
+# Attendance writes feed in-memory counters per event and fixed
+# OCCUPANCY_BUCKET_SECONDS time bucket (by scan time):
+#   arrivals.<bucket>, departures.<bucket>, checked_in, checked_out,
+#   dwell_seconds, dwell_count
+# Every OCCUPANCY_CHECKPOINT_SECONDS the deltas are $inc-ed into one
+# `attendance_analytics` document per event, so counters from several
+# workers add up. Reads are that document plus this worker's
+# unflushed deltas: O(buckets), no scan of raw attendance records.
+# -------------------------------------------------------------------
+
+OCCUPANCY_BUCKET_SECONDS = 300
+OCCUPANCY_CHECKPOINT_SECONDS = int(os.getenv("OCCUPANCY_CHECKPOINT_SECONDS", "10"))
+
+# check-in times are kept for dwell time until an event is idle this long
+OCCUPANCY_IDLE_SECONDS = 12 * 60 * 60
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def bucket_key(at: datetime) -> str:
+    timestamp = int(_as_utc(at).timestamp())
+    return str(timestamp - timestamp % OCCUPANCY_BUCKET_SECONDS)
+
+
+class OccupancyTracker:
+
+    def __init__(self):
+        self._pending: dict[str, Counter[str]] = defaultdict(Counter)
+        self._checkins: dict[str, dict[str, datetime]] = defaultdict(dict)
+        self._last_seen: dict[str, float] = {}
+        # check-in lookups for dwell time still in flight
+        self._lookups: set[asyncio.Task] = set()
+
+    def observe(self, event_id: str, university_uid: str, action: ActionType, at: datetime) -> None:
+        """
+        Counts a newly recorded scan. Repeats must not be passed in.
+        """
+        at = _as_utc(at)
+        pending = self._pending[event_id]
+        self._last_seen[event_id] = time.monotonic()
+
+        if action == ActionType.checkin:
+            pending["checked_in"] += 1
+            pending[f"arrivals.{bucket_key(at)}"] += 1
+            self._checkins[event_id][university_uid] = at
+            return
+
+        pending["checked_out"] += 1
+        pending[f"departures.{bucket_key(at)}"] += 1
+
+        checked_in_at = self._checkins[event_id].pop(university_uid, None)
+        if checked_in_at:
+            self._add_dwell(event_id, checked_in_at, at)
+        else:
+            # checked in before a restart or through another worker
+            task = asyncio.create_task(self._dwell_from_db(event_id, university_uid, at))
+            self._lookups.add(task)
+            task.add_done_callback(self._lookups.discard)
+
+    def _add_dwell(self, event_id: str, checked_in_at: datetime, checked_out_at: datetime) -> None:
+        dwell = (checked_out_at - checked_in_at).total_seconds()
+        if dwell >= 0:
+            self._pending[event_id]["dwell_seconds"] += int(dwell)
+            self._pending[event_id]["dwell_count"] += 1
+
+    async def _dwell_from_db(self, event_id: str, university_uid: str, checked_out_at: datetime) -> None:
+        try:
+            checkin = await attendance_collection().find_one(
+                {
+                    "event_id": encode_id(event_id),
+                    "university_uid": university_uid,
+                    "action": ActionType.checkin.value,
+                },
+                {"_id": 0, "scanned_at": 1},
+            )
+        except Exception:
+            return
+
+        if checkin:
+            self._add_dwell(event_id, _as_utc(checkin["scanned_at"]), checked_out_at)
+
+    async def checkpoint(self, final: bool = False) -> None:
+        """
+        Flushes the pending deltas. The final checkpoint (shutdown) first
+        waits for in-flight dwell lookups, so their dwell is not lost.
+        """
+        if final and self._lookups:
+            await asyncio.gather(*self._lookups, return_exceptions=True)
+
+        pending, self._pending = self._pending, defaultdict(Counter)
+        pending = {event_id: inc for event_id, inc in pending.items() if inc}
+
+        if pending:
+            try:
+                await attendance_analytics_collection().bulk_write(
+                    [
+                        UpdateOne(
+                            {"_id": encode_id(event_id)},
+                            {
+                                "$inc": dict(inc),
+                                "$set": {"updated_at": datetime.now(timezone.utc)},
+                            },
+                            upsert=True,
+                        )
+                        for event_id, inc in pending.items()
+                    ],
+                    ordered=False,
+                )
+            except Exception:
+                # keep the deltas for the next checkpoint
+                for event_id, inc in pending.items():
+                    self._pending[event_id].update(inc)
+                raise
+
+        idle_before = time.monotonic() - OCCUPANCY_IDLE_SECONDS
+        for event_id, last_seen in list(self._last_seen.items()):
+            if last_seen < idle_before:
+                del self._last_seen[event_id]
+                self._checkins.pop(event_id, None)
+
+    async def snapshot(self, event_id: str) -> dict:
+        """
+        Persisted counters for an event merged with this worker's
+        unflushed deltas.
+        """
+        doc = await attendance_analytics_collection().find_one(
+            {"_id": encode_id(event_id)},
+            {"_id": 0},
+        ) or {}
+
+        counters = {
+            "checked_in": doc.get("checked_in", 0),
+            "checked_out": doc.get("checked_out", 0),
+            "dwell_seconds": doc.get("dwell_seconds", 0),
+            "dwell_count": doc.get("dwell_count", 0),
+            "arrivals": Counter(doc.get("arrivals", {})),
+            "departures": Counter(doc.get("departures", {})),
+        }
+
+        for key, value in self._pending.get(event_id, {}).items():
+            if "." in key:
+                series, bucket = key.split(".", 1)
+                counters[series][bucket] += value
+            else:
+                counters[key] += value
+
+        return counters
+
+
+occupancy_tracker = OccupancyTracker()
+
+
+async def occupancy_checkpoint_worker() -> None:
+    while True:
+        await asyncio.sleep(OCCUPANCY_CHECKPOINT_SECONDS)
+        try:
+            await occupancy_tracker.checkpoint()
+        except Exception as exc:
+            print(f"Occupancy checkpoint failed: {exc}")
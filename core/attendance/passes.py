@@ -0,0 +1,152 @@
+import base64
+import hashlib
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from pydantic import BaseModel
+
+from db.codec import encode_id
+
+# -------------------------------------------------------------------
+# Signed entry passes
+#
+# A pass is base64url( payload || Ed25519 signature ), ~130 characters,
+# small enough for a QR code:
+#
+#   version      1 byte   (1)
+#   event_id    16 bytes  (binary UUID)
+#   expires_at   4 bytes  (unix seconds, big endian)
+#   uid_length   1 byte
+#   uid          n bytes  (university_uid, utf-8)
+#   signature   64 bytes
+#
+# Gate devices verify passes offline with the published public key
+# (GET /attendance/passes/key) and sync their scans later.
+# -------------------------------------------------------------------
+
+PASS_VERSION = 1
+PASS_GRACE_HOURS = int(os.getenv("PASS_GRACE_HOURS", "6"))
+
+_HEADER = struct.Struct(">B16sIB")
+_SIGNATURE_SIZE = 64
+
+_private_key: Ed25519PrivateKey | None = None
+
+
+class PassClaims(BaseModel):
+    event_id: str
+    university_uid: str
+    expires_at: datetime
+
+
+def _signing_key() -> Ed25519PrivateKey:
+    global _private_key
+
+    if _private_key is None:
+        pem = os.getenv("PASS_SIGNING_KEY")
+        if not pem:
+            raise RuntimeError("PASS_SIGNING_KEY not set")
+
+        key = serialization.load_pem_private_key(pem.replace("\\n", "\n").encode(), password=None)
+        if not isinstance(key, Ed25519PrivateKey):
+            raise RuntimeError("PASS_SIGNING_KEY must be an Ed25519 private key")
+
+        _private_key = key
+
+    return _private_key
+
+
+def _public_key() -> Ed25519PublicKey:
+    return _signing_key().public_key()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def public_key_info() -> dict:
+    raw = _public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw,
+    )
+    pem = _public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return {
+        "algorithm": "Ed25519",
+        "key_id": hashlib.sha256(raw).hexdigest()[:16],
+        "public_key": _b64encode(raw),
+        "public_key_pem": pem.decode(),
+        "version": PASS_VERSION,
+    }
+
+
+def pass_expires_at(event_end: datetime) -> datetime:
+    """
+    When a pass for an event ending at `event_end` (naive is UTC)
+    expires: PASS_GRACE_HOURS after the event, for late check-outs.
+    """
+    if event_end.tzinfo is None:
+        event_end = event_end.replace(tzinfo=timezone.utc)
+    return event_end + timedelta(hours=PASS_GRACE_HOURS)
+
+
+def issue_pass(event_id: str, university_uid: str, expires_at: datetime) -> str:
+    uid = university_uid.encode()
+    if len(uid) > 255:
+        raise ValueError("university_uid too long for an entry pass")
+
+    payload = _HEADER.pack(
+        PASS_VERSION,
+        bytes(encode_id(event_id)),
+        int(expires_at.timestamp()),
+        len(uid),
+    ) + uid
+
+    return _b64encode(payload + _signing_key().sign(payload))
+
+
+def verify_pass(token: str, at: datetime | None = None) -> PassClaims:
+    """
+    Returns the pass claims, or raises ValueError if the pass is
+    malformed, forged or expired at `at` (default: now).
+    """
+    try:
+        data = _b64decode(token)
+    except (ValueError, TypeError):
+        raise ValueError("Malformed pass")
+
+    if len(data) < _HEADER.size + _SIGNATURE_SIZE:
+        raise ValueError("Malformed pass")
+
+    payload, signature = data[:-_SIGNATURE_SIZE], data[-_SIGNATURE_SIZE:]
+    version, event_id, expires_at, uid_length = _HEADER.unpack_from(payload)
+
+    if version != PASS_VERSION or len(payload) != _HEADER.size + uid_length:
+        raise ValueError("Malformed pass")
+
+    try:
+        _public_key().verify(signature, payload)
+    except InvalidSignature:
+        raise ValueError("Invalid pass signature")
+
+    claims = PassClaims(
+        event_id=str(UUID(bytes=event_id)),
+        university_uid=payload[_HEADER.size:].decode(),
+        expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+    )
+
+    if (at or datetime.now(timezone.utc)) > claims.expires_at:
+        raise ValueError("Pass expired")
+
+    return claims
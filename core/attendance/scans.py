@@ -0,0 +1,210 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from db.codec import encode_id, decode_id, try_encode_id
+from db.collections import attendance_collection, event_collection, registration_collection
+from models.attendance import AttendanceRequest, AttendanceResponse, ActionType, ScanStatus
+from core.attendance.membership import membership_index
+from core.attendance.occupancy import occupancy_tracker
+
+# -------------------------------------------------------------------
+# Attendance scan recording
+#
+# A batch of scans costs at most three round trips regardless of size:
+#   1. events open for attendance        (_id $in)
+#   2. registrations per event           ((event_id, university_uid) index, $in)
+#   3. insert_many(ordered=False)        (unique (event_id, university_uid, action))
+# Once an event's membership index is warm, 1 and 2 are memory lookups
+# (2 only goes to the database for attendees not in the index). The
+# index can trail cancellations made on other workers by up to
+# MEMBERSHIP_TTL_SECONDS (core/attendance/membership.py).
+# Repeating a scan is harmless: the unique index turns it into
+# `already_recorded`.
+#
+# Device scan times are stored as UTC (naive ones are taken as UTC) and
+# capped at the server's clock, so a device clock running ahead cannot
+# record a scan in the future.
+# -------------------------------------------------------------------
+
+
+def scan_time(scanned_at: datetime | None, now: datetime) -> datetime:
+    """
+    A device's scan time as timezone-aware UTC, at most `now`; `now` if
+    the device sent none.
+    """
+    if scanned_at is None:
+        return now
+    if scanned_at.tzinfo is None:
+        scanned_at = scanned_at.replace(tzinfo=timezone.utc)
+    return min(scanned_at.astimezone(timezone.utc), now)
+
+
+async def open_event_ids(event_ids: set[str]) -> set[str]:
+    # a loaded membership means the event is open (the sweeper evicts closed ones)
+    open_ids = {event_id for event_id in event_ids if membership_index.get(event_id) is not None}
+    unknown = event_ids - open_ids
+
+    if unknown:
+        cursor = event_collection().find(
+            {"_id": {"$in": [encode_id(event_id) for event_id in unknown]}, "attendance_enabled": True},
+            {"end_time": 1},
+        )
+        async for doc in cursor:
+            event_id = decode_id(doc["_id"])
+            open_ids.add(event_id)
+            membership_index.warm(event_id, doc["end_time"])
+
+    return open_ids
+
+
+async def registered_uids(event_id: str, university_uids: set[str]) -> set[str]:
+    members = membership_index.get(event_id)
+    found = university_uids & members if members is not None else set()
+    misses = university_uids - found
+
+    if misses:
+        # not loaded yet, or registered through another worker
+        cursor = registration_collection().find(
+            {"event_id": encode_id(event_id), "university_uid": {"$in": list(misses)}},
+            {"_id": 0, "university_uid": 1},
+        )
+        confirmed = {doc["university_uid"] async for doc in cursor}
+        if members is not None:
+            membership_index.add(event_id, list(confirmed))
+        found |= confirmed
+
+    return found
+
+
+async def record_scans(scans: list[AttendanceRequest], scanned_by: str) -> list[AttendanceResponse]:
+    """
+    Records a batch of scans and returns one response per scan, in order.
+    """
+    now = datetime.now(timezone.utc)
+    statuses: list[ScanStatus | None] = [None] * len(scans)
+    scanned_at = [scan_time(scan.scanned_at, now) for scan in scans]
+
+    # canonical event ids; malformed ids can never be open for attendance
+    event_ids = [decode_id(key) if (key := try_encode_id(scan.event_id)) else None for scan in scans]
+    open_events = await open_event_ids({event_id for event_id in event_ids if event_id})
+
+    # first occurrence of each (event, attendee, action) in the batch
+    first: dict[tuple, int] = {}
+    pending_by_event: dict[str, set[str]] = defaultdict(set)
+
+    for index, (scan, event_id) in enumerate(zip(scans, event_ids)):
+        if event_id not in open_events:
+            statuses[index] = ScanStatus.attendance_closed
+            continue
+
+        key = (event_id, scan.university_uid, scan.action)
+        if key in first:
+            continue
+
+        first[key] = index
+        pending_by_event[event_id].add(scan.university_uid)
+
+    registered: dict[str, set[str]] = {
+        event_id: await registered_uids(event_id, uids)
+        for event_id, uids in pending_by_event.items()
+    }
+
+    to_insert = []
+    for (event_id, uid, action), index in first.items():
+        if uid not in registered[event_id]:
+            statuses[index] = ScanStatus.not_registered
+            continue
+
+        to_insert.append(index)
+
+    if to_insert:
+        duplicate: set[int] = set()
+        try:
+            await attendance_collection().insert_many(
+                [
+                    {
+                        "event_id": encode_id(event_ids[index]),
+                        "university_uid": scans[index].university_uid,
+                        "action": scans[index].action.value,
+                        "scanned_at": scanned_at[index],
+                        "recorded_at": now,
+                        "scanned_by": encode_id(scanned_by),
+                    }
+                    for index in to_insert
+                ],
+                ordered=False,
+            )
+        except BulkWriteError as exc:
+            errors = exc.details.get("writeErrors", [])
+            if any(error["code"] != 11000 for error in errors):
+                raise
+            duplicate = {to_insert[error["index"]] for error in errors}
+
+        for index in to_insert:
+            if index in duplicate:
+                statuses[index] = ScanStatus.already_recorded
+                continue
+
+            statuses[index] = ScanStatus.recorded
+            occupancy_tracker.observe(
+                event_ids[index],
+                scans[index].university_uid,
+                scans[index].action,
+                scanned_at[index],
+            )
+
+    # repeats within the batch share their first occurrence's outcome
+    for index, (scan, event_id) in enumerate(zip(scans, event_ids)):
+        if statuses[index] is None:
+            original = statuses[first[(event_id, scan.university_uid, scan.action)]]
+            statuses[index] = (
+                ScanStatus.already_recorded if original == ScanStatus.recorded else original
+            )
+
+    return [
+        AttendanceResponse(
+            event_id=event_id or scan.event_id,
+            university_uid=scan.university_uid,
+            action=scan.action,
+            status=status,
+            success=status in (ScanStatus.recorded, ScanStatus.already_recorded),
+        )
+        for scan, event_id, status in zip(scans, event_ids, statuses)
+    ]
+
+
+def recorded_counts(results: list[AttendanceResponse]) -> Counter[tuple[str, ActionType]]:
+    """
+    New records per (event_id, action), for the event stats.
+    """
+    return Counter(
+        (result.event_id, result.action)
+        for result in results
+        if result.status == ScanStatus.recorded
+    )
+
+
+async def keep_earliest_scan_times(scans: list[AttendanceRequest]) -> None:
+    """
+    Offline devices sync late and in any order, so a repeated scan may
+    be older than the stored one: keep the earliest scanned_at.
+    """
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {
+                "event_id": encode_id(scan.event_id),
+                "university_uid": scan.university_uid,
+                "action": scan.action.value,
+            },
+            {"$min": {"scanned_at": scan_time(scan.scanned_at, now)}},
+        )
+        for scan in scans
+        if scan.scanned_at
+    ]
+
+    if ops:
+        await attendance_collection().bulk_write(ops, ordered=False)
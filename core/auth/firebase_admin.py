@@ -1,6 +1,73 @@
-import firebase_admin
-from firebase_admin import credentials
+import asyncio
+import os
+import threading
 
-cred = credentials.Certificate("creds/firebase/firebase-service-account.json")
+from core.ops.startup import startup_profile
 
-firebaseApp = firebase_admin.initialize_app(cred)
\ No newline at end of file
+# -------------------------------------------------------------------
+# Firebase Admin (initialised on first use)
+#
+# Only Google login needs Firebase, so neither the SDK (and the Google
+# auth / HTTP stack it pulls in) nor the service account file is loaded
+# until the first ID token is verified. Verification can block on
+# fetching Google's public certificates, so it runs in a thread.
+#
+# A failed initialisation is retried on the next Google login (the
+# credentials may be fixed without a restart) and reported once per
+# distinct error, not on every login.
+# -------------------------------------------------------------------
+
+FIREBASE_CREDENTIALS_PATH = os.getenv(
+    "FIREBASE_CREDENTIALS_PATH",
+    "creds/firebase/firebase-service-account.json",
+)
+
+_APP = None
+_APP_LOCK = threading.Lock()
+_reported_error: str | None = None
+
+
+class FirebaseUnavailableError(RuntimeError):
+    pass
+
+
+def get_firebase_app():
+    """
+    Returns the Firebase app, initialising it from the service account
+    file the first time.
+    """
+    global _APP, _reported_error
+
+    if _APP is None:
+        with _APP_LOCK:
+            if _APP is None:
+                with startup_profile.phase("firebase"):
+                    import firebase_admin
+                    from firebase_admin import credentials
+
+                    try:
+                        cred = credentials.Certificate(FIREBASE_CREDENTIALS_PATH)
+                    except (OSError, ValueError) as exc:
+                        error = f"Firebase credentials not loaded: {exc}"
+                        if error != _reported_error:
+                            _reported_error = error
+                            print(f"Google login unavailable: {error}")
+                        raise FirebaseUnavailableError(error) from exc
+
+                    _APP = firebase_admin.initialize_app(cred)
+    return _APP
+
+
+def _verify_id_token(id_token: str) -> dict:
+    from firebase_admin import auth
+
+    return auth.verify_id_token(id_token, app=get_firebase_app())
+
+
+async def verify_google_id_token(id_token: str) -> dict:
+    """
+    Verifies a Firebase ID token and returns its claims. Raises
+    FirebaseUnavailableError if Firebase cannot be initialised, and the
+    SDK's errors for invalid tokens.
+    """
+    return await asyncio.to_thread(_verify_id_token, id_token)
@@ -8,10 +8,12 @@ import os
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
 
 from models.auth.jwt import JWTPayload
 from models.auth.enums import UserRole
+from core.ops.startup import startup_profile
 
 # -------------------------------------------------------------------
 # Config (read once)
@@ -22,12 +24,37 @@ JWT_AUDIENCE = os.getenv("JWT_AUDIENCE", "horizon.api")
 JWT_ALGORITHM = "RS256"
 ACCESS_TOKEN_TTL_MINUTES = int(os.getenv("ACCESS_TOKEN_TTL_MINUTES", "5"))
 
-# RSA keys (recommended)
-JWT_PRIVATE_KEY = os.getenv("JWT_PRIVATE_KEY")
-JWT_PUBLIC_KEY = os.getenv("JWT_PUBLIC_KEY")
+# -------------------------------------------------------------------
+# Keys (loaded on first use)
+#
+# JWT_PRIVATE_KEY / JWT_PUBLIC_KEY are PEM encoded RSA keys. Parsing the
+# private key costs ~70 ms of CPU (cryptography validates it), and jose
+# would do that on every call if handed the PEM string, so both keys are
+# parsed once, the first time a token is signed or verified, and reused.
+# -------------------------------------------------------------------
+
+_KEYS: tuple[Key, Key] | None = None
+
+
+def get_jwt_keys() -> tuple[Key, Key]:
+    """
+    Returns the (signing, verifying) key pair.
+    """
+    global _KEYS
 
-if not JWT_PRIVATE_KEY or not JWT_PUBLIC_KEY:
-    raise RuntimeError("JWT_PRIVATE_KEY or JWT_PUBLIC_KEY not set")
+    if _KEYS is None:
+        private_key = os.getenv("JWT_PRIVATE_KEY")
+        public_key = os.getenv("JWT_PUBLIC_KEY")
+
+        if not private_key or not public_key:
+            raise RuntimeError("JWT_PRIVATE_KEY or JWT_PUBLIC_KEY not set")
+
+        with startup_profile.phase("jwt_keys"):
+            _KEYS = (
+                jwk.construct(private_key, JWT_ALGORITHM),
+                jwk.construct(public_key, JWT_ALGORITHM),
+            )
+    return _KEYS
 
 # -------------------------------------------------------------------
 # Security scheme
@@ -56,9 +83,11 @@ def create_access_token(
         "jti": str(uuid4()),
     }
 
+    signing_key, _ = get_jwt_keys()
+
     token = jwt.encode(
         payload,
-        JWT_PRIVATE_KEY,
+        signing_key,
         algorithm=JWT_ALGORITHM,
     )
 
@@ -69,10 +98,12 @@ def create_access_token(
 # -------------------------------------------------------------------
 
 def verify_access_token(token: str) -> JWTPayload:
+    _, verifying_key = get_jwt_keys()
+
     try:
         decoded = jwt.decode(
             token,
-            JWT_PUBLIC_KEY,
+            verifying_key,
             algorithms=[JWT_ALGORITHM],
             audience=JWT_AUDIENCE,
             issuer=JWT_ISSUER,
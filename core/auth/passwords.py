@@ -0,0 +1,93 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+# -------------------------------------------------------------------
+# Parallel password hashing
+#
+# bcrypt is deliberately slow (~0.25 s per hash at the default cost),
+# so hashing thousands of passwords on the event loop would stall every
+# other request. Bulk work is sent to a process pool instead, in one
+# slice per worker to keep pickling overhead negligible. The pool is
+# created on first use and is at most BULK_HASH_WORKERS processes
+# (default: all cores but one), which leaves a core for live traffic.
+# Each worker process has its own pool, so bulk imports hold a
+# deployment-wide lease (core/users/imports.py): only one worker's pool
+# hashes at a time.
+#
+# Single hashes and checks on the request path (register, login) run in
+# a small thread pool instead: bcrypt releases the GIL, so the event
+# loop keeps serving while they run, and PASSWORD_THREADS bounds how
+# many cores logins can take from the rest of the worker.
+# -------------------------------------------------------------------
+
+BULK_HASH_WORKERS = int(os.getenv("BULK_HASH_WORKERS", str(max((os.cpu_count() or 2) - 1, 1))))
+PASSWORD_THREADS = int(os.getenv("PASSWORD_THREADS", "4"))
+
+_pool: ProcessPoolExecutor | None = None
+_threads: ThreadPoolExecutor | None = None
+
+
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+
+def _get_threads() -> ThreadPoolExecutor:
+    global _threads
+
+    if _threads is None:
+        _threads = ThreadPoolExecutor(max_workers=PASSWORD_THREADS, thread_name_prefix="bcrypt")
+    return _threads
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_get_threads(), hash_password, password)
+
+
+async def check_password(password: str, password_hash: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_threads(), bcrypt.checkpw, password.encode(), password_hash.encode()
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=BULK_HASH_WORKERS)
+    return _pool
+
+
+async def hash_passwords_parallel(passwords: list[str]) -> list[str]:
+    """
+    Hashes passwords across the process pool, preserving order.
+    """
+    if not passwords:
+        return []
+
+    loop = asyncio.get_running_loop()
+    size = -(-len(passwords) // BULK_HASH_WORKERS)
+
+    slices = await asyncio.gather(*(
+        loop.run_in_executor(_get_pool(), hash_passwords, passwords[start:start + size])
+        for start in range(0, len(passwords), size)
+    ))
+    return [password_hash for hashes in slices for password_hash in hashes]
+
+
+def shutdown_password_pool() -> None:
+    global _pool, _threads
+
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+    if _threads is not None:
+        _threads.shutdown(cancel_futures=True)
+        _threads = None
@@ -0,0 +1,106 @@
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator, TypeVar
+
+from fastapi import HTTPException, Request, status
+
+T = TypeVar("T")
+
+CSV_TYPES = {"text/csv", "application/csv"}
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+
+def request_format(request: Request) -> str:
+    """
+    Returns "csv" or "ndjson" based on the request Content-Type.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in CSV_TYPES:
+        return "csv"
+    if content_type in NDJSON_TYPES:
+        return "ndjson"
+
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Upload must be text/csv or application/x-ndjson",
+    )
+
+
+async def iter_lines(request: Request) -> AsyncIterator[str]:
+    """
+    Yields decoded lines from the request body as it arrives, without
+    buffering the whole upload.
+    """
+    buffer = b""
+    first = True
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            text = line.decode("utf-8", errors="replace").rstrip("\r")
+            if first:
+                text = text.lstrip("\ufeff")
+                first = False
+            yield text
+
+    if buffer:
+        text = buffer.decode("utf-8", errors="replace").rstrip("\r")
+        yield text.lstrip("\ufeff") if first else text
+
+
+async def iter_rows(request: Request) -> AsyncIterator[tuple[int, dict | None]]:
+    """
+    Streams a CSV (header row required) or NDJSON upload as
+    (row_number, row) pairs. Blank lines are skipped and rows that
+    cannot be parsed are yielded as None so callers can report them.
+    """
+    fmt = request_format(request)
+    header: list[str] | None = None
+    row_number = 0
+
+    async for line in iter_lines(request):
+        if not line.strip():
+            continue
+
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+
+            if header is None:
+                header = [value.strip() for value in values]
+                continue
+
+            row_number += 1
+            if len(values) != len(header):
+                yield row_number, None
+                continue
+
+            yield row_number, dict(zip(header, (value.strip() for value in values)))
+
+        else:
+            row_number += 1
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield row_number, None
+                continue
+
+            yield row_number, row if isinstance(row, dict) else None
+
+
+async def chunked(items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """
+    Groups an async iterable (generator, cursor) into lists of at most `size` items.
+    """
+    chunk: list[T] = []
+
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
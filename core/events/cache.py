@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+
+from core.http.compression import CompressedBody
+
+# -------------------------------------------------------------------
+# Public event response cache
+#
+# The published event list and event details are served from bodies
+# serialised once per EVENT_CACHE_TTL_SECONDS per worker. Their gzip /
+# brotli variants are stored alongside (core/http/compression.py), so a
+# hot listing is read, serialised and compressed once per TTL instead
+# of on every request. A refresh that serialises to the same bytes
+# keeps the compressed variants, so an unchanged body is compressed
+# once per content. Concurrent misses for a key share one load.
+#
+# Edits made through this worker invalidate at once; other workers see
+# them within the TTL. registered_count on event details can lag by the
+# TTL (live counts come from the /live stream).
+# -------------------------------------------------------------------
+
+EVENT_CACHE_TTL_SECONDS = float(os.getenv("EVENT_CACHE_TTL_SECONDS", "5"))
+EVENT_CACHE_MAX_ENTRIES = int(os.getenv("EVENT_CACHE_MAX_ENTRIES", "1000"))
+
+PUBLISHED_EVENTS = "published"
+
+
+def event_details_key(event_key: bytes) -> str:
+    return f"event:{event_key.hex()}"
+
+
+class EventResponseCache:
+
+    def __init__(self, ttl: float = EVENT_CACHE_TTL_SECONDS, max_entries: int = EVENT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires at, body); kept past expiry so a refresh can reuse variants
+        self._entries: dict[str, tuple[float, CompressedBody]] = {}
+        self._loading: dict[str, asyncio.Task] = {}
+        # bumped by invalidate: loads started before it are not stored
+        self._generation = 0
+
+    async def get(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[CompressedBody | None]],
+    ) -> CompressedBody | None:
+        """
+        The cached body for `key`, loading it on a miss. None (not found)
+        is not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        if self.ttl <= 0:
+            return await load()
+
+        task = self._loading.get(key)
+        if task is None:
+            # its own task: a client disconnecting does not cancel the
+            # load the other waiters share
+            task = self._loading[key] = asyncio.create_task(self._load(key, load, self._generation))
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, load, generation: int) -> CompressedBody | None:
+        # `generation` is taken when the load is scheduled: an invalidate
+        # that lands before the task first runs must still discard it
+        try:
+            body = await load()
+        finally:
+            if self._loading.get(key) is asyncio.current_task():
+                del self._loading[key]
+
+        if generation != self._generation:
+            return body
+
+        if body is None:
+            self._entries.pop(key, None)
+            return None
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            body.adopt(previous[1])
+
+        if len(self._entries) >= self.max_entries:
+            now = time.monotonic()
+            for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[stale]
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+        self._entries[key] = (time.monotonic() + self.ttl, body)
+        return body
+
+    def invalidate(self, *keys: str) -> None:
+        self._generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+            self._loading.pop(key, None)
+
+
+event_response_cache = EventResponseCache()
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+
+from bson.binary import Binary
+from db.codec import decode_id
+from db.repositories.backend import event_repository
+from models.event.enums import EventStatus
+
+# -------------------------------------------------------------------
+# Live registration counters
+#
+# One broadcaster per event with at least one SSE client. Registration
+# writes publish the new counters in process; the broadcaster coalesces
+# them to at most LIVE_MAX_UPDATES_PER_SECOND frames, serializes each
+# frame once and fans it out to every client queue. Clients never
+# touch the database. The only reads are one load when a broadcaster
+# starts and one refresh per event every LIVE_REFRESH_SECONDS, which
+# picks up writes made by other workers.
+#
+# Only published events stream. A refresh that no longer finds the event
+# published ends its streams.
+# -------------------------------------------------------------------
+
+LIVE_MAX_UPDATES_PER_SECOND = float(os.getenv("LIVE_MAX_UPDATES_PER_SECOND", "2"))
+LIVE_REFRESH_SECONDS = float(os.getenv("LIVE_REFRESH_SECONDS", "5"))
+
+COUNTER_PROJECTION = {"registered_count": 1, "capacity": 1}
+
+
+def counters_frame(event: dict) -> str:
+    registered = event.get("registered_count") or 0
+    capacity = event.get("capacity")
+
+    data = {
+        "event_id": decode_id(event["_id"]),
+        "registered_count": registered,
+        "capacity": capacity,
+        "seats_left": max(capacity - registered, 0) if capacity else None,
+    }
+    return f"event: counters\ndata: {json.dumps(data)}\n\n"
+
+
+class EventBroadcaster:
+
+    def __init__(self, event_id: Binary):
+        self.event_id = event_id
+        self.frame: str | None = None
+        self.subscribers: set[asyncio.Queue] = set()
+        self._changed = asyncio.Event()
+        self._loaded = asyncio.create_task(self.refresh())
+        self._pump = asyncio.create_task(self._run())
+
+    async def refresh(self) -> bool:
+        """
+        Publishes the stored counters; False if the event is not (or no
+        longer) published.
+        """
+        event = await event_repository().get(
+            self.event_id,
+            COUNTER_PROJECTION,
+            status=EventStatus.published,
+        )
+        if not event:
+            return False
+        self.publish(counters_frame(event))
+        return True
+
+    def publish(self, frame: str) -> None:
+        if frame != self.frame:
+            self.frame = frame
+            self._changed.set()
+
+    def listen(self) -> asyncio.Queue:
+        # size 1: a slow client only ever receives the latest frame
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        if self.frame:
+            queue.put_nowait(self.frame)
+        self.subscribers.add(queue)
+        return queue
+
+    def close(self) -> None:
+        self._pump.cancel()
+        self._loaded.cancel()
+        for queue in self.subscribers:
+            self._offer(queue, None)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, frame: str | None) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(frame)
+
+    async def _run(self) -> None:
+        interval = 1 / LIVE_MAX_UPDATES_PER_SECOND
+
+        while True:
+            try:
+                await asyncio.wait_for(self._changed.wait(), LIVE_REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                try:
+                    published = await self.refresh()
+                except Exception:
+                    published = True
+                if not published:
+                    _drop(self)
+                    return
+                if not self._changed.is_set():
+                    continue
+
+            self._changed.clear()
+            for queue in self.subscribers:
+                self._offer(queue, self.frame)
+
+            await asyncio.sleep(interval)
+
+
+# keyed by API id string: stored ids decode as UUID or Binary
+_broadcasters: dict[str, EventBroadcaster] = {}
+
+
+async def subscribe(event_id: Binary) -> tuple[EventBroadcaster, asyncio.Queue] | None:
+    """
+    Returns the event's broadcaster and a new client queue, or None if
+    the event does not exist or is not published. Raises the initial
+    load's error if it failed. Frames arrive on the queue; None means
+    the stream has ended (the server is shutting down, or the event was
+    unpublished).
+    """
+    key = decode_id(event_id)
+    broadcaster = _broadcasters.get(key)
+    if broadcaster is None:
+        broadcaster = _broadcasters[key] = EventBroadcaster(event_id)
+
+    # shared initial load; wait() neither raises nor cancels it
+    loaded = broadcaster._loaded
+    await asyncio.wait([loaded])
+
+    if loaded.cancelled() or loaded.exception() is not None or not loaded.result():
+        if not broadcaster.subscribers:
+            _drop(broadcaster)
+        # a failed load is an error (5xx), not a missing event
+        return loaded.result() or None
+
+    return broadcaster, broadcaster.listen()
+
+
+def _drop(broadcaster: EventBroadcaster) -> None:
+    key = decode_id(broadcaster.event_id)
+    if _broadcasters.get(key) is broadcaster:
+        del _broadcasters[key]
+    broadcaster.close()
+
+
+def unsubscribe(broadcaster: EventBroadcaster, queue: asyncio.Queue) -> None:
+    broadcaster.subscribers.discard(queue)
+    if not broadcaster.subscribers:
+        _drop(broadcaster)
+
+
+def publish_counters(event: dict) -> None:
+    """
+    Pushes counters from an event document (needs _id, registered_count
+    and capacity) to its broadcaster, if anyone is listening.
+    """
+    broadcaster = _broadcasters.get(decode_id(event["_id"]))
+    if broadcaster:
+        broadcaster.publish(counters_frame(event))
+
+
+async def update_registered_count(event_id: Binary, delta: int) -> None:
+    """
+    Applies a registration delta to events.registered_count and
+    publishes the result.
+    """
+    if not delta:
+        return
+
+    event = await event_repository().increment_registered_count(
+        event_id,
+        delta,
+        COUNTER_PROJECTION,
+    )
+    if event:
+        publish_counters(event)
+
+
+def close_broadcasters() -> None:
+    for broadcaster in _broadcasters.values():
+        broadcaster.close()
+    _broadcasters.clear()
@@ -0,0 +1,256 @@
+import asyncio
+import os
+from collections import Counter
+from datetime import datetime, timezone
+
+from bson.binary import Binary
+
+from db.collections import (
+    attendance_collection,
+    event_stats_collection,
+    registration_collection,
+)
+from db.repositories.backend import users_repository, is_persistent
+from models.attendance.enums import ActionType
+
+# -------------------------------------------------------------------
+# Materialized per-event statistics
+#
+# One `event_stats` document per event (keyed by the event _id):
+#   registered, checked_in, checked_out
+#   by_degree_program / by_graduation_year / by_hostel  → {key: count}
+#
+# Kept current with $inc on every registration / cancellation / scan
+# and periodically rebuilt from `registrations` and `attendance` with
+# $merge to correct any drift (missed background updates, profile edits).
+# -------------------------------------------------------------------
+
+EVENT_STATS_RECONCILE_SECONDS = int(os.getenv("EVENT_STATS_RECONCILE_SECONDS", "900"))
+
+# profile field → stats map
+DIMENSIONS = {
+    "degree_program": "by_degree_program",
+    "graduation_year": "by_graduation_year",
+    "hostel": "by_hostel",
+}
+
+PROFILE_PROJECTION = {"_id": 0, "university_uid": 1, **{field: 1 for field in DIMENSIONS}}
+
+UNKNOWN = "unknown"
+
+# "." and a leading "$" are not allowed in $inc paths, so map them to
+# their full-width forms in stored keys and back again on read
+_KEY_ESCAPES = {".": "\uff0e", "$": "\uff04"}
+
+
+def stat_key(value) -> str:
+    key = str(value).strip() if value not in (None, "") else UNKNOWN
+    for char, escaped in _KEY_ESCAPES.items():
+        key = key.replace(char, escaped)
+    return key or UNKNOWN
+
+
+def unescape_key(key: str) -> str:
+    for char, escaped in _KEY_ESCAPES.items():
+        key = key.replace(escaped, char)
+    return key
+
+
+def _stat_key_expr(path: str) -> dict:
+    """
+    Aggregation equivalent of stat_key().
+    """
+    expr = {"$ifNull": [{"$trim": {"input": {"$toString": path}}}, UNKNOWN]}
+    for char, escaped in _KEY_ESCAPES.items():
+        expr = {"$replaceAll": {"input": expr, "find": char, "replacement": escaped}}
+    return {"$cond": [{"$eq": [expr, ""]}, UNKNOWN, expr]}
+
+
+# -------------------------------------------------------------------
+# Incremental updates
+# -------------------------------------------------------------------
+
+async def record_registrations(
+    event_id: Binary,
+    university_uids: list[str],
+    delta: int,
+    profiles: dict[str, dict] | None = None,
+) -> None:
+    """
+    Applies +delta (register) or -delta (cancel) for each attendee.
+    `profiles` may be passed when the caller already loaded them.
+    """
+    if not university_uids or not is_persistent():
+        return
+
+    if profiles is None:
+        profiles = {
+            doc["university_uid"]: doc
+            for doc in await users_repository().find_by_university_uids(university_uids, PROFILE_PROJECTION)
+        }
+
+    inc: Counter[str] = Counter({"registered": delta * len(university_uids)})
+    for uid in university_uids:
+        profile = profiles.get(uid, {})
+        for field, target in DIMENSIONS.items():
+            inc[f"{target}.{stat_key(profile.get(field))}"] += delta
+
+    await event_stats_collection().update_one(
+        {"_id": event_id},
+        {
+            "$inc": dict(inc),
+            "$set": {"updated_at": datetime.now(timezone.utc)},
+        },
+        upsert=True,
+    )
+
+
+async def record_attendance(event_id: Binary, action: ActionType, count: int = 1) -> None:
+    if not is_persistent():
+        return
+
+    field = "checked_in" if action == ActionType.checkin else "checked_out"
+
+    await event_stats_collection().update_one(
+        {"_id": event_id},
+        {
+            "$inc": {field: count},
+            "$set": {"updated_at": datetime.now(timezone.utc)},
+        },
+        upsert=True,
+    )
+
+
+# -------------------------------------------------------------------
+# Reconciliation
+# -------------------------------------------------------------------
+
+MERGE_STATS = {
+    "$merge": {
+        "into": "event_stats",
+        "on": "_id",
+        "whenMatched": "merge",
+        "whenNotMatched": "insert",
+    }
+}
+
+
+def _profile_lookup() -> list[dict]:
+    return [
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "university_uid",
+                "foreignField": "university_uid",
+                "pipeline": [{"$project": PROFILE_PROJECTION}],
+                "as": "profile",
+            }
+        },
+        {"$set": {"profile": {"$first": "$profile"}}},
+    ]
+
+
+async def _run_pipeline(pipeline: list[dict], collection=registration_collection) -> None:
+    cursor = await collection().aggregate(pipeline)
+    await cursor.to_list()
+
+
+async def reconcile_event_stats(event_id: Binary | None = None) -> None:
+    """
+    Rebuilds registration totals and breakdowns (and the events'
+    registered_count) from `registrations`, and attendance totals
+    from `attendance`.
+    """
+    run_at = datetime.now(timezone.utc)
+    match = {"event_id": event_id} if event_id is not None else {}
+
+    await _run_pipeline([
+        {"$match": match},
+        {"$group": {"_id": "$event_id", "registered": {"$sum": 1}}},
+        {"$set": {"reconciled_at": {"$literal": run_at}}},
+        MERGE_STATS,
+    ])
+
+    # events.registered_count feeds the live counters
+    await _run_pipeline([
+        {"$match": match},
+        {"$group": {"_id": "$event_id", "registered_count": {"$sum": 1}}},
+        {
+            "$merge": {
+                "into": "events",
+                "on": "_id",
+                "whenMatched": "merge",
+                "whenNotMatched": "discard",
+            }
+        },
+    ])
+
+    for field, target in DIMENSIONS.items():
+        await _run_pipeline([
+            {"$match": match},
+            *_profile_lookup(),
+            {
+                "$group": {
+                    "_id": {"event": "$event_id", "key": _stat_key_expr(f"$profile.{field}")},
+                    "count": {"$sum": 1},
+                }
+            },
+            {
+                "$group": {
+                    "_id": "$_id.event",
+                    target: {"$push": {"k": "$_id.key", "v": "$count"}},
+                }
+            },
+            {"$set": {target: {"$arrayToObject": f"${target}"}}},
+            MERGE_STATS,
+        ])
+
+    await _run_pipeline(
+        [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": "$event_id",
+                    **{
+                        field: {"$sum": {"$cond": [{"$eq": ["$action", action.value]}, 1, 0]}}
+                        for field, action in (
+                            ("checked_in", ActionType.checkin),
+                            ("checked_out", ActionType.checkout),
+                        )
+                    },
+                }
+            },
+            MERGE_STATS,
+        ],
+        collection=attendance_collection,
+    )
+
+    # events whose registrations have all been cancelled produce no rows
+    stale = {
+        "$or": [
+            {"reconciled_at": {"$lt": run_at}},
+            {"reconciled_at": {"$exists": False}, "updated_at": {"$lt": run_at}},
+        ]
+    }
+    if event_id is not None:
+        stale = {"_id": event_id, **stale}
+
+    await event_stats_collection().update_many(
+        stale,
+        {
+            "$set": {
+                "registered": 0,
+                **{target: {} for target in DIMENSIONS.values()},
+                "reconciled_at": run_at,
+            }
+        },
+    )
+
+
+async def event_stats_worker() -> None:
+    while True:
+        await asyncio.sleep(EVENT_STATS_RECONCILE_SECONDS)
+        try:
+            await reconcile_event_stats()
+        except Exception as exc:
+            print(f"Event stats reconcile failed: {exc}")
@@ -0,0 +1,206 @@
+import gzip
+import importlib.util
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+# -------------------------------------------------------------------
+# Response compression
+#
+# Responses are compressed with brotli (when the `brotli` package is
+# installed and the client accepts it) or gzip, if:
+#   - the content type is text-like (JSON, CSV, plain text, HTML)
+#   - the body is at least COMPRESSION_MIN_BYTES
+#   - the body arrives in one piece (streamed responses, such as SSE
+#     and CSV exports, pass through untouched)
+#   - the path is not under /auth: those bodies are small, and carry
+#     tokens next to request-controlled data (BREACH)
+# Responses that already carry a Content-Encoding (precompressed
+# CompressedBody variants, see core/events/cache.py) pass through.
+#
+# Dynamic bodies use fast settings. Precompressed ones are compressed
+# once per content and can afford more.
+# -------------------------------------------------------------------
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+PRECOMPRESSED_GZIP_LEVEL = 9
+PRECOMPRESSED_BROTLI_QUALITY = 9
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "text/csv",
+    "text/plain",
+    "text/html",
+}
+
+SKIPPED_PATHS = ("/auth",)
+
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+# preferred first
+ENCODINGS = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """
+    The first of ENCODINGS the client accepts (q > 0), or None.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted, refused = set(), set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            quality = 0.0
+        (accepted if quality > 0 else refused).add(coding.strip())
+
+    for encoding in ENCODINGS:
+        if encoding in accepted or ("*" in accepted and encoding not in refused):
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    if encoding == "br":
+        quality = PRECOMPRESSED_BROTLI_QUALITY if precompressed else COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = PRECOMPRESSED_GZIP_LEVEL if precompressed else COMPRESSION_GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def is_compressible(headers: Headers, size: int) -> bool:
+    if "content-encoding" in headers or size < COMPRESSION_MIN_BYTES:
+        return False
+    content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return content_type in COMPRESSIBLE_TYPES
+
+
+# -------------------------------------------------------------------
+# Precompressed bodies
+# -------------------------------------------------------------------
+
+
+class CompressedBody:
+    """
+    A serialised body and its encoded variants, each compressed on
+    first request for it.
+    """
+
+    __slots__ = ("body", "media_type", "_variants")
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.body = body
+        self.media_type = media_type
+        self._variants: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = self._variants[encoding] = compress(self.body, encoding, precompressed=True)
+        return variant
+
+    def adopt(self, other: "CompressedBody") -> None:
+        """
+        Reuses `other`'s variants when the body did not change.
+        """
+        if other.body == self.body:
+            self._variants = other._variants
+
+    def response(self, request: Request) -> Response:
+        encoding = None
+        if COMPRESSION_ENABLED and len(self.body) >= COMPRESSION_MIN_BYTES:
+            encoding = choose_encoding(request.headers.get("accept-encoding"))
+
+        if encoding is None:
+            response = Response(content=self.body, media_type=self.media_type)
+        else:
+            response = Response(
+                content=self.encoded(encoding),
+                media_type=self.media_type,
+                headers={"Content-Encoding": encoding},
+            )
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+
+
+# -------------------------------------------------------------------
+# Middleware
+# -------------------------------------------------------------------
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI (not BaseHTTPMiddleware) so streamed bodies pass through
+    without being buffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not COMPRESSION_ENABLED
+            or scope["path"].startswith(SKIPPED_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                size = int(headers.get("content-length", COMPRESSION_MIN_BYTES))
+                if not is_compressible(headers, size):
+                    # SSE and the like: headers go out straight away
+                    await send(message)
+                    return
+                # held until the first body chunk shows whether it streams
+                start = message
+                return
+
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=held["headers"])
+
+            if message.get("more_body", False) or not is_compressible(headers, len(body)):
+                await send(held)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            if len(compressed) < len(body):
+                body = compressed
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+
+            await send(held)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,6 +1,5 @@
 import os
 import asyncio
-import aiohttp
 from datetime import datetime
 import pytz
 
@@ -125,25 +124,36 @@ def build_new_device_embed(user_id: str, device_id: str, ip: str | None, trace_i
     }
 
 
+# set on shutdown: workers flush what is queued, then exit
+_closing = asyncio.Event()
+
+
 async def _worker(queue: asyncio.Queue[dict]):
     if not DISCORD_WEBHOOK_URL:
         print("Discord webhook missing")
         return
 
+    # imported here: aiohttp is a large import and only the workers need it
+    import aiohttp
+
     timeout = aiohttp.ClientTimeout(total=10)
 
     async with aiohttp.ClientSession(timeout=timeout) as session:
         while True:
+            if _closing.is_set() and queue.empty():
+                return
+
             embeds = []
 
-            try:
-                item = await asyncio.wait_for(
-                    queue.get(),
-                    timeout=FLUSH_INTERVAL,
-                )
-                embeds.append(item)
-            except asyncio.TimeoutError:
-                pass
+            if queue.empty():
+                try:
+                    item = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=FLUSH_INTERVAL,
+                    )
+                    embeds.append(item)
+                except asyncio.TimeoutError:
+                    pass
 
             while not queue.empty() and len(embeds) < BATCH_SIZE:
                 embeds.append(queue.get_nowait())
@@ -173,4 +183,19 @@ async def api_log_worker():
 
 
 async def audit_log_worker():
-    await _worker(audit_log_queue)
\ No newline at end of file
+    await _worker(audit_log_queue)
+
+async def drain_log_workers(workers: list[asyncio.Task], timeout: float) -> None:
+    """
+    Lets the workers send everything still queued, for at most
+    `timeout` seconds, then cancels them.
+    """
+    _closing.set()
+
+    _, pending = await asyncio.wait(workers, timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    if pending:
+        dropped = api_log_queue.qsize() + audit_log_queue.qsize()
+        print(f"Log drain timed out, {dropped} entries dropped")
@@ -0,0 +1,251 @@
+import asyncio
+import heapq
+import itertools
+import os
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+# -------------------------------------------------------------------
+# Admission control
+#
+# Each route belongs to a class, by its router tag:
+#   auth_cpu      bcrypt checks, Google token verification, token signing
+#   db_write      routes that write to MongoDB
+#   public_read   GET routes of a db_write tag
+# Routes whose tag has no class (Operations: probes and metrics) are
+# never limited.
+#
+# A class runs at most LIMIT requests at once and parks up to QUEUE more
+# for at most WAIT_MS. Beyond that a request is shed straight away with
+# 503 and Retry-After. An overloaded class fails fast instead of
+# queueing work its clients will have given up on, and it cannot take
+# the event loop, the bcrypt threads or the Mongo pool from the others.
+#
+# Queued requests are admitted by priority. Token refresh and logout go
+# before logins and registrations (a refused refresh logs a user out),
+# and when the queue is full they take the place of the newest queued
+# request with a lower priority.
+#
+# Route dependencies marked `before_admission` (the auth rate limits)
+# run before a slot is taken, so requests they reject never queue.
+#
+# Limits are per worker:
+#   ADMISSION_<CLASS>_LIMIT / _QUEUE / _WAIT_MS / _RETRY_AFTER
+#   ADMISSION_ROUTE_CLASSES   tag -> class, e.g. "Events=db_write,Users=public_read"
+# -------------------------------------------------------------------
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+
+# name -> (limit, queue, wait_ms, retry_after)
+_CLASS_DEFAULTS = {
+    "auth_cpu": (4, 32, 1000, 2),
+    "db_write": (40, 200, 500, 1),
+    "public_read": (100, 400, 250, 1),
+}
+
+ROUTE_CLASSES = {
+    "Authentication": "auth_cpu",
+    "Events": "db_write",
+    "Registrations": "db_write",
+    "Attendance": "db_write",
+    "Quizzes": "db_write",
+    "Users": "db_write",
+}
+
+# admitted first; everything else is priority 1
+PRIORITY_PATHS = {"/auth/refresh", "/auth/logout"}
+
+
+def _route_classes() -> dict[str, str]:
+    classes = dict(ROUTE_CLASSES)
+    for item in os.getenv("ADMISSION_ROUTE_CLASSES", "").split(","):
+        tag, _, name = item.partition("=")
+        if tag.strip() and name.strip() in _CLASS_DEFAULTS:
+            classes[tag.strip()] = name.strip()
+    return classes
+
+
+class Overloaded(Exception):
+    pass
+
+
+class AdmissionLimiter:
+
+    def __init__(self, name: str, limit: int, queue: int, wait_ms: int, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.wait = wait_ms / 1000
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.preempted = 0
+
+    @classmethod
+    def from_env(cls, name: str) -> "AdmissionLimiter":
+        limit, queue, wait_ms, retry_after = _CLASS_DEFAULTS[name]
+        prefix = f"ADMISSION_{name.upper()}"
+        return cls(
+            name,
+            limit=int(os.getenv(f"{prefix}_LIMIT", str(limit))),
+            queue=int(os.getenv(f"{prefix}_QUEUE", str(queue))),
+            wait_ms=int(os.getenv(f"{prefix}_WAIT_MS", str(wait_ms))),
+            retry_after=int(os.getenv(f"{prefix}_RETRY_AFTER", str(retry_after))),
+        )
+
+    # ---------------------------------------------------------------
+    # Slots
+    # ---------------------------------------------------------------
+
+    def _remove(self, entry: tuple) -> None:
+        self._waiters.remove(entry)
+        heapq.heapify(self._waiters)
+
+    def _preempt(self, priority: int) -> bool:
+        """
+        Sheds the newest waiter with a lower priority than `priority`
+        to make room; False if there is none.
+        """
+        candidates = [entry for entry in self._waiters if entry[0] > priority]
+        if not candidates:
+            return False
+
+        victim = max(candidates, key=lambda entry: (entry[0], entry[1]))
+        self._remove(victim)
+        victim[2].set_exception(Overloaded())
+        self.preempted += 1
+        return True
+
+    async def acquire(self, priority: int = 1) -> None:
+        """
+        Waits for a slot. Raises Overloaded when the request is shed.
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.queue and not self._preempt(priority):
+            self.shed += 1
+            raise Overloaded()
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._seq), future)
+        heapq.heappush(self._waiters, entry)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.wait)
+        except asyncio.TimeoutError:
+            if not future.done():
+                self._remove(entry)
+                future.cancel()
+                self.timed_out += 1
+                self.shed += 1
+                raise Overloaded()
+            if future.exception() is not None:
+                # preempted as the wait ran out
+                self.shed += 1
+                raise Overloaded()
+            # handed a slot as the wait ran out: keep it
+        except Overloaded:
+            self.shed += 1
+            raise
+        except asyncio.CancelledError:
+            # client went away: hand back a slot we were just given
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()
+            elif not future.done():
+                self._remove(entry)
+                future.cancel()
+            raise
+
+        # the releasing request handed its slot over (in_flight unchanged)
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def status(self) -> dict:
+        return {
+            "class": self.name,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "queue": self.queue,
+            "wait_ms": int(self.wait * 1000),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+            "preempted": self.preempted,
+        }
+
+
+_limiters = {name: AdmissionLimiter.from_env(name) for name in _CLASS_DEFAULTS}
+_classes = _route_classes()
+
+
+def limiter_for(tags: list, methods: set[str]) -> AdmissionLimiter | None:
+    for tag in tags:
+        name = _classes.get(tag)
+        if name is None:
+            continue
+        if name == "db_write" and methods <= {"GET", "HEAD"}:
+            name = "public_read"
+        return _limiters[name]
+    return None
+
+
+def admission_snapshot() -> list[dict]:
+    return [limiter.status() for limiter in _limiters.values()]
+
+
+class AdmissionRoute(APIRoute):
+    """
+    Route class that runs the handler (body parsing, dependencies and
+    the endpoint) inside its admission class. Set as `route_class` on
+    the routers.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        limiter = limiter_for(self.tags, self.methods or set())
+        if not ADMISSION_ENABLED or limiter is None:
+            return handler
+
+        priority = 0 if self.path in PRIORITY_PATHS else 1
+        gates = [
+            depends.dependency for depends in self.dependencies
+            if getattr(depends.dependency, "before_admission", False)
+        ]
+
+        async def admitted_handler(request: Request) -> Response:
+            for gate in gates:
+                await gate(request)
+
+            try:
+                await limiter.acquire(priority)
+            except Overloaded:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, retry shortly",
+                    headers={"Retry-After": str(limiter.retry_after)},
+                )
+
+            try:
+                return await handler(request)
+            finally:
+                limiter.release()
+
+        return admitted_handler
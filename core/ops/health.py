@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from core.logging.transport import DISCORD_WEBHOOK_URL, api_log_queue, audit_log_queue
+from core.quiz.answers import answer_writer
+from core.registrations.ingest import registration_ingestor, REGISTRATION_WRITE_BEHIND
+from db.indexes import index_build
+from db.mongo import get_mongo_client
+
+# -------------------------------------------------------------------
+# Readiness probe
+#
+# A background task checks the worker's dependencies every
+# HEALTH_PROBE_INTERVAL_SECONDS and caches the result, serialised, so
+# /readyz is answered without any I/O. Checks:
+#   mongo          ping within HEALTH_PING_TIMEOUT_SECONDS
+#   indexes        the background index build (db/indexes.py) finished
+#   ingestion      write-behind registration / quiz answer writers are
+#                  running and their queues below HEALTH_QUEUE_SATURATION
+#   logging        log workers alive and log queues below saturation
+# A failed mongo, indexes or ingestion check makes the worker unready
+# (requests would fail, be shed, or slip duplicates past unique indexes
+# that do not exist yet). Logging only degrades it: entries are dropped,
+# requests are still served. If the probe itself stops updating for
+# three intervals the cached state is treated as unready.
+# -------------------------------------------------------------------
+
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "5"))
+HEALTH_PING_TIMEOUT_SECONDS = float(os.getenv("HEALTH_PING_TIMEOUT_SECONDS", "2"))
+HEALTH_QUEUE_SATURATION = float(os.getenv("HEALTH_QUEUE_SATURATION", "0.9"))
+
+
+def _body(status: str, checks: dict | None = None) -> bytes:
+    return json.dumps({
+        "status": status,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "checks": checks or {},
+    }).encode()
+
+
+def _queue_check(size: int, capacity: int) -> dict:
+    fill = size / capacity if capacity else 0.0
+    return {"ok": fill < HEALTH_QUEUE_SATURATION, "size": size, "capacity": capacity}
+
+
+class HealthProbe:
+
+    def __init__(self):
+        self.ready = False
+        self.checked_at: float | None = None
+        self.body = _body("starting")
+        self.log_workers: list[asyncio.Task] = []
+
+    # ---------------------------------------------------------------
+    # Checks
+    # ---------------------------------------------------------------
+
+    async def _mongo(self) -> dict:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                get_mongo_client().admin.command("ping"),
+                HEALTH_PING_TIMEOUT_SECONDS,
+            )
+        except Exception as exc:
+            return {"ok": False, "error": str(exc) or type(exc).__name__}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def _indexes(self) -> dict:
+        return {"ok": index_build.built, **index_build.snapshot()}
+
+    def _ingestion(self) -> dict:
+        checks = {
+            "quiz_answers": {
+                "running": answer_writer.running,
+                **_queue_check(answer_writer.backlog, answer_writer.max_queue),
+                "retried": answer_writer.retried,
+                "failed": answer_writer.failed,
+            },
+        }
+        if REGISTRATION_WRITE_BEHIND:
+            checks["registrations"] = {
+                "running": registration_ingestor.running,
+                **_queue_check(registration_ingestor.backlog, registration_ingestor.max_queue),
+                "retried": registration_ingestor.retried,
+                "failed": registration_ingestor.failed,
+            }
+
+        for check in checks.values():
+            check["ok"] = check["ok"] and check["running"]
+        return {"ok": all(check["ok"] for check in checks.values()), **checks}
+
+    def _logging(self) -> dict:
+        if not DISCORD_WEBHOOK_URL:
+            return {"ok": True, "enabled": False}
+
+        alive = sum(not task.done() for task in self.log_workers)
+        queues = {
+            "api": _queue_check(api_log_queue.qsize(), api_log_queue.maxsize),
+            "audit": _queue_check(audit_log_queue.qsize(), audit_log_queue.maxsize),
+        }
+        return {
+            "ok": alive == len(self.log_workers) and all(queue["ok"] for queue in queues.values()),
+            "workers_alive": alive,
+            "workers": len(self.log_workers),
+            "queues": queues,
+        }
+
+    async def check(self) -> None:
+        checks = {
+            "mongo": await self._mongo(),
+            "indexes": self._indexes(),
+            "ingestion": self._ingestion(),
+            "logging": self._logging(),
+        }
+
+        ready = checks["mongo"]["ok"] and checks["indexes"]["ok"] and checks["ingestion"]["ok"]
+        if not ready:
+            status = "unavailable"
+        elif not checks["logging"]["ok"]:
+            status = "degraded"
+        else:
+            status = "ready"
+
+        self.ready = ready
+        self.body = _body(status, checks)
+        self.checked_at = time.monotonic()
+
+    # ---------------------------------------------------------------
+    # Loop and cached answers
+    # ---------------------------------------------------------------
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception as exc:
+                self.ready = False
+                self.body = _body("unavailable", {"probe": {"ok": False, "error": str(exc)}})
+                self.checked_at = time.monotonic()
+            await asyncio.sleep(HEALTH_PROBE_INTERVAL_SECONDS)
+
+    def readiness(self) -> tuple[bool, bytes]:
+        if self.checked_at is None:
+            return False, self.body
+        if time.monotonic() - self.checked_at > 3 * HEALTH_PROBE_INTERVAL_SECONDS:
+            return False, _body("stale")
+        return self.ready, self.body
+
+
+health_probe = HealthProbe()
+
+
+async def health_probe_worker(log_workers: list[asyncio.Task]) -> None:
+    health_probe.log_workers = log_workers
+    await health_probe.run()
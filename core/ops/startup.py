@@ -0,0 +1,79 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# -------------------------------------------------------------------
+# Startup profile
+#
+# Imported first by main.py, so its clock starts before the framework,
+# routers and drivers are imported. Records:
+#   - imports       importing main (routers, models, drivers)
+#   - lifespan      server setup and lifespan startup, until the worker
+#                   accepts requests
+#   - ready         total, from this module's import to accepting requests
+# plus named phases: startup steps, the background index build, and
+# the lazily initialised clients (Firebase, JWT keys) whose cost moved
+# from import time to their first use. Phases that end after the
+# worker is ready are reported as deferred.
+# -------------------------------------------------------------------
+
+
+class StartupProfile:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.imports_ms: float | None = None
+        self.ready_ms: float | None = None
+        self.phases: list[dict] = []
+
+    def _elapsed_ms(self, since: float | None = None) -> float:
+        return round((time.perf_counter() - (since or self.started)) * 1000, 1)
+
+    def imported(self) -> None:
+        self.imports_ms = self._elapsed_ms()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.phases.append({
+                "name": name,
+                "offset_ms": round((started - self.started) * 1000, 1),
+                "duration_ms": self._elapsed_ms(started),
+                "deferred": self.ready_ms is not None,
+                "failed": failed,
+            })
+
+    def ready(self) -> None:
+        self.ready_ms = self._elapsed_ms()
+
+        startup = ", ".join(
+            f"{phase['name']} {phase['duration_ms']:.0f} ms" for phase in self.phases
+        )
+        print(
+            f"🚀 Ready in {self.ready_ms:.0f} ms "
+            f"(imports {self.imports_ms or 0:.0f} ms{', ' + startup if startup else ''})"
+        )
+
+    def report(self) -> dict:
+        lifespan_ms = None
+        if self.ready_ms is not None and self.imports_ms is not None:
+            lifespan_ms = round(self.ready_ms - self.imports_ms, 1)
+
+        return {
+            "started_at": self.started_at,
+            "imports_ms": self.imports_ms,
+            "lifespan_ms": lifespan_ms,
+            "ready_ms": self.ready_ms,
+            "phases": self.phases,
+        }
+
+
+startup_profile = StartupProfile()
@@ -0,0 +1,40 @@
+import os
+
+from db.batching import BatchWriter
+from db.collections import quiz_answers_collection
+
+# -------------------------------------------------------------------
+# Batched quiz answer persistence
+#
+# Answers are validated in memory by the session engine
+# (core/quiz/session.py), then written through a BatchWriter
+# (db/batching.py) with one insert_many(ordered=False) per
+# QUIZ_ANSWER_FLUSH_MS window. A question closing with 1,000 answers
+# in its last second costs a handful of writes. An answer is reported
+# accepted only once its batch is written; failed writes are retried.
+# Duplicates from other workers are rejected by the unique
+# (quiz_id, user_id, question_index) index.
+# -------------------------------------------------------------------
+
+QUIZ_ANSWER_QUEUE_SIZE = int(os.getenv("QUIZ_ANSWER_QUEUE_SIZE", "20000"))
+QUIZ_ANSWER_FLUSH_MS = int(os.getenv("QUIZ_ANSWER_FLUSH_MS", "50"))
+QUIZ_ANSWER_MAX_BATCH = int(os.getenv("QUIZ_ANSWER_MAX_BATCH", "1000"))
+
+
+class AnswerWriter(BatchWriter):
+
+    name = "Quiz answer writer"
+
+    def __init__(
+        self,
+        max_queue: int = QUIZ_ANSWER_QUEUE_SIZE,
+        flush_interval_ms: int = QUIZ_ANSWER_FLUSH_MS,
+        max_batch: int = QUIZ_ANSWER_MAX_BATCH,
+    ):
+        super().__init__(max_queue, flush_interval_ms, max_batch)
+
+    async def _insert(self, docs: list[dict]) -> None:
+        await quiz_answers_collection().insert_many(docs, ordered=False)
+
+
+answer_writer = AnswerWriter()
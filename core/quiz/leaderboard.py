@@ -0,0 +1,245 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+from db.codec import encode_id, decode_id
+from db.collections import quiz_answers_collection, quiz_leaderboard_collection
+
+# -------------------------------------------------------------------
+# Quiz leaderboard
+#
+# Participants are ordered by (score desc, total latency of correct
+# answers asc, user_id). The order lives in an indexable skip list, so
+# an update, "rank of user X" and the top k cost O(log n) (+ k), with
+# no sort per request.
+#
+# Answers are accepted on whichever worker received them, so the board
+# is not fed per answer. Once a question slot has closed and its
+# answers have settled in `quiz_answers`, every worker reads the answers
+# given in that slot once and applies them. Slots, not canonical
+# questions: with shuffle_questions a participant can answer question 7
+# in slot 2, and that answer has settled when slot 2 closes. The result is snapshotted to
+# `quiz_leaderboards` (first worker per question wins), and a restarted
+# worker restores the latest snapshot and replays only later questions.
+# -------------------------------------------------------------------
+
+_MAX_LEVEL = 24
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next: list[_Node | None] = [None] * level
+        self.width: list[int] = [1] * level
+
+
+class RankIndex:
+    """
+    Indexable skip list of unique, comparable keys: insert, remove,
+    rank and positional access in O(log n) expected.
+    """
+
+    def __init__(self):
+        self._head = _Node(None, _MAX_LEVEL)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _path(self, key, inclusive: bool) -> tuple[list[_Node], list[int]]:
+        # last node per level with key < `key` (<= if inclusive), and
+        # the bottom-level steps taken on each level to reach it
+        chain: list[_Node] = [self._head] * _MAX_LEVEL
+        steps = [0] * _MAX_LEVEL
+        node = self._head
+
+        for level in reversed(range(_MAX_LEVEL)):
+            while True:
+                nxt = node.next[level]
+                if nxt is None or nxt.key > key or (nxt.key == key and not inclusive):
+                    break
+                steps[level] += node.width[level]
+                node = nxt
+            chain[level] = node
+
+        return chain, steps
+
+    def insert(self, key) -> None:
+        chain, steps = self._path(key, inclusive=True)
+
+        level = 1
+        while level < _MAX_LEVEL and random.random() < 0.5:
+            level += 1
+
+        node = _Node(key, level)
+        walked = 0
+        for i in range(level):
+            prev = chain[i]
+            node.next[i] = prev.next[i]
+            prev.next[i] = node
+            node.width[i] = prev.width[i] - walked
+            prev.width[i] = walked + 1
+            walked += steps[i]
+
+        for i in range(level, _MAX_LEVEL):
+            chain[i].width[i] += 1
+
+        self._size += 1
+
+    def remove(self, key) -> None:
+        chain, _ = self._path(key, inclusive=False)
+
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+
+        for i in range(len(node.next)):
+            prev = chain[i]
+            prev.width[i] += node.width[i] - 1
+            prev.next[i] = node.next[i]
+
+        for i in range(len(node.next), _MAX_LEVEL):
+            chain[i].width[i] -= 1
+
+        self._size -= 1
+
+    def rank(self, key) -> int:
+        """
+        Number of keys strictly smaller than `key` (its 0-based position).
+        """
+        _, steps = self._path(key, inclusive=False)
+        return sum(steps)
+
+    def first(self, k: int) -> list:
+        keys = []
+        node = self._head.next[0]
+        while node is not None and len(keys) < k:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class Leaderboard:
+
+    def __init__(self):
+        self._index = RankIndex()
+        # user_id -> (score, latency_ms)
+        self._entries: dict[str, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(user_id: str, score: int, latency_ms: int) -> tuple:
+        return (-score, latency_ms, user_id)
+
+    def set(self, user_id: str, score: int, latency_ms: int) -> None:
+        previous = self._entries.get(user_id)
+        if previous == (score, latency_ms):
+            return
+        if previous is not None:
+            self._index.remove(self._key(user_id, *previous))
+
+        self._entries[user_id] = (score, latency_ms)
+        self._index.insert(self._key(user_id, score, latency_ms))
+
+    def add(self, user_id: str, score: int, latency_ms: int) -> None:
+        previous_score, previous_latency = self._entries.get(user_id, (0, 0))
+        self.set(user_id, previous_score + score, previous_latency + latency_ms)
+
+    def entry(self, user_id: str) -> tuple[int, int, int] | None:
+        """
+        (rank, score, latency_ms) for a participant, rank 1-based.
+        """
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        return self._index.rank(self._key(user_id, *entry)) + 1, *entry
+
+    def top(self, k: int) -> list[tuple[int, str, int, int]]:
+        """
+        (rank, user_id, score, latency_ms) of the best k participants.
+        """
+        return [
+            (rank, user_id, -negative_score, latency_ms)
+            for rank, (negative_score, latency_ms, user_id) in enumerate(self._index.first(k), start=1)
+        ]
+
+    def items(self):
+        return self._entries.items()
+
+
+class QuizLeaderboard:
+    """
+    A quiz's leaderboard as of `applied_through` (last slot applied).
+    """
+
+    def __init__(self, quiz_id: str):
+        self.quiz_id = quiz_id
+        self.board = Leaderboard()
+        self.applied_through = -1
+        self._restored = False
+        self._lock = asyncio.Lock()
+
+    async def catch_up(self, closed_through: int) -> None:
+        """
+        Applies every closed slot up to `closed_through` that is not
+        on the board yet, then snapshots. Safe to call repeatedly.
+        """
+        async with self._lock:
+            if not self._restored:
+                await self._restore()
+                self._restored = True
+
+            if closed_through <= self.applied_through:
+                return
+
+            for index in range(self.applied_through + 1, closed_through + 1):
+                await self._apply(index)
+                self.applied_through = index
+
+            await self._snapshot()
+
+    async def _apply(self, position: int) -> None:
+        cursor = quiz_answers_collection().find(
+            {"quiz_id": encode_id(self.quiz_id), "position": position},
+            {"_id": 0, "user_id": 1, "correct": 1, "latency_ms": 1},
+        )
+        async for answer in cursor:
+            correct = answer.get("correct", False)
+            self.board.add(
+                decode_id(answer["user_id"]),
+                1 if correct else 0,
+                answer.get("latency_ms", 0) if correct else 0,
+            )
+
+    async def _restore(self) -> None:
+        snapshot = await quiz_leaderboard_collection().find_one({"_id": encode_id(self.quiz_id)})
+        if not snapshot:
+            return
+
+        for entry in snapshot.get("entries", []):
+            self.board.set(decode_id(entry["user_id"]), entry["score"], entry["latency_ms"])
+        self.applied_through = snapshot["question_index"]
+
+    async def _snapshot(self) -> None:
+        try:
+            await quiz_leaderboard_collection().update_one(
+                {"_id": encode_id(self.quiz_id), "question_index": {"$lt": self.applied_through}},
+                {"$set": {
+                    "question_index": self.applied_through,
+                    "entries": [
+                        {"user_id": encode_id(user_id), "score": score, "latency_ms": latency_ms}
+                        for user_id, (score, latency_ms) in self.board.items()
+                    ],
+                    "updated_at": datetime.now(timezone.utc),
+                }},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # another worker already snapshotted this question (or a later one)
+            pass
@@ -0,0 +1,148 @@
+import hashlib
+import json
+from collections import OrderedDict
+
+from db.codec import encode_id
+from db.collections import quiz_collection
+
+# -------------------------------------------------------------------
+# Compiled quiz payloads
+#
+# A quiz version is compiled once into pre-serialized JSON fragments:
+# a header, one fragment per question and one per option, with
+# `correct_option_id` and `explanation` stripped. A participant's
+# paper is those fragments joined in that participant's order: byte
+# concatenation, no model building or json.dumps per request.
+#
+# Orders are derived, not stored: the permutation for (quiz_id,
+# user_id) sorts positions by a keyed BLAKE2b hash, so any worker
+# computes the same order at any time, and grading maps a participant's
+# position back to the canonical question with the same permutation.
+# Options keep their ids when shuffled, so answers need no mapping.
+# -------------------------------------------------------------------
+
+PAYLOAD_CACHE_SIZE = 256
+
+PAPER_PROJECTION = {
+    "version": 1,
+    "title": 1,
+    "description": 1,
+    "settings": 1,
+    "questions.question": 1,
+    "questions.options": 1,
+}
+
+
+def permutation(size: int, *seed: str) -> list[int]:
+    """
+    Deterministic permutation of range(size) for the given seed parts.
+    """
+    key = hashlib.blake2b(":".join(seed).encode(), digest_size=16).digest()
+    return sorted(
+        range(size),
+        key=lambda i: hashlib.blake2b(i.to_bytes(4, "big"), key=key, digest_size=8).digest(),
+    )
+
+
+def question_order(quiz_id: str, user_id: str, size: int, shuffle: bool) -> list[int]:
+    """
+    Canonical question index at each of the participant's positions.
+    """
+    if not shuffle:
+        return list(range(size))
+    return permutation(size, quiz_id, user_id, "questions")
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+class CompiledQuiz:
+
+    def __init__(self, quiz_id: str, doc: dict):
+        settings = doc["settings"]
+
+        self.quiz_id = quiz_id
+        self.version = doc.get("version", 1)
+        self.shuffle_questions = settings.get("shuffle_questions", False)
+        self.shuffle_options = settings.get("shuffle_options", False)
+        self.total_questions = len(doc["questions"])
+
+        header = _dumps({
+            "quiz_id": quiz_id,
+            "version": self.version,
+            "title": doc["title"],
+            "description": doc.get("description"),
+            "question_timer_seconds": settings["question_timer_seconds"],
+            "total_questions": self.total_questions,
+        })
+        self._header = header[:-1] + b',"questions":['
+
+        # (prefix up to the options list, option fragments)
+        self._questions: list[tuple[bytes, list[bytes]]] = [
+            (
+                b'{"question":' + _dumps(question["question"]) + b',"options":[',
+                [_dumps({"id": option["id"], "text": option["text"]}) for option in question["options"]],
+            )
+            for question in doc["questions"]
+        ]
+
+    def question_order(self, user_id: str) -> list[int]:
+        return question_order(self.quiz_id, user_id, self.total_questions, self.shuffle_questions)
+
+    def option_order(self, user_id: str, question_index: int) -> list[int]:
+        size = len(self._questions[question_index][1])
+        if not self.shuffle_options:
+            return list(range(size))
+        return permutation(size, self.quiz_id, user_id, "options", str(question_index))
+
+    def render(self, user_id: str, through: int | None = None) -> bytes:
+        """
+        The participant's paper, limited to their first `through + 1`
+        positions if given.
+        """
+        order = self.question_order(user_id)
+        if through is not None:
+            order = order[:through + 1]
+
+        parts = []
+        for index in order:
+            prefix, options = self._questions[index]
+            parts.append(
+                prefix
+                + b",".join(options[i] for i in self.option_order(user_id, index))
+                + b"]}"
+            )
+
+        return self._header + b",".join(parts) + b"]}"
+
+
+_compiled: OrderedDict[tuple[str, int], CompiledQuiz] = OrderedDict()
+
+
+async def get_compiled(quiz_id: str) -> CompiledQuiz | None:
+    """
+    The compiled current version of a quiz, or None if it does not exist.
+    Costs one `_id` lookup of the version when cached.
+    """
+    key = encode_id(quiz_id)
+    current = await quiz_collection().find_one({"_id": key}, {"version": 1})
+    if not current:
+        return None
+
+    cache_key = (quiz_id, current.get("version", 1))
+    compiled = _compiled.get(cache_key)
+    if compiled:
+        _compiled.move_to_end(cache_key)
+        return compiled
+
+    doc = await quiz_collection().find_one({"_id": key}, PAPER_PROJECTION)
+    if not doc:
+        return None
+
+    compiled = CompiledQuiz(quiz_id, doc)
+    _compiled[(quiz_id, compiled.version)] = compiled
+    while len(_compiled) > PAYLOAD_CACHE_SIZE:
+        _compiled.popitem(last=False)
+
+    return compiled
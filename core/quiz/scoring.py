@@ -0,0 +1,266 @@
+from datetime import datetime, timezone
+from itertools import chain
+from operator import itemgetter
+
+import numpy as np
+from pymongo import ReplaceOne
+
+from db.codec import encode_id
+from db.collections import quiz_collection, quiz_answers_collection, quiz_results_collection
+from core.bulk.rows import chunked
+
+# -------------------------------------------------------------------
+# Batch quiz scoring
+#
+# MongoDB groups a quiz's answers per user (answer_groups: one document
+# per participant with parallel question / option / latency arrays, in
+# user_id order). The groups are streamed in chunks, each flattened into
+# NumPy index columns (np.fromiter over the chained arrays, option ids
+# through one dict), and scattered by fancy indexing into two dense
+# users x questions matrices:
+#   choices   int16   option index, -1 = unanswered
+#   latency   int32   answer time in ms
+# No Python code runs per answer. Everything after that is whole-array
+# NumPy: per-user scores and pass/fail, rank (score desc,
+# correct-answer latency asc, user_id, as on the live leaderboard), and
+# per question answer rate, difficulty (share answering correctly),
+# discrimination (item-total correlation) and option distribution.
+# Per-user results go back with bulk upserts into `quiz_results`; the
+# summary is stored on the quiz document.
+# -------------------------------------------------------------------
+
+# participants per chunk
+SCORING_CHUNK_SIZE = 1000
+RESULT_WRITE_BATCH = 1000
+
+
+def answer_groups(quiz_key) -> list[dict]:
+    return [
+        {"$match": {"quiz_id": quiz_key}},
+        {"$group": {
+            "_id": "$user_id",
+            "questions": {"$push": "$question_index"},
+            "options": {"$push": "$option_id"},
+            "latencies": {"$push": {"$ifNull": ["$latency_ms", 0]}},
+        }},
+        # Binary UUIDs sort like their strings: rows come in user_id order
+        {"$sort": {"_id": 1}},
+    ]
+
+
+_ID = itemgetter("_id")
+_QUESTIONS = itemgetter("questions")
+_OPTIONS = itemgetter("options")
+_LATENCIES = itemgetter("latencies")
+
+
+class AnswerMatrixBuilder:
+    """
+    Row i of the matrices is user_ids[i]; rows follow the order the
+    groups arrive in (user_id order from answer_groups).
+    """
+
+    def __init__(self, questions: list[dict]):
+        self.total_questions = len(questions)
+        self.option_ids = [[option["id"] for option in q["options"]] for q in questions]
+        self._option_index = [
+            {option_id: i for i, option_id in enumerate(ids)} for ids in self.option_ids
+        ]
+        self.correct = np.array(
+            [index[q["correct_option_id"]] for q, index in zip(questions, self._option_index)],
+            dtype=np.int16,
+        )
+
+        self.user_ids: list = []
+        # (rows, questions, options, latencies) per chunk
+        self._chunks: list[tuple[np.ndarray, ...]] = []
+
+    def add(self, groups: list[dict]) -> None:
+        """
+        Adds a chunk of per-user answer groups (see answer_groups), in
+        user_id order.
+        """
+        if not groups:
+            return
+
+        first_row = len(self.user_ids)
+        self.user_ids.extend(map(_ID, groups))
+
+        sizes = np.fromiter(map(len, map(_QUESTIONS, groups)), dtype=np.int64, count=len(groups))
+        count = int(sizes.sum())
+        rows = np.repeat(np.arange(first_row, first_row + len(groups), dtype=np.int64), sizes)
+        questions = np.fromiter(chain.from_iterable(map(_QUESTIONS, groups)), dtype=np.int64, count=count)
+        latencies = np.fromiter(chain.from_iterable(map(_LATENCIES, groups)), dtype=np.int64, count=count)
+
+        # option ids -> option indexes through a (question, distinct option id) table
+        option_ids = list(chain.from_iterable(map(_OPTIONS, groups)))
+        distinct = {option_id: code for code, option_id in enumerate(set(option_ids))}
+        codes = np.fromiter(map(distinct.__getitem__, option_ids), dtype=np.int64, count=count)
+        table = np.array(
+            [[index.get(option_id, -1) for option_id in distinct] for index in self._option_index],
+            dtype=np.int16,
+        ).reshape(self.total_questions, len(distinct))
+
+        valid = (questions >= 0) & (questions < self.total_questions)
+        questions = questions[valid]
+        self._chunks.append((rows[valid], questions, table[questions, codes[valid]], latencies[valid]))
+
+    def build(self) -> tuple[np.ndarray, np.ndarray]:
+        shape = (len(self.user_ids), self.total_questions)
+        choices = np.full(shape, -1, dtype=np.int16)
+        latency = np.zeros(shape, dtype=np.int32)
+        for rows, questions, options, latencies in self._chunks:
+            choices[rows, questions] = options
+            latency[rows, questions] = latencies
+        return choices, latency
+
+
+def score_matrix(
+    choices: np.ndarray,
+    latency: np.ndarray,
+    correct: np.ndarray,
+    option_count: int,
+    passing_score_percentage: int | None = None,
+) -> dict:
+    """
+    Scores a users x questions choice matrix. Returns per-user arrays
+    (score, percentage, passed, latency_ms, rank) and per-question
+    arrays (answered_rate, difficulty, discrimination, distribution).
+    """
+    users, total_questions = choices.shape
+
+    is_correct = choices == correct[np.newaxis, :]
+    answered = choices >= 0
+
+    score = is_correct.sum(axis=1, dtype=np.int32)
+    percentage = score * (100.0 / total_questions) if total_questions else np.zeros(users)
+    passed = (
+        percentage >= passing_score_percentage
+        if passing_score_percentage is not None
+        else None
+    )
+    correct_latency = np.where(is_correct, latency, 0).sum(axis=1, dtype=np.int64)
+
+    # rank: score desc, then correct-answer latency asc; exact ties keep
+    # row order (lexsort is stable), which is user_id order
+    order = np.lexsort((correct_latency, -score))
+    rank = np.empty(users, dtype=np.int32)
+    rank[order] = np.arange(1, users + 1, dtype=np.int32)
+
+    # item-total correlation; NaN where a question or the totals do not vary
+    items = is_correct.astype(np.float64)
+    centered_items = items - items.mean(axis=0) if users else items
+    centered_total = score - score.mean() if users else score.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discrimination = (centered_items.T @ centered_total) / (
+            np.sqrt((centered_items ** 2).sum(axis=0)) * np.sqrt((centered_total ** 2).sum())
+        )
+
+    # option distribution: one bincount over (question, option) cells
+    cells = (np.arange(total_questions, dtype=np.int64)[np.newaxis, :] * option_count + choices)[answered]
+    distribution = np.bincount(cells, minlength=total_questions * option_count).reshape(
+        total_questions, option_count
+    )
+
+    return {
+        "score": score,
+        "percentage": percentage,
+        "passed": passed,
+        "latency_ms": correct_latency,
+        "rank": rank,
+        "answered_rate": answered.mean(axis=0) if users else np.zeros(total_questions),
+        "difficulty": is_correct.mean(axis=0) if users else np.zeros(total_questions),
+        "discrimination": discrimination,
+        "distribution": distribution,
+    }
+
+
+def _rate(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+async def score_quiz(quiz_id: str) -> dict:
+    """
+    Scores every answer of a quiz, writes per-user results and returns
+    (and stores) the quiz summary. Raises LookupError if the quiz does
+    not exist.
+    """
+    key = encode_id(quiz_id)
+    quiz = await quiz_collection().find_one(
+        {"_id": key},
+        {"questions": 1, "settings.passing_score_percentage": 1},
+    )
+    if not quiz:
+        raise LookupError(quiz_id)
+
+    builder = AnswerMatrixBuilder(quiz["questions"])
+    cursor = await quiz_answers_collection().aggregate(
+        answer_groups(key),
+        allowDiskUse=True,
+        batchSize=SCORING_CHUNK_SIZE,
+    )
+    async for groups in chunked(cursor, SCORING_CHUNK_SIZE):
+        builder.add(groups)
+
+    choices, latency = builder.build()
+    passing = quiz["settings"].get("passing_score_percentage")
+    option_count = max((len(ids) for ids in builder.option_ids), default=0)
+    result = score_matrix(choices, latency, builder.correct, option_count, passing)
+
+    now = datetime.now(timezone.utc)
+    users = len(builder.user_ids)
+
+    score = result["score"].tolist()
+    percentage = result["percentage"].tolist()
+    passed = result["passed"].tolist() if result["passed"] is not None else [None] * users
+    latency_ms = result["latency_ms"].tolist()
+    rank = result["rank"].tolist()
+
+    for start in range(0, users, RESULT_WRITE_BATCH):
+        await quiz_results_collection().bulk_write(
+            [
+                ReplaceOne(
+                    {"quiz_id": key, "user_id": encode_id(builder.user_ids[i])},
+                    {
+                        "quiz_id": key,
+                        "user_id": encode_id(builder.user_ids[i]),
+                        "score": score[i],
+                        "percentage": round(percentage[i], 2),
+                        "passed": passed[i],
+                        "latency_ms": latency_ms[i],
+                        "rank": rank[i],
+                        "scored_at": now,
+                    },
+                    upsert=True,
+                )
+                for i in range(start, min(start + RESULT_WRITE_BATCH, users))
+            ],
+            ordered=False,
+        )
+
+    summary = {
+        "participants": users,
+        "total_questions": builder.total_questions,
+        "mean_score": round(float(result["score"].mean()), 2) if users else 0.0,
+        "pass_rate": (
+            round(float(result["passed"].mean()), 4)
+            if users and result["passed"] is not None else None
+        ),
+        "questions": [
+            {
+                "question_index": q,
+                "answered_rate": _rate(result["answered_rate"][q]),
+                "difficulty": _rate(result["difficulty"][q]),
+                "discrimination": _rate(result["discrimination"][q]),
+                "option_counts": {
+                    option_id: int(result["distribution"][q][i])
+                    for i, option_id in enumerate(builder.option_ids[q])
+                },
+            }
+            for q in range(builder.total_questions)
+        ],
+        "scored_at": now,
+    }
+
+    await quiz_collection().update_one({"_id": key}, {"$set": {"results": summary}})
+    return summary
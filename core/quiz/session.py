@@ -0,0 +1,350 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+from db.codec import encode_id
+from db.collections import quiz_collection
+from core.quiz.answers import answer_writer, QUIZ_ANSWER_FLUSH_MS
+from core.quiz.leaderboard import QuizLeaderboard
+from core.quiz.payloads import question_order
+from models.quiz import AnswerStatus, QuizSessionStatus
+
+# -------------------------------------------------------------------
+# Live quiz sessions
+#
+# A running quiz is fully described by `live.started_at` on the quiz
+# document and the uniform question timer: question i is open during
+#   [started_at + i * timer, started_at + (i + 1) * timer)
+# Every worker derives the open question from its own clock, so there
+# is no shared "current question" to read or coordinate.
+#
+# Each worker loads a session once (shared load per quiz) and then
+# validates answers entirely in memory: window check, option check,
+# and a per-worker (user, question) set against double submits; the
+# unique index on quiz_answers catches doubles across workers. Answers
+# go to the batched answer writer, and are reported accepted once their
+# batch is written.
+#
+# With shuffle_questions each participant sees their own question in a
+# slot (core/quiz/payloads.py): frames then carry only slot timing, the
+# client renders the question from its paper, and answers name the
+# participant's position, mapped back to the canonical question here.
+# Answers are stored with both, so slot-by-slot leaderboard updates see
+# every answer given in the slot, whichever question it was.
+#
+# One pump task per session sleeps until each boundary and publishes
+# `question` / `reveal` / `finished` frames, serialized once, to every
+# SSE client queue. LEADERBOARD_SETTLE_SECONDS after a question closes
+# (late answers and batched writes have landed) the leaderboard applies it.
+# An answer whose write is still being retried then (a failover) is
+# missed by the live leaderboard, and counted by final scoring.
+# -------------------------------------------------------------------
+
+QUIZ_START_DELAY_SECONDS = int(os.getenv("QUIZ_START_DELAY_SECONDS", "5"))
+QUIZ_ANSWER_GRACE_MS = int(os.getenv("QUIZ_ANSWER_GRACE_MS", "500"))
+
+# after a question closes, when its answers are in quiz_answers
+LEADERBOARD_SETTLE_SECONDS = (QUIZ_ANSWER_GRACE_MS + 2 * QUIZ_ANSWER_FLUSH_MS) / 1000 + 0.5
+
+# finished sessions stay cached (for late answers and reconnects) this long
+QUIZ_SESSION_LINGER_SECONDS = 300
+
+# frames a slow client may fall behind before the oldest is dropped
+SUBSCRIBER_QUEUE_SIZE = 8
+
+SESSION_PROJECTION = {
+    "live": 1,
+    "settings.question_timer_seconds": 1,
+    "settings.shuffle_questions": 1,
+    "questions": 1,
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def _frame(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class QuizSession:
+
+    def __init__(self, quiz_id: str, doc: dict):
+        self.quiz_id = quiz_id
+        self.started_at = _as_utc(doc["live"]["started_at"]).timestamp()
+        self.timer = doc["settings"]["question_timer_seconds"]
+        self.shuffle_questions = doc["settings"].get("shuffle_questions", False)
+        self.questions = doc["questions"]
+        self.option_ids = [{option["id"] for option in q["options"]} for q in self.questions]
+
+        self.answered: set[tuple[str, int]] = set()
+        self._orders: dict[str, list[int]] = {}
+        self.leaderboard = QuizLeaderboard(quiz_id)
+        self.frame: str | None = None
+        self.subscribers: set[asyncio.Queue] = set()
+        self._pump: asyncio.Task | None = None
+        self._board_updates: set[asyncio.Task] = set()
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.questions)
+
+    @property
+    def ends_at(self) -> float:
+        return self.started_at + self.timer * self.total_questions
+
+    def opens_at(self, index: int) -> float:
+        return self.started_at + self.timer * index
+
+    def closes_at(self, index: int) -> float:
+        return self.opens_at(index + 1)
+
+    def question_at(self, now: float) -> int | None:
+        """
+        Index of the question open at `now`, or None before the start
+        and after the end.
+        """
+        if now < self.started_at or now >= self.ends_at:
+            return None
+        return int((now - self.started_at) // self.timer)
+
+    def settled_through(self, now: float) -> int:
+        """
+        Last question whose answers have settled (-1 if none).
+        """
+        elapsed = now - LEADERBOARD_SETTLE_SECONDS - self.started_at
+        if elapsed < self.timer:
+            return -1
+        return min(int(elapsed // self.timer), self.total_questions) - 1
+
+    def status(self, now: float) -> QuizSessionStatus:
+        if now < self.started_at:
+            return QuizSessionStatus.scheduled
+        if now >= self.ends_at:
+            return QuizSessionStatus.finished
+        return QuizSessionStatus.live
+
+    # ---------------------------------------------------------------
+    # Answers
+    # ---------------------------------------------------------------
+
+    def canonical_question(self, user_id: str, position: int) -> int:
+        if not self.shuffle_questions:
+            return position
+
+        order = self._orders.get(user_id)
+        if order is None:
+            order = self._orders[user_id] = question_order(
+                self.quiz_id, user_id, self.total_questions, True
+            )
+        return order[position]
+
+    async def answer(self, user_id: str, position: int, option_id: str) -> AnswerStatus:
+        """
+        Validates an answer for the participant's question in slot
+        `position` against the server clock and writes it.
+        Raises asyncio.QueueFull when the answer writer is saturated,
+        or the write's error if it could not be saved.
+        """
+        now = time.time()
+        grace = QUIZ_ANSWER_GRACE_MS / 1000
+
+        if (
+            position >= self.total_questions
+            or now < self.opens_at(position)
+            or now > self.closes_at(position) + grace
+        ):
+            return AnswerStatus.question_closed
+
+        question_index = self.canonical_question(user_id, position)
+
+        if option_id not in self.option_ids[question_index]:
+            return AnswerStatus.invalid_option
+
+        key = (user_id, question_index)
+        if key in self.answered:
+            return AnswerStatus.already_answered
+
+        question = self.questions[question_index]
+        answered_at = datetime.fromtimestamp(now, tz=timezone.utc)
+
+        # claimed before the write, so a double submit here is refused
+        # while the first is in flight
+        self.answered.add(key)
+        try:
+            await answer_writer.submit({
+                "quiz_id": encode_id(self.quiz_id),
+                "user_id": encode_id(user_id),
+                "question_index": question_index,
+                # the slot it was shown in: the leaderboard applies answers by slot
+                "position": position,
+                "option_id": option_id,
+                "correct": option_id == question["correct_option_id"],
+                "answered_at": answered_at,
+                "latency_ms": int((now - self.opens_at(position)) * 1000),
+            })
+        except DuplicateKeyError:
+            # answered on another worker
+            return AnswerStatus.already_answered
+        except Exception:
+            self.answered.discard(key)
+            raise
+        return AnswerStatus.accepted
+
+    # ---------------------------------------------------------------
+    # Broadcasting
+    # ---------------------------------------------------------------
+
+    def question_frame(self, index: int) -> str:
+        data = {
+            "quiz_id": self.quiz_id,
+            "question_index": index,
+            "total_questions": self.total_questions,
+            "opens_at": _iso(self.opens_at(index)),
+            "closes_at": _iso(self.closes_at(index)),
+        }
+        if not self.shuffle_questions:
+            question = self.questions[index]
+            data["question"] = question["question"]
+            data["options"] = [{"id": o["id"], "text": o["text"]} for o in question["options"]]
+        return _frame("question", data)
+
+    def reveal_frame(self, index: int) -> str:
+        data = {"quiz_id": self.quiz_id, "question_index": index}
+        if not self.shuffle_questions:
+            question = self.questions[index]
+            data["correct_option_id"] = question["correct_option_id"]
+            data["explanation"] = question.get("explanation")
+        return _frame("reveal", data)
+
+    def finished_frame(self) -> str:
+        return _frame("finished", {"quiz_id": self.quiz_id, "ended_at": _iso(self.ends_at)})
+
+    def start(self) -> None:
+        if self._pump is None:
+            self._pump = asyncio.create_task(self._run())
+
+    def listen(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        if self.frame:
+            queue.put_nowait(self.frame)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def close(self) -> None:
+        if self._pump:
+            self._pump.cancel()
+        for task in self._board_updates:
+            task.cancel()
+        for queue in self.subscribers:
+            self._offer(queue, None)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, frame: str | None) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(frame)
+
+    def _publish(self, frame: str) -> None:
+        self.frame = frame
+        for queue in self.subscribers:
+            self._offer(queue, frame)
+
+    def _update_leaderboard(self, question_index: int, delay: float = 0) -> None:
+        async def update():
+            await asyncio.sleep(delay)
+            try:
+                await self.leaderboard.catch_up(question_index)
+            except Exception as exc:
+                print(f"Leaderboard update failed for quiz {self.quiz_id}: {exc}")
+
+        task = asyncio.create_task(update())
+        self._board_updates.add(task)
+        task.add_done_callback(self._board_updates.discard)
+
+    async def _run(self) -> None:
+        # restore (and replay) questions that closed before this worker loaded the quiz
+        settled = self.settled_through(time.time())
+        if settled >= 0:
+            self._update_leaderboard(settled)
+
+        while True:
+            now = time.time()
+            index = self.question_at(now)
+
+            if now < self.started_at:
+                await asyncio.sleep(self.started_at - now)
+                continue
+
+            if index is None:
+                self._publish(self.finished_frame())
+                settle = self.ends_at + LEADERBOARD_SETTLE_SECONDS - now
+                self._update_leaderboard(self.total_questions - 1, delay=max(settle, 0))
+                break
+
+            self._publish(self.question_frame(index))
+            await asyncio.sleep(max(self.closes_at(index) - time.time(), 0))
+            self._publish(self.reveal_frame(index))
+            self._update_leaderboard(index, delay=LEADERBOARD_SETTLE_SECONDS)
+
+        await asyncio.sleep(QUIZ_SESSION_LINGER_SECONDS)
+        if _sessions.get(self.quiz_id) is self:
+            del _sessions[self.quiz_id]
+        for queue in self.subscribers:
+            self._offer(queue, None)
+
+
+_sessions: dict[str, QuizSession] = {}
+_loading: dict[str, asyncio.Task] = {}
+
+
+async def _load(quiz_id: str) -> QuizSession | None:
+    doc = await quiz_collection().find_one(
+        {"_id": encode_id(quiz_id), "live.started_at": {"$exists": True}},
+        SESSION_PROJECTION,
+    )
+    if not doc:
+        return None
+
+    session = _sessions.get(quiz_id)
+    if session is None:
+        session = _sessions[quiz_id] = QuizSession(quiz_id, doc)
+        session.start()
+    return session
+
+
+async def get_session(quiz_id: str) -> QuizSession | None:
+    """
+    The running (or recently finished) session for a quiz, or None if
+    the quiz does not exist or has not been started.
+    """
+    session = _sessions.get(quiz_id)
+    if session:
+        return session
+
+    # one load per quiz however many clients arrive at once
+    task = _loading.get(quiz_id)
+    if task is None:
+        task = _loading[quiz_id] = asyncio.create_task(_load(quiz_id))
+        task.add_done_callback(lambda _: _loading.pop(quiz_id, None))
+
+    await asyncio.wait([task])
+    return task.result()
+
+
+def close_sessions() -> None:
+    for session in _sessions.values():
+        session.close()
+    _sessions.clear()
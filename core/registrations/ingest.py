@@ -0,0 +1,40 @@
+import os
+
+from db.batching import BatchWriter
+from db.repositories.backend import registrations_repository
+
+# -------------------------------------------------------------------
+# Write-behind registration ingestion
+#
+# Registration intents are queued in process and flushed as a single
+# insert_many(ordered=False) every REGISTRATION_FLUSH_MS, so a burst of
+# N registrations costs ~N / REGISTRATION_MAX_BATCH pool checkouts
+# instead of N. Each caller awaits its registration's outcome, resolved
+# exactly like insert_one would: None on success, DuplicateKeyError /
+# WriteError otherwise. Queueing, batching and retries are the shared
+# BatchWriter's (db/batching.py).
+# -------------------------------------------------------------------
+
+REGISTRATION_WRITE_BEHIND = os.getenv("REGISTRATION_WRITE_BEHIND", "false").lower() == "true"
+REGISTRATION_QUEUE_SIZE = int(os.getenv("REGISTRATION_QUEUE_SIZE", "10000"))
+REGISTRATION_FLUSH_MS = int(os.getenv("REGISTRATION_FLUSH_MS", "5"))
+REGISTRATION_MAX_BATCH = int(os.getenv("REGISTRATION_MAX_BATCH", "500"))
+
+
+class RegistrationIngestor(BatchWriter):
+
+    name = "Registration ingestor"
+
+    def __init__(
+        self,
+        max_queue: int = REGISTRATION_QUEUE_SIZE,
+        flush_interval_ms: int = REGISTRATION_FLUSH_MS,
+        max_batch: int = REGISTRATION_MAX_BATCH,
+    ):
+        super().__init__(max_queue, flush_interval_ms, max_batch)
+
+    async def _insert(self, docs: list[dict]) -> None:
+        await registrations_repository().insert_many(docs)
+
+
+registration_ingestor = RegistrationIngestor()
@@ -16,7 +16,17 @@ class ApiKeyMiddleware(BaseHTTPMiddleware):
         if request.url.path.startswith(("/docs", "/openapi", "/docs/v2")):
             return await call_next(request)
 
+        # load balancer probes carry no credentials
+        if request.url.path in ("/healthz", "/readyz"):
+            return await call_next(request)
+
         api_key = request.headers.get("X-API-KEY")
+        device_id = request.headers.get("X-DEVICE-ID")
+
+        # EventSource cannot set headers, so SSE clients send them as query params
+        if "text/event-stream" in request.headers.get("accept", ""):
+            api_key = api_key or request.query_params.get("api_key")
+            device_id = device_id or request.query_params.get("device_id")
 
         if not api_key:
             return JSONResponse(
@@ -36,7 +46,6 @@ class ApiKeyMiddleware(BaseHTTPMiddleware):
                 }
             )
 
-        device_id = request.headers.get("X-DEVICE-ID")
         if not device_id:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,12 +1,11 @@
-async def is_new_device(refresh_tokens, user_id: str, device_id: str) -> bool:
+from bson.binary import Binary
+
+from db.repositories.base import RefreshTokenRepository
+
+
+async def is_new_device(refresh_tokens: RefreshTokenRepository, user_id: Binary, device_id: str) -> bool:
     """
     Returns True if user logs in from unseen device.
     """
 
-    existing = await refresh_tokens.find_one({
-        "user_id": user_id,
-        "device_id": device_id,
-        "revoked": False,
-    })
-
-    return existing is None
\ No newline at end of file
+    return not await refresh_tokens.has_active_device(user_id, device_id)
@@ -0,0 +1,299 @@
+import hashlib
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, Request, status
+from pymongo import UpdateOne
+
+from db.collections import rate_limits_collection
+
+# -------------------------------------------------------------------
+# Auth rate limiting
+#
+# Login, Google login and registration are limited per client IP,
+# normalised email and X-DEVICE-ID. Each (endpoint, identity) pair is a
+# separate budget, so a campus NAT sharing one IP gets a generous IP
+# budget while each account still gets a tight one.
+#
+# Windows are approximate sliding windows: two fixed-window counters,
+# with the previous one weighted by how much of it still overlaps the
+# sliding window, e.g. with a 60 s window, 15 s into the current one:
+#     estimate = previous * 0.75 + current
+# That is O(1) memory per identity and needs no per-request timestamps.
+# An attempt is counted first and decided on the counts that come back,
+# so concurrent attempts on other workers cannot all slip in under the
+# limit. A rejected attempt is then taken back out.
+#
+# The check runs before admission control (core/ops/admission.py), so
+# a flood of rejected attempts never holds an auth_cpu slot.
+#
+# Identities are hashed before they are stored. Backends:
+#   memory   per worker, at most RATE_LIMIT_MAX_KEYS windows (least
+#            recently used evicted)
+#   mongo    `rate_limits`, shared by every worker and instance; TTL
+#            index cleanup. Fails open if MongoDB errors.
+#
+# Limits are "<count>/<seconds>": RATE_LIMIT_IP, RATE_LIMIT_EMAIL,
+# RATE_LIMIT_DEVICE.
+# -------------------------------------------------------------------
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+def _parse_limit(value: str) -> tuple[int, int]:
+    count, _, seconds = value.partition("/")
+    return int(count), int(seconds)
+
+
+RATE_LIMITS = {
+    "ip": _parse_limit(os.getenv("RATE_LIMIT_IP", "120/60")),
+    "email": _parse_limit(os.getenv("RATE_LIMIT_EMAIL", "10/300")),
+    "device": _parse_limit(os.getenv("RATE_LIMIT_DEVICE", "30/60")),
+}
+
+
+def normalize_email(email: str) -> str:
+    """
+    Lowercased, without a +tag, so aliases share the account's budget.
+    """
+    local, _, domain = email.strip().lower().partition("@")
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def _key(scope: str, kind: str, value: str) -> str:
+    digest = hashlib.blake2b(value.encode(), digest_size=12).hexdigest()
+    return f"{scope}:{kind}:{digest}"
+
+
+# -------------------------------------------------------------------
+# Window stores
+# -------------------------------------------------------------------
+
+
+class RateLimitStore(ABC):
+    """
+    Counters per window id ("<key>:<window index>").
+    """
+
+    @abstractmethod
+    async def hit(self, windows: list[tuple[str, float]], previous: list[str]) -> dict[str, int]:
+        """
+        Adds one to each window (the float is when it can be dropped)
+        and returns the counts after that, along with the counts of the
+        `previous` windows.
+        """
+
+    @abstractmethod
+    async def undo(self, windows: list[str]) -> None:
+        """
+        Takes back one hit from each window.
+        """
+
+    def size(self) -> int | None:
+        return None
+
+
+class MemoryRateLimitStore(RateLimitStore):
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._windows: OrderedDict[str, list] = OrderedDict()
+        self.evicted = 0
+
+    async def hit(self, windows, previous):
+        now = time.time()
+        counts = {}
+        for window in previous:
+            entry = self._windows.get(window)
+            if entry is not None and entry[1] > now:
+                counts[window] = entry[0]
+
+        for window, expires_at in windows:
+            entry = self._windows.get(window)
+            if entry is None:
+                entry = self._windows[window] = [0, expires_at]
+            else:
+                self._windows.move_to_end(window)
+            entry[0] += 1
+            counts[window] = entry[0]
+
+        while len(self._windows) > self.max_keys:
+            self._windows.popitem(last=False)
+            self.evicted += 1
+        return counts
+
+    async def undo(self, windows):
+        for window in windows:
+            entry = self._windows.get(window)
+            if entry is not None:
+                entry[0] -= 1
+
+    def size(self):
+        return len(self._windows)
+
+
+class MongoRateLimitStore(RateLimitStore):
+    """
+    Increments with one unordered bulk upsert, then reads every window
+    back: the counts include every attempt that landed first.
+    """
+
+    async def hit(self, windows, previous):
+        collection = rate_limits_collection()
+        await collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": window},
+                    {
+                        "$inc": {"count": 1},
+                        "$setOnInsert": {"expires_at": datetime.fromtimestamp(expires_at, timezone.utc)},
+                    },
+                    upsert=True,
+                )
+                for window, expires_at in windows
+            ],
+            ordered=False,
+        )
+
+        cursor = collection.find(
+            {"_id": {"$in": [window for window, _ in windows] + previous}},
+            {"count": 1},
+        )
+        return {doc["_id"]: doc["count"] async for doc in cursor}
+
+    async def undo(self, windows):
+        await rate_limits_collection().update_many(
+            {"_id": {"$in": windows}},
+            {"$inc": {"count": -1}},
+        )
+
+
+# -------------------------------------------------------------------
+# Limiter
+# -------------------------------------------------------------------
+
+
+class RateLimiter:
+
+    def __init__(self, store: RateLimitStore, limits: dict[str, tuple[int, int]]):
+        self.store = store
+        self.limits = limits
+        self.allowed = 0
+        self.limited: dict[str, int] = {}
+        self.errors = 0
+
+    async def check(self, scope: str, identities: dict[str, str]) -> int | None:
+        """
+        Counts an attempt for every identity, or returns the seconds to
+        wait if any of them is over its limit (nothing is counted then).
+        """
+        now = time.time()
+        checks = []
+        for kind, value in identities.items():
+            limit, window = self.limits[kind]
+            index, offset = divmod(now, window)
+            key = _key(scope, kind, value)
+            checks.append((kind, limit, window, offset, f"{key}:{int(index)}", f"{key}:{int(index) - 1}"))
+
+        current = [current for *_, current, _ in checks]
+        try:
+            counts = await self.store.hit(
+                # a window is read while it is current and for one window after
+                [(current, now - offset + 2 * window) for _, _, window, offset, current, _ in checks],
+                [previous for *_, previous in checks],
+            )
+        except Exception as exc:
+            self.errors += 1
+            print(f"Rate limit store unavailable: {exc}")
+            return None
+
+        for kind, limit, window, offset, current_window, previous in checks:
+            overlap = 1 - offset / window
+            # the estimate before this attempt
+            estimate = counts.get(previous, 0) * overlap + counts.get(current_window, 1) - 1
+            if estimate >= limit:
+                name = f"{scope}:{kind}"
+                self.limited[name] = self.limited.get(name, 0) + 1
+                try:
+                    await self.store.undo(current)
+                except Exception as exc:
+                    self.errors += 1
+                    print(f"Rate limit store unavailable: {exc}")
+                return max(math.ceil(window - offset), 1)
+
+        self.allowed += 1
+        return None
+
+    def status(self) -> dict:
+        return {
+            "backend": RATE_LIMIT_BACKEND,
+            "limits": {kind: f"{count}/{seconds}" for kind, (count, seconds) in self.limits.items()},
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "store_errors": self.errors,
+            "tracked_windows": self.store.size(),
+            "evicted_windows": getattr(self.store, "evicted", None),
+        }
+
+
+auth_rate_limiter = RateLimiter(
+    MongoRateLimitStore() if RATE_LIMIT_BACKEND == "mongo" else MemoryRateLimitStore(),
+    RATE_LIMITS,
+)
+
+
+async def _identities(request: Request) -> dict[str, str]:
+    identities = {}
+
+    if request.client:
+        identities["ip"] = request.client.host
+
+    try:
+        body = await request.json()
+    except Exception:
+        body = None
+    if isinstance(body, dict) and isinstance(body.get("email"), str) and "@" in body["email"]:
+        identities["email"] = normalize_email(body["email"])
+
+    device_id = request.headers.get("X-DEVICE-ID")
+    if device_id:
+        identities["device"] = device_id
+
+    return identities
+
+
+def rate_limit(scope: str):
+    """
+    Dependency limiting a route per IP, email (from the JSON body) and
+    device:
+
+        @auth_router.post("/login", dependencies=[Depends(rate_limit("login"))])
+
+    AdmissionRoute runs it before taking a slot (`before_admission`);
+    it is then a no-op when FastAPI resolves the dependencies.
+    """
+    async def dependency(request: Request) -> None:
+        if not RATE_LIMIT_ENABLED or getattr(request.state, "rate_limited", False):
+            return
+        request.state.rate_limited = True
+
+        retry_after = await auth_rate_limiter.check(scope, await _identities(request))
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    dependency.before_admission = True
+    return dependency
+
+
+def rate_limit_snapshot() -> dict:
+    return auth_rate_limiter.status()
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import socket
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from pymongo.errors import DuplicateKeyError
+
+from db.collections import deployments_collection
+
+# -------------------------------------------------------------------
+# Bulk user import lease
+#
+# An import keeps the bulk hashing pool (core/auth/passwords.py) busy,
+# and every worker process has its own pool. Imports are therefore run
+# one at a time across the whole deployment: an import holds the
+# `user_import` lease in `deployments` (the same claim the index build
+# uses, db/indexes.py) and renews it while it runs, so at most one
+# worker's pool is hashing at any moment. A worker that dies mid-import
+# gives up the lease after USER_IMPORT_LEASE_SECONDS.
+# -------------------------------------------------------------------
+
+USER_IMPORT_LEASE_SECONDS = int(os.getenv("USER_IMPORT_LEASE_SECONDS", "120"))
+
+_LEASE_ID = "user_import"
+
+
+async def _claim(owner: str) -> bool:
+    now = datetime.now(timezone.utc)
+    try:
+        await deployments_collection().update_one(
+            {
+                "_id": _LEASE_ID,
+                "$or": [
+                    {"lease_until": {"$exists": False}},
+                    {"lease_until": {"$lt": now}},
+                ],
+            },
+            {"$set": {"owner": owner, "lease_until": now + timedelta(seconds=USER_IMPORT_LEASE_SECONDS)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # held by a running import
+        return False
+    return True
+
+
+async def _renew(owner: str) -> None:
+    while True:
+        await asyncio.sleep(USER_IMPORT_LEASE_SECONDS / 3)
+        try:
+            await deployments_collection().update_one(
+                {"_id": _LEASE_ID, "owner": owner},
+                {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=USER_IMPORT_LEASE_SECONDS)}},
+            )
+        except Exception as exc:
+            print(f"User import lease renewal failed: {exc}")
+
+
+async def _release(owner: str) -> None:
+    try:
+        await deployments_collection().update_one(
+            {"_id": _LEASE_ID, "owner": owner},
+            {"$unset": {"lease_until": ""}},
+        )
+    except Exception as exc:
+        # expires on its own
+        print(f"User import lease release failed: {exc}")
+
+
+@asynccontextmanager
+async def import_lease():
+    """
+    Holds the deployment-wide import lease for the duration of the
+    block. Raises 409 if another import holds it.
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex}"
+    if not await _claim(owner):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another user import is running",
+        )
+
+    renewal = asyncio.create_task(_renew(owner))
+    try:
+        yield
+    finally:
+        renewal.cancel()
+        await _release(owner)
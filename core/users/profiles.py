@@ -0,0 +1,72 @@
+import os
+import time
+from collections import OrderedDict
+
+from db.codec import decode_id
+from models.user import UserResponse
+
+# -------------------------------------------------------------------
+# User profiles
+#
+# Reads that build a UserResponse project exactly its fields, so
+# `password_hash` (and anything else internal) never leaves Mongo.
+# `GET /users/me` is served from a per-worker LRU cache with a short
+# TTL. A profile update refreshes the entry on the worker that made it;
+# other workers may serve the old profile for up to
+# USER_CACHE_TTL_SECONDS. The default is kept to a few seconds, so a user
+# who edits their profile and reloads sees the edit even when the
+# reload lands on another worker. A cache that lived longer would need
+# invalidation shared between workers.
+# -------------------------------------------------------------------
+
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "5"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+USER_RESPONSE_PROJECTION = {
+    **{field: 1 for field in UserResponse.model_fields if field not in ("id", "is_verified")},
+    "email_verified": 1,
+}
+
+
+def to_user_response(doc: dict) -> UserResponse:
+    """
+    Builds a UserResponse from a stored user (or a UserDB dump).
+    """
+    doc = dict(doc)
+    if "_id" in doc:
+        doc["id"] = decode_id(doc.pop("_id"))
+    doc["is_verified"] = doc.pop("email_verified", False)
+    return UserResponse(**doc)
+
+
+class ProfileCache:
+
+    def __init__(self, ttl_seconds: int = USER_CACHE_TTL_SECONDS, max_size: int = USER_CACHE_SIZE):
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, UserResponse]] = OrderedDict()
+
+    def get(self, user_id: str) -> UserResponse | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, profile = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return profile
+
+    def put(self, user_id: str, profile: UserResponse) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl, profile)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+
+profile_cache = ProfileCache()
@@ -0,0 +1,183 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+# -------------------------------------------------------------------
+# Batched inserts
+#
+# A BatchWriter queues documents in process and writes whatever piled
+# up during a flush interval with one insert_many(ordered=False), so a
+# burst of N writes costs ~N / max_batch pool checkouts instead of N.
+# Used by write-behind registrations (core/registrations/ingest.py)
+# and quiz answers (core/quiz/answers.py).
+#
+# Each submitter awaits its document's outcome, resolved exactly like
+# insert_one would: None once written, DuplicateKeyError / WriteError /
+# the driver's exception otherwise. Nothing is reported written before
+# it is.
+#
+# A document that fails with anything but a duplicate key (a failover,
+# a timeout, a write concern error) is retried with the rest of its
+# batch's failures, up to BATCH_WRITE_ATTEMPTS times with exponential
+# backoff from BATCH_WRITE_BACKOFF_MS. An attempt that errored may
+# still have landed, so a duplicate key on a retry counts as written.
+# While a batch is retried the next one waits, and a full queue pushes
+# back on submitters (asyncio.QueueFull).
+# -------------------------------------------------------------------
+
+BATCH_WRITE_ATTEMPTS = int(os.getenv("BATCH_WRITE_ATTEMPTS", "6"))
+BATCH_WRITE_BACKOFF_MS = int(os.getenv("BATCH_WRITE_BACKOFF_MS", "250"))
+
+
+def write_errors(exc: Exception, size: int) -> dict[int, Exception]:
+    """
+    Per-document errors of a failed insert_many(ordered=False) of
+    `size` documents, by index.
+    """
+    if not isinstance(exc, BulkWriteError):
+        return {index: exc for index in range(size)}
+
+    errors: dict[int, Exception] = {}
+    for error in exc.details.get("writeErrors", []):
+        error_cls = DuplicateKeyError if error["code"] == 11000 else WriteError
+        errors[error["index"]] = error_cls(error.get("errmsg"), error["code"], error)
+
+    if exc.details.get("writeConcernErrors"):
+        # applied on the primary but not acknowledged: may be rolled back
+        for index in range(size):
+            errors.setdefault(index, exc)
+    return errors
+
+
+class BatchWriter(ABC):
+
+    name = "Batch writer"
+
+    def __init__(
+        self,
+        max_queue: int,
+        flush_interval_ms: int,
+        max_batch: int,
+        attempts: int = BATCH_WRITE_ATTEMPTS,
+        backoff_ms: int = BATCH_WRITE_BACKOFF_MS,
+    ):
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Writes everything queued so far, then stops the writer.
+        """
+        if not self.running:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, doc: dict) -> None:
+        """
+        Queues a document and waits for its batch to be written.
+        Raises asyncio.QueueFull when the queue is saturated.
+        """
+        if not self.running:
+            raise RuntimeError(f"{self.name} is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((doc, future))
+        await future
+
+    @abstractmethod
+    async def _insert(self, docs: list[dict]) -> None:
+        """
+        insert_many(docs, ordered=False) into the writer's collection.
+        """
+
+    async def _run(self) -> None:
+        closing = False
+
+        while not closing:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            # coalescing window: let concurrent writes pile up
+            await asyncio.sleep(self.flush_interval)
+
+            batch = [item]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        pending = batch
+        failed = 0
+
+        for attempt in range(self.attempts):
+            if attempt:
+                self.retried += len(pending)
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+
+            try:
+                await self._insert([doc for doc, _ in pending])
+                errors = {}
+            except Exception as exc:
+                errors = write_errors(exc, len(pending))
+
+            last = attempt == self.attempts - 1
+            retry = []
+            for index, (doc, future) in enumerate(pending):
+                error = errors.get(index)
+                if error is None or (attempt and isinstance(error, DuplicateKeyError)):
+                    error = None
+                elif not isinstance(error, DuplicateKeyError):
+                    if not last:
+                        retry.append((doc, future))
+                        continue
+                    self.failed += 1
+                    failed += 1
+
+                if future.done():
+                    # the submitter went away
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+            if not retry:
+                break
+            pending = retry
+
+        if failed:
+            print(f"{self.name}: {failed} of {len(batch)} documents failed after {self.attempts} attempts")
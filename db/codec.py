@@ -0,0 +1,69 @@
+from typing import Any
+from uuid import UUID
+
+from bson.binary import Binary, UuidRepresentation, UUID_SUBTYPE
+
+# -------------------------------------------------------------------
+# Identifier codec
+#
+# User and event ids, and every reference to them (registrations,
+# refresh tokens, created_by), are stored as 16 byte BSON Binary UUIDs
+# (subtype 4) and exposed to the API as canonical 36 character strings.
+# -------------------------------------------------------------------
+
+UUID_REPRESENTATION = UuidRepresentation.STANDARD
+
+
+def encode_id(value: str | UUID | Binary) -> Binary:
+    """
+    Converts an API id into its stored form.
+    Raises ValueError for malformed ids.
+    """
+    if isinstance(value, Binary):
+        if value.subtype != UUID_SUBTYPE:
+            raise ValueError("Binary id is not a UUID")
+        return value
+
+    if not isinstance(value, UUID):
+        value = UUID(str(value))
+
+    return Binary.from_uuid(value, UUID_REPRESENTATION)
+
+
+def try_encode_id(value: str | UUID | Binary | None) -> Binary | None:
+    """
+    Like encode_id, but returns None for missing or malformed ids so
+    lookups can fall through to their usual not-found handling.
+    """
+    if value is None:
+        return None
+
+    try:
+        return encode_id(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def decode_id(value: Any) -> str:
+    """
+    Converts a stored id back into its API string form
+    """
+    if isinstance(value, Binary):
+        value = value.as_uuid(UUID_REPRESENTATION)
+
+    return str(value)
+
+
+def decode_ids(doc: dict, *fields: str) -> dict:
+    """
+    Decodes the given id fields of a document in place.
+    `_id` is renamed to `id` on the way out.
+    """
+    if "_id" in doc:
+        doc["id"] = decode_id(doc.pop("_id"))
+
+    for field in fields:
+        if doc.get(field) is not None:
+            doc[field] = decode_id(doc[field])
+
+    return doc
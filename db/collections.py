@@ -1,15 +1,48 @@
 from pymongo.asynchronous.collection import AsyncCollection
-from .mongo import get_database
+from .mongo import get_collection
 
 
 def users_collection() -> AsyncCollection:
-    return get_database()["users"]
+    return get_collection("users")
 
 def refresh_tokens_collection() -> AsyncCollection:
-    return get_database()["refresh_tokens"]
+    return get_collection("refresh_tokens")
 
-def event_collection() -> AsyncCollection:
-    return get_database()["events"]
+def event_collection(public_read: bool = False) -> AsyncCollection:
+    return get_collection("events", public_read)
 
 def registration_collection() -> AsyncCollection:
-    return get_database()["registrations"]
+    return get_collection("registrations")
+
+def event_stats_collection() -> AsyncCollection:
+    return get_collection("event_stats")
+
+def attendance_collection() -> AsyncCollection:
+    return get_collection("attendance")
+
+def attendance_analytics_collection() -> AsyncCollection:
+    return get_collection("attendance_analytics")
+
+def quiz_collection() -> AsyncCollection:
+    return get_collection("quizzes")
+
+def quiz_answers_collection() -> AsyncCollection:
+    return get_collection("quiz_answers")
+
+def quiz_leaderboard_collection() -> AsyncCollection:
+    return get_collection("quiz_leaderboards")
+
+def quiz_results_collection() -> AsyncCollection:
+    return get_collection("quiz_results")
+
+def schema_migrations_collection() -> AsyncCollection:
+    return get_collection("schema_migrations")
+
+def binary_id_map_collection() -> AsyncCollection:
+    return get_collection("binary_id_map")
+
+def deployments_collection() -> AsyncCollection:
+    return get_collection("deployments")
+
+def rate_limits_collection() -> AsyncCollection:
+    return get_collection("rate_limits")
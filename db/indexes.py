@@ -1,22 +1,189 @@
-from pymongo import ASCENDING
-from .collections import users_collection, refresh_tokens_collection
+import asyncio
+import hashlib
+import json
+import os
+import socket
+from datetime import datetime, timedelta, timezone
 
+from pymongo import ASCENDING, IndexModel
+from pymongo.collation import Collation, CollationStrength
+from pymongo.errors import DuplicateKeyError
 
-async def create_indexes() -> None:
-    await users_collection().create_index(
-        [("email", ASCENDING)], unique=True
-    )
+from .collections import (
+    users_collection,
+    refresh_tokens_collection,
+    registration_collection,
+    attendance_collection,
+    quiz_answers_collection,
+    quiz_results_collection,
+    deployments_collection,
+    rate_limits_collection,
+)
 
-    await users_collection().create_index(
-        [("university_uid", ASCENDING)], unique=True
-    )
+# (collection accessor, keys, options)
+INDEXES = [
+    (users_collection, [("email", ASCENDING)], {"unique": True}),
+    (users_collection, [("university_uid", ASCENDING)], {"unique": True}),
 
-    await refresh_tokens_collection().create_index(
-        [("token_hash", ASCENDING)], unique=True
-    )
+    # Directory: case-insensitive name prefix search and keyset pages
+    *(
+        (
+            users_collection,
+            [(name, ASCENDING), ("_id", ASCENDING)],
+            {"collation": Collation(locale="en", strength=CollationStrength.SECONDARY)},
+        )
+        for name in ("first_name", "last_name")
+    ),
+
+    (refresh_tokens_collection, [("token_hash", ASCENDING)], {"unique": True}),
 
     # TTL index → auto-delete expired refresh tokens
-    await refresh_tokens_collection().create_index(
-        [("expires_at", ASCENDING)],
-        expireAfterSeconds=0
+    (refresh_tokens_collection, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+
+    # One registration per attendee per event (event_id is a 16 byte binary UUID)
+    (registration_collection, [("event_id", ASCENDING), ("university_uid", ASCENDING)], {"unique": True}),
+
+    # Scans are idempotent per (event, attendee, action)
+    (
+        attendance_collection,
+        [("event_id", ASCENDING), ("university_uid", ASCENDING), ("action", ASCENDING)],
+        {"unique": True},
+    ),
+
+    # One answer per participant per question
+    (
+        quiz_answers_collection,
+        [("quiz_id", ASCENDING), ("user_id", ASCENDING), ("question_index", ASCENDING)],
+        {"unique": True},
+    ),
+
+    # Per-slot answer reads (leaderboard updates)
+    (quiz_answers_collection, [("quiz_id", ASCENDING), ("position", ASCENDING)], {}),
+
+    # One scored result per participant per quiz
+    (quiz_results_collection, [("quiz_id", ASCENDING), ("user_id", ASCENDING)], {"unique": True}),
+
+    # TTL index → shared rate limit windows expire on their own
+    (rate_limits_collection, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+]
+
+# a worker that dies mid-build gives up its claim after this long
+INDEX_BUILD_LEASE_SECONDS = int(os.getenv("INDEX_BUILD_LEASE_SECONDS", "300"))
+# how often a worker re-checks while another builds, or retries a failed build
+INDEX_BUILD_RETRY_SECONDS = int(os.getenv("INDEX_BUILD_RETRY_SECONDS", "10"))
+
+
+class IndexBuildState:
+    """
+    This worker's view of the deployment's indexes:
+        pending    not checked yet
+        building   this worker is building them
+        waiting    another worker holds the build
+        built      the current definitions exist
+        failed     the last attempt failed (it is retried)
+    The worker is not ready (/readyz) until they are built: before
+    that, the unique indexes that keep out duplicate users and
+    registrations may be missing.
+    """
+
+    def __init__(self):
+        self.status = "pending"
+        self.error: str | None = None
+        self.changed_at = datetime.now(timezone.utc)
+
+    @property
+    def built(self) -> bool:
+        return self.status == "built"
+
+    def set(self, status: str, error: str | None = None) -> None:
+        self.status = status
+        self.error = error
+        self.changed_at = datetime.now(timezone.utc)
+
+    def snapshot(self) -> dict:
+        return {"status": self.status, "error": self.error, "since": self.changed_at.isoformat()}
+
+
+index_build = IndexBuildState()
+
+
+async def create_indexes() -> None:
+    """
+    One createIndexes command per collection, all collections at once:
+    the server builds a collection's indexes in a single scan.
+    """
+    models: dict = {}
+    for collection, keys, options in INDEXES:
+        models.setdefault(collection, []).append(IndexModel(keys, **options))
+
+    await asyncio.gather(*(
+        collection().create_indexes(indexes) for collection, indexes in models.items()
+    ))
+
+
+def index_fingerprint() -> str:
+    """
+    Hash of the index definitions: changes whenever INDEXES does.
+    """
+    spec = [
+        [
+            collection().name,
+            keys,
+            {
+                name: value.document if isinstance(value, Collation) else value
+                for name, value in sorted(options.items())
+            },
+        ]
+        for collection, keys, options in INDEXES
+    ]
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+async def ensure_indexes() -> bool:
+    """
+    Creates the indexes once per deployment: the first worker to start
+    with a new index definition claims the build, every other worker
+    (in this process group or another instance) skips it. Returns True
+    if this worker built them.
+    """
+    deployments = deployments_collection()
+    fingerprint = index_fingerprint()
+
+    state = await deployments.find_one({"_id": "indexes"}, {"fingerprint": 1})
+    if state and state.get("fingerprint") == fingerprint:
+        index_build.set("built")
+        return False
+
+    now = datetime.now(timezone.utc)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    try:
+        await deployments.update_one(
+            {
+                "_id": "indexes",
+                "fingerprint": {"$ne": fingerprint},
+                "$or": [
+                    {"lease_until": {"$exists": False}},
+                    {"lease_until": {"$lt": now}},
+                ],
+            },
+            {"$set": {"owner": owner, "lease_until": now + timedelta(seconds=INDEX_BUILD_LEASE_SECONDS)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # another worker is building (or just finished: the next check sees it)
+        index_build.set("waiting")
+        return False
+
+    index_build.set("building")
+    await create_indexes()
+
+    await deployments.update_one(
+        {"_id": "indexes", "owner": owner},
+        {
+            "$set": {"fingerprint": fingerprint, "built_at": datetime.now(timezone.utc)},
+            "$unset": {"lease_until": ""},
+        },
     )
+    index_build.set("built")
+    return True
@@ -0,0 +1,259 @@
+"""
+One-off migration: string / ObjectId identifiers → 16 byte Binary UUIDs.
+
+    python -m db.migrations.binary_ids
+
+Rewrites, in batches:
+    users._id                    "3f2c…" (str)        → Binary UUID
+    events.id + events._id       "3f2c…" + ObjectId   → _id Binary UUID
+    events.created_by            str                  → Binary UUID
+    refresh_tokens.user_id       str                  → Binary UUID
+    registrations.event_id       ObjectId / str       → Binary UUID
+
+Only documents still in the old shape are selected, so the script can be
+re-run safely after an interruption. `_id` cannot be updated in place,
+so users and events are re-inserted: each batch is inserted under its
+new ids first, and the old documents are deleted only once the insert
+has succeeded. A crash in between leaves both copies, and the re-run
+skips the copies already made. The unique indexes on users are dropped
+while both copies exist and rebuilt at the end.
+
+The old event ObjectId → new id map, which registrations are repointed
+with, is stored in `binary_id_map` before the events are copied, so a
+resumed run still has it. Drop that collection once the migration has
+finished.
+
+Take a backup and stop the API before running it.
+
+Index sizes are printed before and after so the saving can be recorded.
+"""
+
+import asyncio
+
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from db.codec import encode_id, try_encode_id
+from db.collections import (
+    binary_id_map_collection,
+    users_collection,
+    refresh_tokens_collection,
+    event_collection,
+    registration_collection,
+)
+from db.indexes import create_indexes
+
+BATCH_SIZE = 500
+
+COLLECTIONS = {
+    "users": users_collection,
+    "refresh_tokens": refresh_tokens_collection,
+    "events": event_collection,
+    "registrations": registration_collection,
+}
+
+
+async def index_sizes() -> dict[str, dict]:
+    sizes = {}
+
+    for name, collection in COLLECTIONS.items():
+        try:
+            cursor = await collection().aggregate(
+                [{"$collStats": {"storageStats": {}}}]
+            )
+            stats = await cursor.to_list(length=1)
+        except OperationFailure:
+            # collection does not exist yet
+            stats = []
+        storage = stats[0]["storageStats"] if stats else {}
+        sizes[name] = {
+            "count": storage.get("count", 0),
+            "totalIndexSize": storage.get("totalIndexSize", 0),
+            "indexSizes": storage.get("indexSizes", {}),
+        }
+
+    return sizes
+
+
+def print_sizes(label: str, sizes: dict[str, dict]) -> None:
+    print(f"\n{label}")
+    for name, stats in sizes.items():
+        print(f"  {name:<16} docs={stats['count']:<8} total_index_bytes={stats['totalIndexSize']}")
+        for index, size in stats["indexSizes"].items():
+            print(f"    {index:<40} {size}")
+
+
+async def drop_unique_indexes(collection) -> list[str]:
+    """
+    Drops a collection's unique indexes other than _id, so old and new
+    copies of a document can exist side by side. create_indexes()
+    rebuilds them.
+    """
+    dropped = []
+    for name, info in (await collection.index_information()).items():
+        if name != "_id_" and info.get("unique"):
+            await collection.drop_index(name)
+            dropped.append(name)
+    return dropped
+
+
+async def copy_then_delete(collection, old_ids: list, new_docs: list[dict]) -> None:
+    """
+    Inserts the new documents, then deletes the old ones. Copies made
+    before an interruption are duplicates of themselves and skipped.
+    """
+    try:
+        await collection.insert_many(new_docs, ordered=False)
+    except BulkWriteError as exc:
+        if any(error["code"] != 11000 for error in exc.details.get("writeErrors", [])):
+            raise
+
+    await collection.delete_many({"_id": {"$in": old_ids}})
+
+
+async def migrate_users() -> int:
+    users = users_collection()
+    migrated = 0
+
+    # email / university_uid are unique and both copies exist for a moment
+    if await users.find_one({"_id": {"$type": "string"}}, {"_id": 1}):
+        await drop_unique_indexes(users)
+
+    while True:
+        batch = await users.find({"_id": {"$type": "string"}}).to_list(length=BATCH_SIZE)
+        if not batch:
+            return migrated
+
+        old_ids = [doc["_id"] for doc in batch]
+        for doc in batch:
+            doc["_id"] = encode_id(doc["_id"])
+
+        await copy_then_delete(users, old_ids, batch)
+        migrated += len(batch)
+
+
+async def migrate_events() -> int:
+    """
+    Records every old ObjectId → new id in `binary_id_map` (needed to
+    repoint registrations created with ObjectId event ids) before the
+    event is copied. Returns the number of events migrated.
+    """
+    events = event_collection()
+    id_map = binary_id_map_collection()
+    migrated = 0
+
+    while True:
+        batch = await events.find({"id": {"$exists": True}}).to_list(length=BATCH_SIZE)
+        if not batch:
+            return migrated
+
+        old_ids = [doc["_id"] for doc in batch]
+        new_docs = []
+        for doc in batch:
+            doc["_id"] = encode_id(doc.pop("id"))
+
+            created_by = try_encode_id(doc.get("created_by"))
+            if created_by is not None:
+                doc["created_by"] = created_by
+
+            new_docs.append(doc)
+
+        await id_map.bulk_write(
+            [
+                UpdateOne({"_id": old_id}, {"$set": {"new_id": doc["_id"]}}, upsert=True)
+                for old_id, doc in zip(old_ids, new_docs)
+            ],
+            ordered=False,
+        )
+        await copy_then_delete(events, old_ids, new_docs)
+        migrated += len(new_docs)
+
+
+async def load_object_id_map() -> dict:
+    cursor = binary_id_map_collection().find({}, {"new_id": 1})
+    return {doc["_id"]: doc["new_id"] async for doc in cursor}
+
+
+async def migrate_refresh_tokens() -> int:
+    refresh_tokens = refresh_tokens_collection()
+    migrated = 0
+
+    while True:
+        batch = await refresh_tokens.find(
+            {"user_id": {"$type": "string"}},
+            {"user_id": 1},
+        ).to_list(length=BATCH_SIZE)
+        if not batch:
+            return migrated
+
+        await refresh_tokens.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"user_id": encode_id(doc["user_id"])}},
+                )
+                for doc in batch
+            ],
+            ordered=False,
+        )
+        migrated += len(batch)
+
+
+async def migrate_registrations(object_id_map: dict) -> tuple[int, int]:
+    """
+    Returns (migrated, unresolved). ObjectId event ids that no longer map
+    to an event are left untouched and reported.
+    """
+    registrations = registration_collection()
+    migrated = unresolved = 0
+    ops = []
+
+    cursor = registrations.find(
+        {"event_id": {"$type": ["objectId", "string"]}},
+        {"event_id": 1},
+    )
+
+    async for doc in cursor:
+        old = doc["event_id"]
+        new = object_id_map.get(old) if not isinstance(old, str) else try_encode_id(old)
+
+        if new is None:
+            unresolved += 1
+            continue
+
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"event_id": new}}))
+        migrated += 1
+
+        if len(ops) >= BATCH_SIZE:
+            await registrations.bulk_write(ops, ordered=False)
+            ops = []
+
+    if ops:
+        await registrations.bulk_write(ops, ordered=False)
+
+    return migrated, unresolved
+
+
+async def main() -> None:
+    load_dotenv()
+
+    print_sizes("Index sizes before", await index_sizes())
+
+    users = await migrate_users()
+    events = await migrate_events()
+    tokens = await migrate_refresh_tokens()
+    registrations, unresolved = await migrate_registrations(await load_object_id_map())
+
+    await create_indexes()
+
+    print(
+        f"\nMigrated users={users} events={events} refresh_tokens={tokens} "
+        f"registrations={registrations} (unresolved {unresolved})"
+    )
+
+    print_sizes("Index sizes after", await index_sizes())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,260 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from db.collections import schema_migrations_collection
+from db.mongo import get_collection
+from .schema import (
+    current_version,
+    migrated_collections,
+    outdated_filter,
+    take_dirty,
+    upgrade,
+    upgrade_update,
+    version_filter,
+)
+
+# -------------------------------------------------------------------
+# Background schema migrator
+#
+# One migrator per collection with registered steps. Each round it:
+#   1. writes back documents that were upgraded on read
+#   2. walks the next MIGRATION_BATCH_SIZE outdated documents in `_id`
+#      order and upgrades them with one unordered bulk write
+# Every write is guarded by the version the document was read at, so
+# racing with the read path or another worker only skips a document.
+#
+# The walk position is checkpointed in `schema_migrations` after every
+# batch, so a restart resumes where it stopped. A lease on that document
+# keeps the walk to one worker at a time. Throttling keeps the migrator
+# busy at most MIGRATION_MAX_DUTY of the wall clock, and never less than
+# MIGRATION_PAUSE_MS between batches, so it backs off when the database
+# is slow instead of adding to the load.
+# -------------------------------------------------------------------
+
+SCHEMA_MIGRATIONS_ENABLED = os.getenv("SCHEMA_MIGRATIONS_ENABLED", "true").lower() == "true"
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "500"))
+MIGRATION_PAUSE_MS = int(os.getenv("MIGRATION_PAUSE_MS", "200"))
+MIGRATION_MAX_DUTY = float(os.getenv("MIGRATION_MAX_DUTY", "0.2"))
+MIGRATION_LEASE_SECONDS = int(os.getenv("MIGRATION_LEASE_SECONDS", "60"))
+MIGRATION_IDLE_SECONDS = 5
+
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SchemaMigrator:
+
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.target_version = current_version(collection)
+        self.state = "pending"
+        self.last_id = None
+        self.remaining: int | None = None
+        self.migrated = 0
+        self.written_back = 0
+        self.skipped = 0
+        self.batches = 0
+        self.started_at: datetime | None = None
+        self.completed_at: datetime | None = None
+        self.last_error: str | None = None
+        self._run_started = time.monotonic()
+        self._run_migrated = 0
+
+    # ---------------------------------------------------------------
+    # Checkpoint and lease
+    # ---------------------------------------------------------------
+
+    async def _acquire(self) -> dict | None:
+        """
+        Takes (or renews) the walk lease and returns the checkpoint,
+        or None while another worker holds it.
+        """
+        now = datetime.now(timezone.utc)
+        checkpoints = schema_migrations_collection()
+
+        try:
+            return await checkpoints.find_one_and_update(
+                {
+                    "_id": self.collection,
+                    "$or": [
+                        {"owner": _WORKER_ID},
+                        {"lease_until": {"$lt": now}},
+                        {"lease_until": {"$exists": False}},
+                    ],
+                },
+                {
+                    "$set": {"owner": _WORKER_ID, "lease_until": now + timedelta(seconds=MIGRATION_LEASE_SECONDS)},
+                    "$setOnInsert": {"started_at": now},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # the document exists and someone else holds the lease
+            return None
+
+    async def _save(self, **fields) -> None:
+        await schema_migrations_collection().update_one(
+            {"_id": self.collection, "owner": _WORKER_ID},
+            {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}},
+        )
+
+    def _resume(self, checkpoint: dict) -> None:
+        self.started_at = checkpoint.get("started_at")
+
+        if checkpoint.get("target_version") != self.target_version:
+            # new steps since the last walk: start over from the beginning
+            self.last_id = None
+            self.completed_at = None
+            return
+
+        self.last_id = checkpoint.get("last_id")
+        self.migrated = max(self.migrated, checkpoint.get("migrated", 0))
+        self.completed_at = checkpoint.get("completed_at")
+
+    # ---------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------
+
+    async def _apply(self, docs: list[dict]) -> int:
+        ops = []
+        for doc in docs:
+            update = upgrade_update(doc, upgrade(self.collection, doc))
+            if update:
+                ops.append(UpdateOne(version_filter(doc), update))
+
+        if not ops:
+            return 0
+
+        result = await get_collection(self.collection).bulk_write(ops, ordered=False)
+        self.skipped += len(ops) - result.modified_count
+        return result.modified_count
+
+    async def _write_back(self) -> bool:
+        ids = take_dirty(self.collection, MIGRATION_BATCH_SIZE)
+        if not ids:
+            return False
+
+        docs = await get_collection(self.collection).find(
+            {"_id": {"$in": ids}, **outdated_filter(self.collection)}
+        ).to_list()
+        self.written_back += await self._apply(docs)
+        return True
+
+    async def _walk(self) -> bool:
+        checkpoint = await self._acquire()
+        if checkpoint is None:
+            self.state = "waiting"
+            return False
+
+        if self.state in ("pending", "waiting"):
+            self._resume(checkpoint)
+            if self.completed_at is None:
+                self.remaining = await get_collection(self.collection).count_documents(
+                    outdated_filter(self.collection)
+                )
+
+        if self.completed_at is not None:
+            self.state = "completed"
+            return False
+
+        self.state = "running"
+        query = outdated_filter(self.collection)
+        if self.last_id is not None:
+            query["_id"] = {"$gt": self.last_id}
+
+        docs = await get_collection(self.collection).find(
+            query,
+            sort=[("_id", ASCENDING)],
+            limit=MIGRATION_BATCH_SIZE,
+        ).to_list()
+
+        migrated = await self._apply(docs)
+        self.migrated += migrated
+        self._run_migrated += migrated
+        self.batches += 1
+        if self.remaining is not None:
+            self.remaining = max(self.remaining - len(docs), 0)
+
+        if docs:
+            self.last_id = docs[-1]["_id"]
+
+        if len(docs) < MIGRATION_BATCH_SIZE:
+            self.completed_at = datetime.now(timezone.utc)
+            self.state = "completed"
+            self.remaining = 0
+
+        await self._save(
+            target_version=self.target_version,
+            last_id=self.last_id,
+            migrated=self.migrated,
+            completed_at=self.completed_at,
+        )
+        return bool(docs)
+
+    # ---------------------------------------------------------------
+    # Loop
+    # ---------------------------------------------------------------
+
+    async def run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                worked = await self._write_back()
+                if self.state != "completed":
+                    worked = await self._walk() or worked
+                self.last_error = None
+            except Exception as exc:
+                worked = False
+                self.last_error = str(exc)
+                print(f"Schema migration of {self.collection} failed: {exc}")
+
+            if not worked:
+                await asyncio.sleep(MIGRATION_IDLE_SECONDS)
+                continue
+
+            busy = time.monotonic() - started
+            await asyncio.sleep(max(MIGRATION_PAUSE_MS / 1000, busy * (1 / MIGRATION_MAX_DUTY - 1)))
+
+    def status(self) -> dict:
+        elapsed = time.monotonic() - self._run_started
+        rate = self._run_migrated / elapsed if elapsed > 0 else 0.0
+
+        return {
+            "collection": self.collection,
+            "target_version": self.target_version,
+            "state": self.state,
+            "migrated": self.migrated,
+            "written_back": self.written_back,
+            "skipped": self.skipped,
+            "remaining": self.remaining,
+            "batches": self.batches,
+            "docs_per_second": round(rate, 1),
+            "eta_seconds": round(self.remaining / rate) if rate and self.remaining else None,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "last_error": self.last_error,
+        }
+
+
+_migrators: dict[str, SchemaMigrator] = {}
+
+
+async def schema_migration_worker() -> None:
+    if not SCHEMA_MIGRATIONS_ENABLED:
+        return
+
+    for collection in migrated_collections():
+        _migrators[collection] = SchemaMigrator(collection)
+
+    await asyncio.gather(*(migrator.run() for migrator in _migrators.values()))
+
+
+def migration_status() -> list[dict]:
+    return [migrator.status() for migrator in _migrators.values()]
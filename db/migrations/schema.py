@@ -0,0 +1,168 @@
+from collections.abc import Callable
+
+# -------------------------------------------------------------------
+# Online schema migrations
+#
+# Documents carry a `schema_version`. Each collection is declared with
+# the version its documents had before any step was registered (and
+# which documents without the field are assumed to be at). Each step
+# upgrades a document by one version:
+#
+#     @migration("users", 3)
+#     def split_display_name(doc: dict) -> dict:
+#         if "display_name" in doc:
+#             first, _, last = doc.pop("display_name").partition(" ")
+#             doc.setdefault("first_name", first)
+#             doc.setdefault("last_name", last)
+#         return doc
+#
+# (then bump the model's schema_version default).
+#
+# Steps are pure functions of the document. Reads may be projected, so a
+# step must only touch fields that are present, and running it twice
+# must be harmless.
+#
+# Old documents are upgraded in memory as they are read. Unprojected
+# reads also queue the `_id` for write-back. The background migrator
+# (db/migrations/migrator.py) flushes that queue and walks the rest of
+# the collection in throttled bulk writes.
+# -------------------------------------------------------------------
+
+_BASE_VERSIONS: dict[str, int] = {}
+_STEPS: dict[str, dict[int, Callable[[dict], dict]]] = {}
+
+# collection -> _ids read in an old shape, awaiting write-back
+_dirty: dict[str, set] = {}
+DIRTY_LIMIT = 10000
+
+
+def declare(collection: str, base_version: int) -> None:
+    _BASE_VERSIONS[collection] = base_version
+    _STEPS.setdefault(collection, {})
+
+
+def migration(collection: str, to_version: int):
+    """
+    Registers a step that upgrades `collection` documents from
+    `to_version - 1` to `to_version`.
+    """
+    def decorator(step: Callable[[dict], dict]) -> Callable[[dict], dict]:
+        steps = _STEPS[collection]
+        if to_version in steps or to_version <= _BASE_VERSIONS[collection]:
+            raise ValueError(f"{collection}: duplicate migration to version {to_version}")
+        steps[to_version] = step
+        return step
+
+    return decorator
+
+
+def migrated_collections() -> list[str]:
+    """
+    Collections with at least one registered step.
+    """
+    return [collection for collection, steps in _STEPS.items() if steps]
+
+
+def current_version(collection: str) -> int:
+    return max(_STEPS.get(collection) or {}, default=_BASE_VERSIONS.get(collection, 1))
+
+
+def document_version(collection: str, doc: dict) -> int:
+    return doc.get("schema_version") or _BASE_VERSIONS.get(collection, 1)
+
+
+def upgrade(collection: str, doc: dict) -> dict:
+    """
+    Applies every pending step in order; returns the document at the
+    current version (the same dict if it was already current).
+    """
+    version = document_version(collection, doc)
+    target = current_version(collection)
+    if version >= target:
+        return doc
+
+    steps = _STEPS[collection]
+    doc = dict(doc)
+    for next_version in range(version + 1, target + 1):
+        step = steps.get(next_version)
+        if step is None:
+            raise RuntimeError(f"{collection}: no migration to version {next_version}")
+        doc = step(doc)
+
+    doc["schema_version"] = target
+    return doc
+
+
+def versioned_projection(collection: str, projection: dict | None) -> dict | None:
+    """
+    Makes sure an inclusion projection returns `schema_version`, so
+    projected reads can be upgraded too.
+    """
+    if not _STEPS.get(collection):
+        return projection
+    if projection and any(value for key, value in projection.items() if key != "_id"):
+        return {**projection, "schema_version": 1}
+    return projection
+
+
+def on_read(collection: str, doc: dict | None, projection: dict | None = None) -> dict | None:
+    """
+    Read hook: upgrades old documents in memory and queues fully read
+    ones for write-back.
+    """
+    if doc is None or not _STEPS.get(collection):
+        return doc
+
+    upgraded = upgrade(collection, doc)
+    if upgraded is not doc and not projection and "_id" in doc:
+        dirty = _dirty.setdefault(collection, set())
+        # the walk picks up whatever does not fit
+        if len(dirty) < DIRTY_LIMIT:
+            dirty.add(doc["_id"])
+    return upgraded
+
+
+def take_dirty(collection: str, limit: int) -> list:
+    dirty = _dirty.get(collection)
+    if not dirty:
+        return []
+    return [dirty.pop() for _ in range(min(limit, len(dirty)))]
+
+
+def upgrade_update(before: dict, after: dict) -> dict:
+    """
+    The $set / $unset that turns `before` into `after`.
+    """
+    update = {}
+    changed = {
+        key: value for key, value in after.items()
+        if key != "_id" and (key not in before or before[key] != value)
+    }
+    removed = {key: "" for key in before if key not in after}
+
+    if changed:
+        update["$set"] = changed
+    if removed:
+        update["$unset"] = removed
+    return update
+
+
+def version_filter(doc: dict) -> dict:
+    """
+    Matches the document only while it is still at the version it was
+    read at, so a write-back never overwrites a newer upgrade.
+    """
+    if "schema_version" in doc:
+        return {"_id": doc["_id"], "schema_version": doc["schema_version"]}
+    return {"_id": doc["_id"], "schema_version": {"$exists": False}}
+
+
+def outdated_filter(collection: str) -> dict:
+    return {"schema_version": {"$not": {"$gte": current_version(collection)}}}
+
+
+# -------------------------------------------------------------------
+# Collections and steps
+# -------------------------------------------------------------------
+
+declare("users", 2)
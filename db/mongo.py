@@ -1,8 +1,64 @@
 from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
+from bson.codec_options import CodecOptions
+from datetime import timezone
+import importlib.util
 import os
 
+from .codec import UUID_REPRESENTATION
+from .monitoring import command_listener, pool_listener
+
+# -------------------------------------------------------------------
+# Connection profile
+#
+# Everything is read from the environment once, when the client is
+# first created:
+#   MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE / MONGO_MAX_IDLE_TIME_MS
+#   MONGO_COMPRESSORS            preference order, default "zstd,zlib"
+#                                (zstandard is in requirements.txt);
+#                                codecs whose Python package is
+#                                missing are skipped, "" disables
+#   MONGO_PUBLIC_READ_PREFERENCE read preference for public reads
+#                                (primary, secondaryPreferred, nearest...)
+#   MONGO_MONITORING             pool / command telemetry listeners
+# Collection handles are created once per (name, read route) and carry
+# the codec options: standard UUIDs and timezone-aware UTC datetimes.
+# -------------------------------------------------------------------
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,zlib")
+MONGO_ZLIB_LEVEL = int(os.getenv("MONGO_ZLIB_LEVEL", "1"))
+MONGO_PUBLIC_READ_PREFERENCE = os.getenv("MONGO_PUBLIC_READ_PREFERENCE", "primary")
+MONGO_PUBLIC_MAX_STALENESS_SECONDS = int(os.getenv("MONGO_PUBLIC_MAX_STALENESS_SECONDS", "-1"))
+MONGO_MONITORING = os.getenv("MONGO_MONITORING", "true").lower() == "true"
+
+CODEC_OPTIONS = CodecOptions(
+    tz_aware=True,
+    tzinfo=timezone.utc,
+    uuid_representation=UUID_REPRESENTATION,
+)
+
+# compressor -> Python package it needs (zlib is built in)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": None}
+
 _MONGO_CLIENT: AsyncMongoClient | None = None
+_DATABASE: AsyncDatabase | None = None
+_COLLECTIONS: dict[tuple[str, bool], AsyncCollection] = {}
+
+
+def available_compressors(names: str) -> list[str]:
+    compressors = []
+    for name in (n.strip().lower() for n in names.split(",")):
+        if name not in _COMPRESSOR_MODULES:
+            continue
+        module = _COMPRESSOR_MODULES[name]
+        if module is None or importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+    return compressors
 
 
 def get_mongo_client() -> AsyncMongoClient:
@@ -16,11 +72,21 @@ def get_mongo_client() -> AsyncMongoClient:
         if not mongo_uri:
             raise RuntimeError("MONGO_URI not set")
 
+        options = {}
+        compressors = available_compressors(MONGO_COMPRESSORS)
+        if compressors:
+            options["compressors"] = compressors
+            options["zlibCompressionLevel"] = MONGO_ZLIB_LEVEL
+
         _MONGO_CLIENT = AsyncMongoClient(
             mongo_uri,
-            maxPoolSize=20,
-            minPoolSize=5,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
             serverSelectionTimeoutMS=5000,
+            uuidRepresentation="standard",
+            event_listeners=[command_listener, pool_listener] if MONGO_MONITORING else [],
+            **options,
         )
 
     return _MONGO_CLIENT
@@ -30,9 +96,51 @@ def get_database() -> AsyncDatabase:
     """
     Returns the async database instance
     """
-    db_name = os.getenv("MONGO_DB_NAME")
-    if not db_name:
-        raise RuntimeError("MONGO_DB_NAME not set")
+    global _DATABASE
+
+    if _DATABASE is None:
+        db_name = os.getenv("MONGO_DB_NAME")
+        if not db_name:
+            raise RuntimeError("MONGO_DB_NAME not set")
+
+        _DATABASE = get_mongo_client().get_database(db_name, codec_options=CODEC_OPTIONS)
+
+    return _DATABASE
+
+
+def public_read_preference():
+    mode = read_pref_mode_from_name(MONGO_PUBLIC_READ_PREFERENCE)
+    if MONGO_PUBLIC_MAX_STALENESS_SECONDS > 0 and mode != 0:
+        return make_read_preference(mode, None, max_staleness=MONGO_PUBLIC_MAX_STALENESS_SECONDS)
+    return make_read_preference(mode, None)
+
+
+def get_collection(name: str, public_read: bool = False) -> AsyncCollection:
+    """
+    Cached collection handle. `public_read` routes reads with the public
+    read preference (possibly a secondary); use it only where slightly
+    stale data is acceptable.
+    """
+    key = (name, public_read)
+    collection = _COLLECTIONS.get(key)
+
+    if collection is None:
+        collection = get_database().get_collection(
+            name,
+            read_preference=public_read_preference() if public_read else None,
+        )
+        _COLLECTIONS[key] = collection
+
+    return collection
+
+
+def reset_connection_cache() -> None:
+    """
+    Drops cached handles (after the client is closed, or in scripts that
+    switch databases).
+    """
+    global _MONGO_CLIENT, _DATABASE
 
-    client = get_mongo_client()
-    return client[db_name]
+    _MONGO_CLIENT = None
+    _DATABASE = None
+    _COLLECTIONS.clear()
@@ -0,0 +1,156 @@
+from collections import defaultdict
+
+from pymongo import monitoring
+
+# -------------------------------------------------------------------
+# Pool and command telemetry
+#
+# Driver listeners feed fixed-size latency aggregates:
+#   pool      connection checkout wait (time a request waited for a
+#             pooled connection; the first sign of an undersized pool)
+#   commands  server round trip per (collection, command)
+# Each aggregate is a count, a sum, a max and a log2 histogram, so
+# memory stays constant and recording is O(1) on the driver's hot path.
+# Exported by GET /ops/db-metrics.
+# -------------------------------------------------------------------
+
+# bucket i holds samples below 2**i microseconds (up to ~70 minutes)
+_BUCKETS = 32
+
+
+class LatencyStats:
+
+    __slots__ = ("count", "total_us", "max_us", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.histogram = [0] * _BUCKETS
+
+    def record(self, micros: int) -> None:
+        self.count += 1
+        self.total_us += micros
+        if micros > self.max_us:
+            self.max_us = micros
+        self.histogram[min(max(micros, 1).bit_length(), _BUCKETS - 1)] += 1
+
+    def percentile(self, pct: float) -> float:
+        """
+        Upper bound of the bucket holding the pct-th sample, in ms.
+        """
+        target = self.count * pct / 100
+        seen = 0
+        for bucket, samples in enumerate(self.histogram):
+            seen += samples
+            if samples and seen >= target:
+                return min(2 ** bucket, self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_us / self.count / 1000, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_us / 1000,
+        }
+
+
+class CommandLatencyListener(monitoring.CommandListener):
+
+    def __init__(self):
+        self.stats: dict[tuple[str, str], LatencyStats] = defaultdict(LatencyStats)
+        self.failures: dict[tuple[str, str], int] = defaultdict(int)
+        self._collections: dict[tuple, str] = {}
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return event.connection_id, event.request_id
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        target = event.command.get(event.command_name)
+        if not isinstance(target, str):
+            # getMore names its collection separately
+            target = event.command.get("collection", "-")
+        self._collections[self._key(event)] = target
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._collections.pop(self._key(event), "-")
+        self.stats[(collection, event.command_name)].record(event.duration_micros)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._collections.pop(self._key(event), "-")
+        self.failures[(collection, event.command_name)] += 1
+
+
+class PoolCheckoutListener(monitoring.ConnectionPoolListener):
+
+    def __init__(self):
+        self.checkout = LatencyStats()
+        self.checkout_failures = 0
+        self.checked_out = 0
+        self.created = 0
+
+    def connection_checked_out(self, event) -> None:
+        self.checked_out += 1
+        self.checkout.record(int((event.duration or 0) * 1_000_000))
+
+    def connection_check_out_failed(self, event) -> None:
+        self.checkout_failures += 1
+
+    def connection_checked_in(self, event) -> None:
+        self.checked_out -= 1
+
+    def connection_created(self, event) -> None:
+        self.created += 1
+
+    # remaining pool events are not tracked
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+
+command_listener = CommandLatencyListener()
+pool_listener = PoolCheckoutListener()
+
+
+def metrics_snapshot() -> dict:
+    return {
+        "pool": {
+            "checkout_wait": pool_listener.checkout.summary(),
+            "checkout_failures": pool_listener.checkout_failures,
+            "checked_out": pool_listener.checked_out,
+            "connections_created": pool_listener.created,
+        },
+        "commands": [
+            {
+                "collection": collection,
+                "command": command,
+                **stats.summary(),
+                "failures": command_listener.failures.get((collection, command), 0),
+            }
+            for (collection, command), stats in sorted(
+                (key, command_listener.stats.get(key) or LatencyStats())
+                for key in command_listener.stats.keys() | command_listener.failures.keys()
+            )
+        ],
+    }
@@ -0,0 +1,124 @@
+import os
+
+from .base import (
+    UserRepository,
+    RefreshTokenRepository,
+    EventRepository,
+    RegistrationRepository,
+)
+
+# -------------------------------------------------------------------
+# Backend selection
+#
+#   REPOSITORY_BACKEND=mongo   (default) MongoDB via db/collections.py
+#   REPOSITORY_BACKEND=memory  in-process store for benchmarks and load
+#                              tests; nothing is persisted
+# Routers take repositories from the accessors below, the same way
+# they take collections from db/collections.py.
+# -------------------------------------------------------------------
+
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "mongo").lower()
+
+BACKENDS = ("mongo", "memory")
+
+
+class Repositories:
+
+    def __init__(
+        self,
+        backend: str,
+        users: UserRepository,
+        refresh_tokens: RefreshTokenRepository,
+        events: EventRepository,
+        public_events: EventRepository,
+        registrations: RegistrationRepository,
+    ):
+        self.backend = backend
+        self.users = users
+        self.refresh_tokens = refresh_tokens
+        self.events = events
+        self.public_events = public_events
+        self.registrations = registrations
+
+
+def create_repositories(backend: str) -> Repositories:
+    if backend == "mongo":
+        from .mongo import (
+            MongoUserRepository,
+            MongoRefreshTokenRepository,
+            MongoEventRepository,
+            MongoRegistrationRepository,
+        )
+
+        return Repositories(
+            backend,
+            users=MongoUserRepository(),
+            refresh_tokens=MongoRefreshTokenRepository(),
+            events=MongoEventRepository(),
+            public_events=MongoEventRepository(public_read=True),
+            registrations=MongoRegistrationRepository(),
+        )
+
+    if backend == "memory":
+        from .memory import (
+            MemoryUserRepository,
+            MemoryRefreshTokenRepository,
+            MemoryEventRepository,
+            MemoryRegistrationRepository,
+        )
+
+        events = MemoryEventRepository()
+        return Repositories(
+            backend,
+            users=MemoryUserRepository(),
+            refresh_tokens=MemoryRefreshTokenRepository(),
+            events=events,
+            public_events=events,
+            registrations=MemoryRegistrationRepository(),
+        )
+
+    raise ValueError(f"Unknown repository backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+
+
+_REPOSITORIES: Repositories | None = None
+
+
+def get_repositories() -> Repositories:
+    global _REPOSITORIES
+
+    if _REPOSITORIES is None:
+        _REPOSITORIES = create_repositories(REPOSITORY_BACKEND)
+    return _REPOSITORIES
+
+
+def use_backend(backend: str) -> Repositories:
+    """
+    Switches every accessor to a fresh set of repositories (benchmarks
+    and tests; call before serving requests).
+    """
+    global _REPOSITORIES
+
+    _REPOSITORIES = create_repositories(backend)
+    return _REPOSITORIES
+
+
+def is_persistent() -> bool:
+    """
+    False for the in-memory backend, where Mongo-only materializations
+    (event stats) have nothing to follow and are skipped.
+    """
+    return get_repositories().backend == "mongo"
+
+
+def users_repository() -> UserRepository:
+    return get_repositories().users
+
+def refresh_tokens_repository() -> RefreshTokenRepository:
+    return get_repositories().refresh_tokens
+
+def event_repository(public_read: bool = False) -> EventRepository:
+    repositories = get_repositories()
+    return repositories.public_events if public_read else repositories.events
+
+def registrations_repository() -> RegistrationRepository:
+    return get_repositories().registrations
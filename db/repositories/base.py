@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from bson.binary import Binary
+
+# -------------------------------------------------------------------
+# Repository interfaces
+#
+# The request path talks to users, refresh tokens, events and
+# registrations through these interfaces instead of raw collections.
+# Documents go in and come out in their stored shape (Binary `_id`s and
+# references), and both backends share the collection semantics the
+# routers rely on:
+#   - unique keys raise pymongo's DuplicateKeyError (BulkWriteError for
+#     unordered batches, with the same writeErrors details)
+#   - `projection` is a top-level inclusion map; `_id` is returned
+#     unless excluded
+#   - `update` is a top-level $set that returns the document after it
+#   - refresh tokens past `expires_at` are gone (TTL index)
+# -------------------------------------------------------------------
+
+
+class UserRepository(ABC):
+
+    @abstractmethod
+    async def get(self, user_id: Binary, projection: dict | None = None) -> dict | None: ...
+
+    @abstractmethod
+    async def find_by_email(self, email: str, projection: dict | None = None) -> dict | None: ...
+
+    @abstractmethod
+    async def find_by_university_uid(self, university_uid: str, projection: dict | None = None) -> dict | None: ...
+
+    @abstractmethod
+    async def find_by_university_uids(self, university_uids: list[str], projection: dict | None = None) -> list[dict]: ...
+
+    @abstractmethod
+    async def insert(self, doc: dict) -> None: ...
+
+    @abstractmethod
+    async def update(self, user_id: Binary, fields: dict, projection: dict | None = None) -> dict | None: ...
+
+
+class RefreshTokenRepository(ABC):
+
+    @abstractmethod
+    async def insert(self, doc: dict) -> None: ...
+
+    @abstractmethod
+    async def find_active(self, token_hash: str, now: datetime) -> dict | None:
+        """
+        The unrevoked token with this hash, if it expires after `now`.
+        """
+
+    @abstractmethod
+    async def has_active_device(self, user_id: Binary, device_id: str) -> bool:
+        """
+        Whether the user holds an unrevoked token for this device.
+        """
+
+    @abstractmethod
+    async def update(self, token_hash: str, fields: dict) -> bool: ...
+
+    async def revoke(self, token_hash: str) -> bool:
+        return await self.update(token_hash, {"revoked": True})
+
+
+class EventRepository(ABC):
+
+    @abstractmethod
+    async def get(self, event_id: Binary, projection: dict | None = None, status: str | None = None) -> dict | None:
+        """
+        The event, optionally only if it has the given status.
+        """
+
+    @abstractmethod
+    async def list_by_status(self, status: str) -> list[dict]:
+        """
+        Events with the given status, by start time.
+        """
+
+    @abstractmethod
+    async def list_all(self) -> list[dict]:
+        """
+        Every event, newest first.
+        """
+
+    @abstractmethod
+    async def insert(self, doc: dict) -> None: ...
+
+    @abstractmethod
+    async def update(self, event_id: Binary, fields: dict) -> dict | None: ...
+
+    @abstractmethod
+    async def increment_registered_count(self, event_id: Binary, delta: int, projection: dict | None = None) -> dict | None: ...
+
+
+class RegistrationRepository(ABC):
+
+    @abstractmethod
+    async def insert(self, doc: dict) -> None: ...
+
+    @abstractmethod
+    async def insert_many(self, docs: list[dict]) -> None:
+        """
+        Unordered insert: every document is attempted; failures are
+        reported together in a BulkWriteError.
+        """
+
+    @abstractmethod
+    async def exists(self, event_id: Binary, university_uid: str) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, event_id: Binary, university_uid: str) -> bool: ...
+
+    @abstractmethod
+    def for_event(self, event_id: Binary, projection: dict | None = None, batch_size: int = 500) -> AsyncIterator[dict]:
+        """
+        Streams the event's registrations in insertion order.
+        """
@@ -0,0 +1,315 @@
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+from .base import (
+    UserRepository,
+    RefreshTokenRepository,
+    EventRepository,
+    RegistrationRepository,
+)
+
+# -------------------------------------------------------------------
+# In-memory backend
+#
+# Same semantics as the Mongo backend, without a server, so benchmarks
+# and load tests can measure the framework and serialization cost of
+# the request path on their own. Each collection is a dict keyed by
+# `_id` plus a hash index per unique key; lookups the routers make are
+# O(1) and every method runs without awaiting, so a check-and-insert
+# is atomic on the event loop just like a unique index.
+#
+# Documents are shallow-copied on the way in and out: callers may
+# mutate what they get back (the routers do), but nested values are
+# shared and must be treated as read-only.
+#
+# State is per process; run a single worker against this backend.
+# -------------------------------------------------------------------
+
+
+def project(doc: dict, projection: dict | None) -> dict:
+    """
+    Applies a top-level inclusion (or exclusion) projection.
+    """
+    if not projection:
+        return dict(doc)
+
+    fields = {key: value for key, value in projection.items() if key != "_id"}
+
+    if fields and not any(fields.values()):
+        result = {key: value for key, value in doc.items() if key not in fields}
+    else:
+        result = {key: doc[key] for key, value in fields.items() if value and key in doc}
+        if "_id" in doc:
+            result["_id"] = doc["_id"]
+
+    if not projection.get("_id", 1):
+        result.pop("_id", None)
+    return result
+
+
+def duplicate_key_details(collection: str, fields: tuple[str, ...], values: tuple) -> dict:
+    key_value = dict(zip(fields, values))
+    index_name = "_".join(f"{field}_1" for field in fields)
+    return {
+        "code": 11000,
+        "keyPattern": {field: 1 for field in fields},
+        "keyValue": key_value,
+        "errmsg": f"E11000 duplicate key error collection: {collection} index: {index_name} dup key: {key_value}",
+    }
+
+
+class MemoryCollection:
+    """
+    Documents by `_id` with unique hash indexes. Like a unique index in
+    Mongo, a missing field indexes as None.
+    """
+
+    def __init__(self, name: str, unique: tuple[tuple[str, ...], ...] = ()):
+        self.name = name
+        self.docs: dict = {}
+        self.indexes: dict[tuple[str, ...], dict] = {fields: {} for fields in unique}
+
+    @staticmethod
+    def _key(fields: tuple[str, ...], doc: dict) -> tuple:
+        return tuple(doc.get(field) for field in fields)
+
+    def _conflict(self, doc: dict, ignore=None) -> dict | None:
+        if doc["_id"] in self.docs and doc["_id"] != ignore:
+            return duplicate_key_details(self.name, ("_id",), (doc["_id"],))
+
+        for fields, index in self.indexes.items():
+            key = self._key(fields, doc)
+            holder = index.get(key)
+            if holder is not None and holder["_id"] != ignore:
+                return duplicate_key_details(self.name, fields, key)
+        return None
+
+    def insert(self, doc: dict) -> dict:
+        # the driver assigns missing ids on the caller's document
+        doc.setdefault("_id", ObjectId())
+        stored = dict(doc)
+
+        conflict = self._conflict(stored)
+        if conflict:
+            raise DuplicateKeyError(conflict["errmsg"], 11000, conflict)
+
+        self.docs[stored["_id"]] = stored
+        for fields, index in self.indexes.items():
+            index[self._key(fields, stored)] = stored
+        return stored
+
+    def lookup(self, fields: tuple[str, ...], *values) -> dict | None:
+        if fields == ("_id",):
+            return self.docs.get(values[0])
+        return self.indexes[fields].get(values)
+
+    def update(self, doc: dict, fields: dict) -> dict:
+        updated = {**doc, **fields}
+
+        conflict = self._conflict(updated, ignore=doc["_id"])
+        if conflict:
+            raise DuplicateKeyError(conflict["errmsg"], 11000, conflict)
+
+        self.remove(doc)
+        self.docs[updated["_id"]] = updated
+        for index_fields, index in self.indexes.items():
+            index[self._key(index_fields, updated)] = updated
+        return updated
+
+    def remove(self, doc: dict) -> None:
+        del self.docs[doc["_id"]]
+        for fields, index in self.indexes.items():
+            index.pop(self._key(fields, doc), None)
+
+
+class MemoryUserRepository(UserRepository):
+
+    def __init__(self):
+        self.users = MemoryCollection("users", unique=(("email",), ("university_uid",)))
+
+    async def get(self, user_id, projection=None):
+        doc = self.users.lookup(("_id",), user_id)
+        return project(doc, projection) if doc else None
+
+    async def find_by_email(self, email, projection=None):
+        doc = self.users.lookup(("email",), email)
+        return project(doc, projection) if doc else None
+
+    async def find_by_university_uid(self, university_uid, projection=None):
+        doc = self.users.lookup(("university_uid",), university_uid)
+        return project(doc, projection) if doc else None
+
+    async def find_by_university_uids(self, university_uids, projection=None):
+        docs = (self.users.lookup(("university_uid",), uid) for uid in dict.fromkeys(university_uids))
+        return [project(doc, projection) for doc in docs if doc]
+
+    async def insert(self, doc):
+        self.users.insert(doc)
+
+    async def update(self, user_id, fields, projection=None):
+        doc = self.users.lookup(("_id",), user_id)
+        if doc is None:
+            return None
+        return project(self.users.update(doc, fields), projection)
+
+
+class MemoryRefreshTokenRepository(RefreshTokenRepository):
+    """
+    Expired tokens are deleted on the next access, in expiry order, which
+    mirrors the TTL index on `expires_at` (minus its up-to-a-minute lag).
+    """
+
+    def __init__(self):
+        self.tokens = MemoryCollection("refresh_tokens", unique=(("token_hash",),))
+        # (user_id, device_id) -> _ids of that device's tokens
+        self._devices: dict[tuple, set] = {}
+        self._expiry: list[tuple[datetime, int, object]] = []
+        self._sequence = itertools.count()
+
+    def _expire(self) -> None:
+        now = datetime.now(timezone.utc)
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, _, token_id = heapq.heappop(self._expiry)
+            doc = self.tokens.docs.get(token_id)
+            if doc is not None and doc.get("expires_at") == expires_at:
+                self._forget(doc)
+
+    def _forget(self, doc: dict) -> None:
+        self.tokens.remove(doc)
+        device = self._devices.get((doc.get("user_id"), doc.get("device_id")))
+        if device is not None:
+            device.discard(doc["_id"])
+            if not device:
+                del self._devices[(doc.get("user_id"), doc.get("device_id"))]
+
+    async def insert(self, doc):
+        self._expire()
+        stored = self.tokens.insert(doc)
+        self._devices.setdefault((stored.get("user_id"), stored.get("device_id")), set()).add(stored["_id"])
+        if isinstance(stored.get("expires_at"), datetime):
+            heapq.heappush(self._expiry, (stored["expires_at"], next(self._sequence), stored["_id"]))
+
+    async def find_active(self, token_hash, now):
+        self._expire()
+        doc = self.tokens.lookup(("token_hash",), token_hash)
+        if doc is None or doc.get("revoked") is not False or not doc["expires_at"] > now:
+            return None
+        return dict(doc)
+
+    async def has_active_device(self, user_id, device_id):
+        self._expire()
+        return any(
+            self.tokens.docs[token_id].get("revoked") is False
+            for token_id in self._devices.get((user_id, device_id), ())
+        )
+
+    async def update(self, token_hash, fields):
+        self._expire()
+        doc = self.tokens.lookup(("token_hash",), token_hash)
+        if doc is None:
+            return False
+
+        stored = self.tokens.update(doc, fields)
+        if isinstance(fields.get("expires_at"), datetime):
+            heapq.heappush(self._expiry, (stored["expires_at"], next(self._sequence), stored["_id"]))
+        return True
+
+
+class MemoryEventRepository(EventRepository):
+
+    def __init__(self):
+        self.events = MemoryCollection("events")
+
+    async def get(self, event_id, projection=None, status=None):
+        doc = self.events.lookup(("_id",), event_id)
+        if doc is None or (status is not None and doc.get("status") != status):
+            return None
+        return project(doc, projection)
+
+    async def list_by_status(self, status):
+        docs = [doc for doc in self.events.docs.values() if doc.get("status") == status]
+        docs.sort(key=lambda doc: doc["start_time"])
+        return [dict(doc) for doc in docs]
+
+    async def list_all(self):
+        docs = sorted(self.events.docs.values(), key=lambda doc: doc["created_at"], reverse=True)
+        return [dict(doc) for doc in docs]
+
+    async def insert(self, doc):
+        self.events.insert(doc)
+
+    async def update(self, event_id, fields):
+        doc = self.events.lookup(("_id",), event_id)
+        if doc is None:
+            return None
+        return dict(self.events.update(doc, fields))
+
+    async def increment_registered_count(self, event_id, delta, projection=None):
+        doc = self.events.lookup(("_id",), event_id)
+        if doc is None:
+            return None
+
+        current = doc.get("registered_count", 0)
+        if not isinstance(current, int):
+            # same failure as $inc on a null / non-numeric field
+            raise WriteError("Cannot apply $inc to a value of non-numeric type", 14)
+
+        return project(self.events.update(doc, {"registered_count": current + delta}), projection)
+
+
+class MemoryRegistrationRepository(RegistrationRepository):
+
+    def __init__(self):
+        self.registrations = MemoryCollection("registrations", unique=(("event_id", "university_uid"),))
+        # event_id -> {university_uid: doc}, in insertion order
+        self._by_event: dict = {}
+
+    def _insert(self, doc: dict) -> None:
+        stored = self.registrations.insert(doc)
+        self._by_event.setdefault(stored.get("event_id"), {})[stored.get("university_uid")] = stored
+
+    async def insert(self, doc):
+        self._insert(doc)
+
+    async def insert_many(self, docs):
+        errors = []
+        for index, doc in enumerate(docs):
+            try:
+                self._insert(doc)
+            except DuplicateKeyError as exc:
+                errors.append({"index": index, **exc.details})
+
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors,
+                "writeConcernErrors": [],
+                "nInserted": len(docs) - len(errors),
+                "nUpserted": 0,
+                "nMatched": 0,
+                "nModified": 0,
+                "nRemoved": 0,
+                "upserted": [],
+            })
+
+    async def exists(self, event_id, university_uid):
+        return self.registrations.lookup(("event_id", "university_uid"), event_id, university_uid) is not None
+
+    async def delete(self, event_id, university_uid):
+        doc = self.registrations.lookup(("event_id", "university_uid"), event_id, university_uid)
+        if doc is None:
+            return False
+
+        self.registrations.remove(doc)
+        del self._by_event[event_id][university_uid]
+        return True
+
+    async def for_event(self, event_id, projection=None, batch_size=500) -> AsyncIterator[dict]:
+        # snapshot so concurrent writes don't break iteration
+        docs = list(self._by_event.get(event_id, {}).values())
+        for doc in docs:
+            yield project(doc, projection)
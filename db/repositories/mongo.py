@@ -0,0 +1,158 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from bson.binary import Binary
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+
+from db.collections import (
+    users_collection,
+    refresh_tokens_collection,
+    event_collection,
+    registration_collection,
+)
+from db.migrations.schema import on_read, versioned_projection
+from .base import (
+    UserRepository,
+    RefreshTokenRepository,
+    EventRepository,
+    RegistrationRepository,
+)
+
+# -------------------------------------------------------------------
+# MongoDB backend
+#
+# Thin wrappers over the collection accessors; uniqueness and TTL come
+# from the indexes in db/indexes.py. User reads go through the schema
+# migration read hook (db/migrations/schema.py), so callers always see
+# the current document shape.
+# -------------------------------------------------------------------
+
+
+class MongoUserRepository(UserRepository):
+
+    async def _find_one(self, query: dict, projection: dict | None) -> dict | None:
+        doc = await users_collection().find_one(query, versioned_projection("users", projection))
+        return on_read("users", doc, projection)
+
+    async def get(self, user_id, projection=None):
+        return await self._find_one({"_id": user_id}, projection)
+
+    async def find_by_email(self, email, projection=None):
+        return await self._find_one({"email": email}, projection)
+
+    async def find_by_university_uid(self, university_uid, projection=None):
+        return await self._find_one({"university_uid": university_uid}, projection)
+
+    async def find_by_university_uids(self, university_uids, projection=None):
+        cursor = users_collection().find(
+            {"university_uid": {"$in": university_uids}},
+            versioned_projection("users", projection),
+        )
+        return [on_read("users", doc, projection) async for doc in cursor]
+
+    async def insert(self, doc):
+        await users_collection().insert_one(doc)
+
+    async def update(self, user_id, fields, projection=None):
+        doc = await users_collection().find_one_and_update(
+            {"_id": user_id},
+            {"$set": fields},
+            projection=versioned_projection("users", projection),
+            return_document=ReturnDocument.AFTER,
+        )
+        return on_read("users", doc, projection)
+
+
+class MongoRefreshTokenRepository(RefreshTokenRepository):
+
+    async def insert(self, doc):
+        await refresh_tokens_collection().insert_one(doc)
+
+    async def find_active(self, token_hash: str, now: datetime):
+        return await refresh_tokens_collection().find_one({
+            "token_hash": token_hash,
+            "revoked": False,
+            "expires_at": {"$gt": now},
+        })
+
+    async def has_active_device(self, user_id: Binary, device_id: str) -> bool:
+        return await refresh_tokens_collection().find_one(
+            {"user_id": user_id, "device_id": device_id, "revoked": False},
+            {"_id": 1},
+        ) is not None
+
+    async def update(self, token_hash, fields):
+        result = await refresh_tokens_collection().update_one(
+            {"token_hash": token_hash},
+            {"$set": fields},
+        )
+        return result.matched_count > 0
+
+
+class MongoEventRepository(EventRepository):
+
+    def __init__(self, public_read: bool = False):
+        # listings and details tolerate slightly stale reads
+        self.public_read = public_read
+
+    async def get(self, event_id, projection=None, status=None):
+        query = {"_id": event_id}
+        if status is not None:
+            query["status"] = status
+        return await event_collection(self.public_read).find_one(query, projection)
+
+    async def list_by_status(self, status):
+        cursor = event_collection(self.public_read).find({"status": status}).sort("start_time", ASCENDING)
+        return await cursor.to_list()
+
+    async def list_all(self):
+        cursor = event_collection(self.public_read).find().sort("created_at", DESCENDING)
+        return await cursor.to_list()
+
+    async def insert(self, doc):
+        await event_collection().insert_one(doc)
+
+    async def update(self, event_id, fields):
+        return await event_collection().find_one_and_update(
+            {"_id": event_id},
+            {"$set": fields},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def increment_registered_count(self, event_id, delta, projection=None):
+        return await event_collection().find_one_and_update(
+            {"_id": event_id},
+            {"$inc": {"registered_count": delta}},
+            projection=projection,
+            return_document=ReturnDocument.AFTER,
+        )
+
+
+class MongoRegistrationRepository(RegistrationRepository):
+
+    async def insert(self, doc):
+        await registration_collection().insert_one(doc)
+
+    async def insert_many(self, docs):
+        await registration_collection().insert_many(docs, ordered=False)
+
+    async def exists(self, event_id, university_uid):
+        return await registration_collection().find_one(
+            {"event_id": event_id, "university_uid": university_uid},
+            {"_id": 1},
+        ) is not None
+
+    async def delete(self, event_id, university_uid):
+        result = await registration_collection().delete_one(
+            {"event_id": event_id, "university_uid": university_uid}
+        )
+        return result.deleted_count > 0
+
+    async def for_event(self, event_id, projection=None, batch_size=500) -> AsyncIterator[dict]:
+        cursor = registration_collection().find(
+            {"event_id": event_id},
+            projection,
+            batch_size=batch_size,
+        )
+        async for doc in cursor:
+            yield doc
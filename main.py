@@ -1,25 +1,46 @@
+# first: starts the startup clock before anything heavy is imported
+from core.ops.startup import startup_profile
+
 from fastapi import FastAPI
 import uvicorn
 import asyncio
+import os
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-from db.mongo import get_mongo_client
-from db.indexes import create_indexes
+from db.mongo import get_mongo_client, reset_connection_cache
+from db.indexes import ensure_indexes, index_build, INDEX_BUILD_RETRY_SECONDS
 
 from routers.auth import auth_router
 from routers.event import event_router
 from routers.registrations import registrations_router
+from routers.attendance import attendance_router
+from routers.quiz import quiz_router
+from routers.users import users_router
+from routers.ops import ops_router
 
 from core.logging.middleware import RequestLoggingMiddleware
 from core.logging.trace import TraceIDMiddleware
-from core.logging.transport import api_log_worker, audit_log_worker
+from core.logging.transport import api_log_worker, audit_log_worker, drain_log_workers
+from core.registrations.ingest import registration_ingestor, REGISTRATION_WRITE_BEHIND
+from core.events.stats import event_stats_worker
+from core.events.live import close_broadcasters
+from core.attendance.membership import membership_sweeper
+from core.attendance.occupancy import occupancy_tracker, occupancy_checkpoint_worker
+from core.quiz.session import close_sessions
+from core.quiz.answers import answer_writer
+from core.auth.passwords import shutdown_password_pool
+from core.ops.health import health_probe_worker
+from db.migrations.migrator import schema_migration_worker
 
 from core.security.apiKeyMiddleware import ApiKeyMiddleware
+from core.http.compression import CompressionMiddleware
 
 load_dotenv()
 
+LOG_DRAIN_SECONDS = float(os.getenv("LOG_DRAIN_SECONDS", "5"))
+
 openAPI_tags = [
     {"name": "Authentication", "description": "User authentication and authorization."},
     {"name": "Events", "description": "Event creation, updates, and metadata."},
@@ -28,20 +49,73 @@ openAPI_tags = [
 ]
 
 
+async def build_indexes() -> None:
+    # runs while the worker serves: on a deployment whose index definitions
+    # are unchanged this is one read, and a new definition is built once
+    # (see ensure_indexes) without holding every worker's startup. Until
+    # the indexes exist the worker reports unready (/readyz); a failed
+    # build, or one another worker abandoned, is retried.
+    with startup_profile.phase("indexes"):
+        while not index_build.built:
+            try:
+                if await ensure_indexes():
+                    print("✅ Indexes created")
+            except Exception as exc:
+                index_build.set("failed", str(exc))
+                print(f"Index creation failed: {exc}")
+
+            if not index_build.built:
+                await asyncio.sleep(INDEX_BUILD_RETRY_SECONDS)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
-    await create_indexes()
-
-    asyncio.create_task(api_log_worker())
-    asyncio.create_task(audit_log_worker())
+    log_workers = [
+        asyncio.create_task(api_log_worker()),
+        asyncio.create_task(audit_log_worker()),
+    ]
 
     print("✅ Logging workers started")
 
+    background = [
+        asyncio.create_task(build_indexes()),
+        asyncio.create_task(event_stats_worker()),
+        asyncio.create_task(membership_sweeper()),
+        asyncio.create_task(occupancy_checkpoint_worker()),
+        asyncio.create_task(schema_migration_worker()),
+        asyncio.create_task(health_probe_worker(log_workers)),
+    ]
+    answer_writer.start()
+
+    if REGISTRATION_WRITE_BEHIND:
+        registration_ingestor.start()
+        print("✅ Write-behind registration ingestion enabled")
+
+    startup_profile.ready()
+
     yield
 
+    close_broadcasters()
+    close_sessions()
+    await answer_writer.stop()
+    shutdown_password_pool()
+    await registration_ingestor.stop()
+
+    try:
+        await occupancy_tracker.checkpoint(final=True)
+    except Exception as exc:
+        print(f"Final occupancy checkpoint failed: {exc}")
+
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+
+    await drain_log_workers(log_workers, LOG_DRAIN_SECONDS)
+
     client = get_mongo_client()
     await client.close()
+    reset_connection_cache()
     print("🛑 MongoDB connection closed")
 
 
@@ -66,6 +140,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(TraceIDMiddleware)
 app.add_middleware(ApiKeyMiddleware)
@@ -74,10 +149,17 @@ registered_routers = [
     auth_router,
     event_router,
     registrations_router,
+    attendance_router,
+    quiz_router,
+    users_router,
+    ops_router,
 ]
 
 for router in registered_routers:
     app.include_router(router)
 
+startup_profile.imported()
+
 if __name__ == "__main__":
+    # development server; production runs through serve.py
     uvicorn.run("main:app", host="0.0.0.0", port=5000, reload=True)
\ No newline at end of file
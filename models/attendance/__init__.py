@@ -1,7 +1,27 @@
-from .requests import AttendanceRequest
-from .responses import AttendanceResponse
+from .requests import AttendanceRequest, AttendanceBatchRequest, OfflineScan, AttendanceSyncRequest
+from .responses import (
+    AttendanceResponse,
+    AttendanceBatchResponse,
+    AttendanceSyncResult,
+    AttendanceSyncResponse,
+    PassKeyResponse,
+    OccupancyBucket,
+    AttendanceAnalyticsResponse,
+)
+from .enums import ActionType, ScanStatus
 
 __all__ = [
     "AttendanceRequest",
-    "AttendanceResponse"
-]
\ No newline at end of file
+    "AttendanceBatchRequest",
+    "AttendanceResponse",
+    "AttendanceBatchResponse",
+    "OfflineScan",
+    "AttendanceSyncRequest",
+    "AttendanceSyncResult",
+    "AttendanceSyncResponse",
+    "PassKeyResponse",
+    "OccupancyBucket",
+    "AttendanceAnalyticsResponse",
+    "ActionType",
+    "ScanStatus",
+]
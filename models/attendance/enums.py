@@ -2,4 +2,11 @@ from enum import Enum
 
 class ActionType(str, Enum):
     checkin = "checkin"
-    checkout = "checkout"
\ No newline at end of file
+    checkout = "checkout"
+
+class ScanStatus(str, Enum):
+    recorded = "recorded"
+    already_recorded = "already_recorded"
+    not_registered = "not_registered"
+    attendance_closed = "attendance_closed"
+    invalid_pass = "invalid_pass"
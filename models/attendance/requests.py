@@ -1,9 +1,21 @@
-from pydantic import BaseModel, EmailStr, Field
-from bson import ObjectId
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
 from .enums import ActionType
 
 class AttendanceRequest(BaseModel):
-    email: EmailStr = Field(..., description="The email address of the attendee")
-    eventId: ObjectId = Field(..., description="The ID of the event")
-    actionType: ActionType = Field(..., description="The type of action (checkin or checkout)")
\ No newline at end of file
+    event_id: str = Field(..., description="The ID of the event")
+    university_uid: str = Field(..., description="The university UID of the attendee")
+    action: ActionType = Field(..., description="The type of action (checkin or checkout)")
+    scanned_at: Optional[datetime] = Field(default=None, description="Scan time on the device; defaults to server time")
+
+class AttendanceBatchRequest(BaseModel):
+    scans: List[AttendanceRequest] = Field(..., min_length=1, max_length=500, description="Scans to record in one call")
+
+class OfflineScan(BaseModel):
+    pass_token: str = Field(..., description="The signed entry pass that was scanned")
+    action: ActionType = Field(..., description="The type of action (checkin or checkout)")
+    scanned_at: datetime = Field(..., description="When the device scanned the pass")
+
+class AttendanceSyncRequest(BaseModel):
+    scans: List[OfflineScan] = Field(..., min_length=1, max_length=500, description="Scans queued on the device while offline")
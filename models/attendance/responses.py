@@ -1,9 +1,48 @@
-from pydantic import BaseModel, EmailStr, StrictBool, Field
-from bson import ObjectId
-from .enums import ActionType
+from datetime import datetime
+from pydantic import BaseModel, StrictBool, Field
+from typing import List, Optional
+from .enums import ActionType, ScanStatus
 
 class AttendanceResponse(BaseModel):
-    email: EmailStr = Field(..., description="The email address of the attendee")
-    eventId: ObjectId = Field(..., description="The ID of the event")
-    actionType: ActionType = Field(..., description="The type of action (checkin or checkout)")
-    success: StrictBool = Field(..., description="Indicates if the attendance action was successful")
\ No newline at end of file
+    event_id: str = Field(..., description="The ID of the event")
+    university_uid: str = Field(..., description="The university UID of the attendee")
+    action: ActionType = Field(..., description="The type of action (checkin or checkout)")
+    status: ScanStatus = Field(..., description="Outcome of the scan")
+    success: StrictBool = Field(..., description="Indicates if the attendance action was successful")
+
+class AttendanceBatchResponse(BaseModel):
+    recorded: int = Field(..., description="Number of new attendance records")
+    results: List[AttendanceResponse] = Field(..., description="Per-scan outcome, in request order")
+
+class AttendanceSyncResult(BaseModel):
+    index: int = Field(..., description="Position of the scan in the sync request")
+    event_id: Optional[str] = Field(default=None, description="The ID of the event, if the pass was valid")
+    university_uid: Optional[str] = Field(default=None, description="The university UID of the attendee, if the pass was valid")
+    action: ActionType = Field(..., description="The type of action (checkin or checkout)")
+    status: ScanStatus = Field(..., description="Outcome of the scan")
+    success: StrictBool = Field(..., description="Indicates if the attendance action was successful")
+
+class AttendanceSyncResponse(BaseModel):
+    recorded: int = Field(..., description="Number of new attendance records")
+    results: List[AttendanceSyncResult] = Field(..., description="Per-scan outcome, in request order")
+
+class PassKeyResponse(BaseModel):
+    algorithm: str = Field(..., description="Signature algorithm (Ed25519)")
+    key_id: str = Field(..., description="Short fingerprint of the public key")
+    public_key: str = Field(..., description="Raw public key, base64url")
+    public_key_pem: str = Field(..., description="Public key, PEM encoded")
+    version: int = Field(..., description="Pass format version")
+
+class OccupancyBucket(BaseModel):
+    start: datetime = Field(..., description="Start of the time bucket (UTC)")
+    arrivals: int = Field(..., description="Check-ins scanned in this bucket")
+    departures: int = Field(..., description="Check-outs scanned in this bucket")
+
+class AttendanceAnalyticsResponse(BaseModel):
+    event_id: str = Field(..., description="The ID of the event")
+    inside: int = Field(..., description="Attendees checked in and not yet checked out")
+    checked_in: int = Field(..., description="Total check-ins")
+    checked_out: int = Field(..., description="Total check-outs")
+    average_dwell_seconds: Optional[float] = Field(default=None, description="Mean time between check-in and check-out")
+    bucket_minutes: int = Field(..., description="Width of each bucket")
+    buckets: List[OccupancyBucket] = Field(..., description="Arrivals and departures per bucket, oldest first")
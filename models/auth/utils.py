@@ -4,7 +4,7 @@ import hashlib
 import os
 from fastapi import HTTPException
 import pytz
-from db.collections import refresh_tokens_collection
+from db.repositories.backend import refresh_tokens_repository
 import secrets
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -22,16 +22,13 @@ async def validate_refresh_session(
     refresh_token: str,
     device_id: str | None,
 ):
-    refresh_tokens = refresh_tokens_collection()
+    refresh_tokens = refresh_tokens_repository()
 
     token_hash = hash_refresh_token(refresh_token)
 
-    stored = await refresh_tokens.find_one(
-        {
-            "token_hash": token_hash,
-            "revoked": False,
-            "expires_at": {"$gt": datetime.now(ASIA_KOLKATA)},
-        }
+    stored = await refresh_tokens.find_active(
+        token_hash,
+        datetime.now(ASIA_KOLKATA),
     )
 
     if not stored:
@@ -40,35 +37,25 @@ async def validate_refresh_session(
     stored_device = stored.get("device_id")
 
     if stored_device and device_id and stored_device != device_id:
-        await refresh_tokens.update_one(
-            {"token_hash": token_hash},
-            {"$set": {"revoked": True}},
-        )
+        await refresh_tokens.revoke(token_hash)
         raise HTTPException(401, "Device mismatch")
     
-    await refresh_tokens.update_one(
-        {"token_hash": token_hash},
-        {
-            "$set": {
-                "last_used_at": datetime.now(ASIA_KOLKATA)
-            }
-        }
+    await refresh_tokens.update(
+        token_hash,
+        {"last_used_at": datetime.now(ASIA_KOLKATA)},
     )
     
     return stored, token_hash
 
 async def rotate_refresh_token(old_hash, stored_token):
-    refresh_tokens = refresh_tokens_collection()
+    refresh_tokens = refresh_tokens_repository()
 
-    await refresh_tokens.update_one(
-        {"token_hash": old_hash},
-        {"$set": {"revoked": True}}
-    )
+    await refresh_tokens.revoke(old_hash)
 
     new_token = secrets.token_urlsafe(64)
     new_hash = hash_refresh_token(new_token)
 
-    await refresh_tokens.insert_one({
+    await refresh_tokens.insert({
         "token_hash": new_hash,
         "user_id": stored_token["user_id"],
         "role": stored_token["role"],
@@ -1,6 +1,6 @@
 from .base import EventBase
 from .requests import EventCreateRequest, EventUpdateRequest
-from .responses import EventResponse, EventDetails
+from .responses import EventResponse, EventDetails, EventStatsResponse
 from .db import EventDB
 from .enums import EventStatus
 
@@ -10,6 +10,7 @@ __all__ = [
     "EventUpdateRequest",
     "EventResponse",
     "EventDetails",
+    "EventStatsResponse",
     "EventDB",
     "EventStatus",
 ]
@@ -32,4 +32,6 @@ class EventUpdateRequest(BaseModel):
     description: Optional[str] = None
     agenda: Optional[str] = None
     rules: Optional[str] = None
-    contact_email: Optional[str] = None
\ No newline at end of file
+    contact_email: Optional[str] = None
+
+    attendance_enabled: Optional[bool] = None
\ No newline at end of file
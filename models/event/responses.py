@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from models.event.db import EventContent
 from models.event.base import EventBase
@@ -34,3 +34,18 @@ class EventDetails(EventBase, EventContent):
     registered_count: int
 
     created_at: datetime
+
+
+class EventStatsResponse(BaseModel):
+    event_id: str
+
+    registered: int = 0
+    checked_in: int = 0
+    checked_out: int = 0
+
+    by_degree_program: Dict[str, int] = {}
+    by_graduation_year: Dict[str, int] = {}
+    by_hostel: Dict[str, int] = {}
+
+    updated_at: Optional[datetime] = None
+    reconciled_at: Optional[datetime] = None
@@ -1,5 +1,16 @@
-from .requests import QuizCreateRequest, QuestionSchema, QuizSchedule, QuizSettings
-from .responses import QuizCreationResponse, QuizScheduleResponse, QuizSettingsResponse
+from .requests import QuizCreateRequest, QuestionSchema, QuizSchedule, QuizSettings, QuizAnswerRequest
+from .responses import (
+    QuizCreationResponse,
+    QuizScheduleResponse,
+    QuizSettingsResponse,
+    QuizSessionResponse,
+    QuizAnswerResponse,
+    LeaderboardEntry,
+    LeaderboardResponse,
+    QuizQuestionStats,
+    QuizResultsResponse,
+)
+from .enums import QuizSessionStatus, AnswerStatus
 
 __all__ = [
     "QuizCreateRequest",
@@ -8,5 +19,14 @@ __all__ = [
     "QuizScheduleResponse",
     "QuizSettingsResponse",
     "QuizSettings",
-    "QuizSchedule"
-]
\ No newline at end of file
+    "QuizSchedule",
+    "QuizAnswerRequest",
+    "QuizSessionResponse",
+    "QuizAnswerResponse",
+    "LeaderboardEntry",
+    "LeaderboardResponse",
+    "QuizQuestionStats",
+    "QuizResultsResponse",
+    "QuizSessionStatus",
+    "AnswerStatus",
+]
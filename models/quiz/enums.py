@@ -0,0 +1,12 @@
+from enum import Enum
+
+class QuizSessionStatus(str, Enum):
+    scheduled = "scheduled"
+    live = "live"
+    finished = "finished"
+
+class AnswerStatus(str, Enum):
+    accepted = "accepted"
+    already_answered = "already_answered"
+    question_closed = "question_closed"
+    invalid_option = "invalid_option"
@@ -88,8 +88,8 @@ class QuizSchedule(BaseModel):
 
     @field_validator("end_time")
     @classmethod
-    def validate_time_window(cls, end_time, values):
-        start_time = values.get("start_time")
+    def validate_time_window(cls, end_time, info: ValidationInfo):
+        start_time = info.data.get("start_time")
         if start_time and end_time <= start_time:
             raise ValueError("end_time must be after start_time")
         return end_time
@@ -113,5 +113,28 @@ class QuizCreateRequest(BaseModel):
 
     questions: List[QuestionSchema] = Field(
         description="List of quiz questions",
-        min_items=1
+        min_length=1
+    )
+
+    @field_validator("questions")
+    @classmethod
+    def validate_correct_options(cls, questions):
+        for question in questions:
+            if question.correct_option_id not in {option.id for option in question.options}:
+                raise ValueError("correct_option_id must match one of the question's options")
+        return questions
+
+
+# ----------------------------
+# Live Session
+# ----------------------------
+
+class QuizAnswerRequest(BaseModel):
+    question_index: int = Field(
+        ge=0,
+        description="Index of the question being answered (0-based); the participant's own position when questions are shuffled"
+    )
+
+    option_id: str = Field(
+        description="ID of the chosen option"
     )
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import datetime
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import Dict, List, Optional
+from .enums import QuizSessionStatus, AnswerStatus
 
 
 class QuizScheduleResponse(BaseModel):
@@ -57,4 +58,151 @@ class QuizCreationResponse(BaseModel):
 
     total_questions: int = Field(
         description="Total number of questions in the quiz"
-    )
\ No newline at end of file
+    )
+
+class QuizSessionResponse(BaseModel):
+    quiz_id: str = Field(
+        description="Unique identifier of the quiz"
+    )
+
+    status: QuizSessionStatus = Field(
+        description="Session state on the server clock"
+    )
+
+    started_at: datetime = Field(
+        description="When the first question opens"
+    )
+
+    ends_at: datetime = Field(
+        description="When the last question closes"
+    )
+
+    total_questions: int = Field(
+        description="Total number of questions in the quiz"
+    )
+
+    question_index: Optional[int] = Field(
+        default=None,
+        description="Question currently open (0-based), if live"
+    )
+
+    question_closes_at: Optional[datetime] = Field(
+        default=None,
+        description="Deadline for the open question, if live"
+    )
+
+
+class QuizAnswerResponse(BaseModel):
+    quiz_id: str = Field(
+        description="Unique identifier of the quiz"
+    )
+
+    question_index: int = Field(
+        description="Index of the answered question"
+    )
+
+    status: AnswerStatus = Field(
+        description="Outcome of the answer"
+    )
+
+    accepted: bool = Field(
+        description="Whether the answer was recorded"
+    )
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int = Field(
+        description="1-based position on the leaderboard"
+    )
+
+    user_id: str = Field(
+        description="Participant user ID"
+    )
+
+    score: int = Field(
+        description="Correct answers so far"
+    )
+
+    latency_ms: int = Field(
+        description="Total answer time of the correct answers (tie-breaker, lower is better)"
+    )
+
+
+class LeaderboardResponse(BaseModel):
+    quiz_id: str = Field(
+        description="Unique identifier of the quiz"
+    )
+
+    question_index: Optional[int] = Field(
+        default=None,
+        description="Last question included in the standings"
+    )
+
+    participants: int = Field(
+        description="Number of ranked participants"
+    )
+
+    top: List[LeaderboardEntry] = Field(
+        description="Best participants, best first"
+    )
+
+    me: Optional[LeaderboardEntry] = Field(
+        default=None,
+        description="The caller's own standing, if ranked"
+    )
+
+
+class QuizQuestionStats(BaseModel):
+    question_index: int = Field(
+        description="Index of the question (0-based)"
+    )
+
+    answered_rate: Optional[float] = Field(
+        default=None,
+        description="Share of participants who answered"
+    )
+
+    difficulty: Optional[float] = Field(
+        default=None,
+        description="Share of participants who answered correctly (lower is harder)"
+    )
+
+    discrimination: Optional[float] = Field(
+        default=None,
+        description="Correlation between getting this question right and the total score"
+    )
+
+    option_counts: Dict[str, int] = Field(
+        description="Number of participants choosing each option"
+    )
+
+
+class QuizResultsResponse(BaseModel):
+    quiz_id: str = Field(
+        description="Unique identifier of the quiz"
+    )
+
+    participants: int = Field(
+        description="Participants with at least one answer"
+    )
+
+    total_questions: int = Field(
+        description="Total number of questions in the quiz"
+    )
+
+    mean_score: float = Field(
+        description="Mean number of correct answers"
+    )
+
+    pass_rate: Optional[float] = Field(
+        default=None,
+        description="Share of participants at or above passing_score_percentage, if configured"
+    )
+
+    questions: List[QuizQuestionStats] = Field(
+        description="Per-question statistics"
+    )
+
+    scored_at: datetime = Field(
+        description="When the results were computed"
+    )
@@ -1,5 +1,13 @@
 from .requests import EventRegistrationRequest, EventRegistrationCheck, EventRegistrationCancellation
-from .responses import RegistrationResponse, RegistrationStatusResponse, RegistrationCancellationResponse
+from .responses import (
+	RegistrationResponse,
+	RegistrationStatusResponse,
+	RegistrationCancellationResponse,
+	RegistrationImportRow,
+	RegistrationImportReport,
+	EntryPassResponse,
+)
+from .enums import ImportRowStatus
 
 __all__ = [
 	"EventRegistrationRequest",
@@ -8,4 +16,8 @@ __all__ = [
 	"RegistrationResponse",
 	"RegistrationStatusResponse",
 	"RegistrationCancellationResponse",
+	"RegistrationImportRow",
+	"RegistrationImportReport",
+	"ImportRowStatus",
+	"EntryPassResponse",
 ]
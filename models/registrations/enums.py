@@ -0,0 +1,9 @@
+from enum import Enum
+
+class ImportRowStatus(str, Enum):
+    registered = "registered"
+    already_registered = "already_registered"
+    duplicate_row = "duplicate_row"
+    unknown_user = "unknown_user"
+    invalid_row = "invalid_row"
+    failed = "failed"
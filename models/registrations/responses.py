@@ -1,5 +1,7 @@
 from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field, EmailStr
+from .enums import ImportRowStatus
 
 
 class RegistrationResponse(BaseModel):
@@ -16,3 +18,23 @@ class RegistrationStatusResponse(BaseModel):
 class RegistrationCancellationResponse(BaseModel):
     event_id: str = Field(..., description="The ID of the event")
     cancelled: bool = Field(..., description="Whether the registration was cancelled successfully")
+
+
+class RegistrationImportRow(BaseModel):
+    row: int = Field(..., description="1-based data row number in the upload")
+    university_uid: Optional[str] = Field(default=None, description="The university UID read from the row")
+    status: ImportRowStatus = Field(..., description="Outcome for this row")
+
+
+class RegistrationImportReport(BaseModel):
+    event_id: str = Field(..., description="The ID of the event")
+    total_rows: int = Field(..., description="Number of data rows read")
+    registered: int = Field(..., description="Number of new registrations created")
+    rows: List[RegistrationImportRow] = Field(..., description="Per-row outcome")
+
+
+class EntryPassResponse(BaseModel):
+    event_id: str = Field(..., description="The ID of the event")
+    university_uid: str = Field(..., description="The university UID of the registrant")
+    expires_at: datetime = Field(..., description="When the pass stops being accepted")
+    token: str = Field(..., description="Signed pass to render as a QR code")
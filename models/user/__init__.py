@@ -1,9 +1,16 @@
-from .base import UserBase, AuthProvider
-from .responses import UserResponse
+from .base import UserBase, AuthProvider, UserImportRowStatus, UserSearchField
+from .requests import UserUpdateRequest
+from .responses import UserResponse, UserImportRow, UserImportReport, UserDirectoryResponse
 from .db import UserDB
 
 __all__ = [
     "UserBase",
     "UserResponse",
     "UserDB",
+    "UserImportRowStatus",
+    "UserImportRow",
+    "UserImportReport",
+    "UserSearchField",
+    "UserUpdateRequest",
+    "UserDirectoryResponse",
 ]
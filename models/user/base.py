@@ -28,4 +28,19 @@ class UserBase(BaseModel):
 
     gender: Optional[str] = None
     hostel: Optional[str] = None
-    profile_picture_url: Optional[str] = None
\ No newline at end of file
+    profile_picture_url: Optional[str] = None
+
+class UserImportRowStatus(str, Enum):
+    created = "created"
+    email_taken = "email_taken"
+    university_uid_taken = "university_uid_taken"
+    duplicate_row = "duplicate_row"
+    invalid_row = "invalid_row"
+    failed = "failed"
+
+
+class UserSearchField(str, Enum):
+    first_name = "first_name"
+    last_name = "last_name"
+    email = "email"
+    university_uid = "university_uid"
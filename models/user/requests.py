@@ -1,3 +1,22 @@
 
 # This module previously contained `UserRegisterRequest`, which has been moved
 # to `models.auth.requests` to keep auth-related request models together.
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class UserUpdateRequest(BaseModel):
+    first_name: Optional[str] = Field(default=None, min_length=1, max_length=50)
+    last_name: Optional[str] = Field(default=None, min_length=1, max_length=50)
+
+    phone_number: Optional[str] = Field(
+        default=None,
+        min_length=10,
+        max_length=10,
+        pattern=r"^[0-9]{10}$"
+    )
+
+    gender: Optional[str] = None
+    hostel: Optional[str] = None
+    profile_picture_url: Optional[str] = None
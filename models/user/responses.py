@@ -1,8 +1,27 @@
 from datetime import datetime
-from pydantic import Field
-from .base import UserBase
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from .base import UserBase, UserImportRowStatus
 
 class UserResponse(UserBase):
     id: str
     is_verified: bool
     created_at: datetime
+
+
+class UserImportRow(BaseModel):
+    row: int = Field(..., description="1-based data row number in the upload")
+    email: Optional[str] = Field(default=None, description="The email read from the row")
+    status: UserImportRowStatus = Field(..., description="Outcome for this row")
+    detail: Optional[str] = Field(default=None, description="Validation errors for invalid rows")
+
+
+class UserImportReport(BaseModel):
+    total_rows: int = Field(..., description="Number of data rows read")
+    created: int = Field(..., description="Number of users created")
+    rows: List[UserImportRow] = Field(..., description="Per-row outcome")
+
+
+class UserDirectoryResponse(BaseModel):
+    items: List[UserResponse] = Field(..., description="Users on this page")
+    next_cursor: Optional[str] = Field(default=None, description="Pass as `after` for the next page; null on the last page")
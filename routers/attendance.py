@@ -1,13 +1,209 @@
-from fastapi import APIRouter, HTTPException, status, Depends
 from datetime import datetime, timezone
-from uuid import uuid4
 
-from db.collections import registration_collection, users_collection
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query, status
+
+from db.codec import encode_id, decode_id, try_encode_id
+from db.repositories.backend import event_repository
+from core.ops.admission import AdmissionRoute
 from core.auth.dependencies import require_role
+from core.attendance.scans import record_scans, recorded_counts, keep_earliest_scan_times, scan_time
+from core.attendance.passes import verify_pass, public_key_info
+from core.attendance.occupancy import occupancy_tracker
+from core.events.stats import record_attendance
 from models.auth.enums import UserRole
 from models.auth.jwt import JWTPayload
 
+from models.attendance import (
+    AttendanceRequest,
+    AttendanceBatchRequest,
+    AttendanceResponse,
+    AttendanceBatchResponse,
+    AttendanceSyncRequest,
+    AttendanceSyncResult,
+    AttendanceSyncResponse,
+    PassKeyResponse,
+    OccupancyBucket,
+    AttendanceAnalyticsResponse,
+    ScanStatus,
+)
+
 attendance_router = APIRouter(
     prefix="/attendance",
     tags=["Attendance"],
-)
\ No newline at end of file
+    route_class=AdmissionRoute,
+)
+
+def schedule_stats(background_tasks: BackgroundTasks, results: list[AttendanceResponse]) -> None:
+    for (event_id, action), count in recorded_counts(results).items():
+        background_tasks.add_task(record_attendance, encode_id(event_id), action, count)
+
+@attendance_router.post(
+    "",
+    response_model=AttendanceResponse,
+    description="""
+    ### Record a Scan
+    Checks an attendee in or out of an event with attendance enabled.
+    Idempotent per (event, attendee, action): repeating a scan returns
+    `already_recorded`.
+    """,
+)
+async def record_scan(
+    payload: AttendanceRequest,
+    background_tasks: BackgroundTasks,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    results = await record_scans([payload], current_user.sub)
+    schedule_stats(background_tasks, results)
+    return results[0]
+
+@attendance_router.post(
+    "/batch",
+    response_model=AttendanceBatchResponse,
+    description="""
+    ### Record a Batch of Scans
+    Records up to 500 scans in one call (for example, everything a gate
+    device queued in the last second). Results are returned in request order.
+    """,
+)
+async def record_scan_batch(
+    payload: AttendanceBatchRequest,
+    background_tasks: BackgroundTasks,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    results = await record_scans(payload.scans, current_user.sub)
+    schedule_stats(background_tasks, results)
+    return AttendanceBatchResponse(
+        recorded=sum(recorded_counts(results).values()),
+        results=results,
+    )
+
+@attendance_router.get(
+    "/passes/key",
+    response_model=PassKeyResponse,
+    description="Public key gate devices use to verify entry passes offline",
+)
+async def get_pass_key():
+    try:
+        return PassKeyResponse(**public_key_info())
+    except RuntimeError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Entry passes are not configured",
+        )
+
+@attendance_router.post(
+    "/sync",
+    response_model=AttendanceSyncResponse,
+    description="""
+    ### Sync Offline Scans
+    Uploads scans a gate device queued while offline. Each pass is
+    re-verified (signature and expiry at scan time) and the attendee's
+    registration is confirmed. Duplicates across devices and uploads
+    are reconciled: one record per (event, attendee, action), keeping
+    the earliest scan time.
+    """,
+)
+async def sync_offline_scans(
+    payload: AttendanceSyncRequest,
+    background_tasks: BackgroundTasks,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    now = datetime.now(timezone.utc)
+    results: list[AttendanceSyncResult | None] = [None] * len(payload.scans)
+    verified: list[tuple[int, AttendanceRequest]] = []
+
+    for index, scan in enumerate(payload.scans):
+        scanned_at = scan_time(scan.scanned_at, now)
+
+        try:
+            claims = verify_pass(scan.pass_token, at=scanned_at)
+        except ValueError:
+            results[index] = AttendanceSyncResult(
+                index=index,
+                action=scan.action,
+                status=ScanStatus.invalid_pass,
+                success=False,
+            )
+            continue
+        except RuntimeError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Entry passes are not configured",
+            )
+
+        verified.append((
+            index,
+            AttendanceRequest(
+                event_id=claims.event_id,
+                university_uid=claims.university_uid,
+                action=scan.action,
+                scanned_at=scanned_at,
+            ),
+        ))
+
+    # earliest scan first, so it is the one recorded within this upload
+    verified.sort(key=lambda item: item[1].scanned_at)
+    recorded = await record_scans([scan for _, scan in verified], current_user.sub)
+
+    await keep_earliest_scan_times([
+        scan
+        for (_, scan), result in zip(verified, recorded)
+        if result.status == ScanStatus.already_recorded
+    ])
+
+    for (index, _), result in zip(verified, recorded):
+        results[index] = AttendanceSyncResult(index=index, **result.model_dump())
+
+    schedule_stats(background_tasks, recorded)
+    return AttendanceSyncResponse(
+        recorded=sum(recorded_counts(recorded).values()),
+        results=results,
+    )
+
+@attendance_router.get(
+    "/{event_id}/analytics",
+    response_model=AttendanceAnalyticsResponse,
+    description="""
+    ### Live Occupancy
+    Who is inside right now, arrivals and departures per time bucket and
+    average dwell time, from live counters (a few seconds behind at most).
+    `bucket_minutes` must be a multiple of 5.
+    """,
+)
+async def get_attendance_analytics(
+    event_id: str,
+    bucket_minutes: int = Query(5, ge=5, le=1440, multiple_of=5),
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    key = try_encode_id(event_id)
+    if key is None or not await event_repository().get(key, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    event_id = decode_id(key)
+    counters = await occupancy_tracker.snapshot(event_id)
+
+    width = bucket_minutes * 60
+    arrivals: dict[int, int] = {}
+    departures: dict[int, int] = {}
+    for series, merged in (("arrivals", arrivals), ("departures", departures)):
+        for bucket, count in counters[series].items():
+            start = int(bucket) - int(bucket) % width
+            merged[start] = merged.get(start, 0) + count
+
+    dwell_count = counters["dwell_count"]
+    return AttendanceAnalyticsResponse(
+        event_id=event_id,
+        inside=max(counters["checked_in"] - counters["checked_out"], 0),
+        checked_in=counters["checked_in"],
+        checked_out=counters["checked_out"],
+        average_dwell_seconds=counters["dwell_seconds"] / dwell_count if dwell_count else None,
+        bucket_minutes=bucket_minutes,
+        buckets=[
+            OccupancyBucket(
+                start=datetime.fromtimestamp(start, tz=timezone.utc),
+                arrivals=arrivals.get(start, 0),
+                departures=departures.get(start, 0),
+            )
+            for start in sorted(arrivals.keys() | departures.keys())
+        ],
+    )
@@ -3,28 +3,34 @@ import secrets
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-import bcrypt
 import pytz
 from dotenv import load_dotenv
-from fastapi import APIRouter, Cookie, Header, HTTPException, Response, status, Request
+from fastapi import APIRouter, Cookie, Depends, Header, HTTPException, Response, status, Request
 
+from core.ops.admission import AdmissionRoute
 from core.auth.jwt import create_access_token
-from db.collections import refresh_tokens_collection, users_collection
+from core.auth.passwords import check_password, hash_password_async
+from db.repositories.backend import refresh_tokens_repository, users_repository
+from db.codec import encode_id, decode_id
+from db.migrations.schema import current_version
 from models.auth.responses import TokenResponse
 from models.auth.utils import hash_refresh_token, rotate_refresh_token, validate_refresh_session
 from models.auth.requests import LoginRequest, UserRegisterRequest, GoogleLoginRequest
 from models.user import UserDB, UserResponse, AuthProvider
+from core.users.profiles import to_user_response
 from models.auth.enums import UserRole
 from core.logging.audit import audit_log
 from core.logging.logger import Logger
 from core.security.device import is_new_device
-from firebase_admin import auth as firebase_auth
+from core.security.rate_limit import rate_limit
+from core.auth.firebase_admin import FirebaseUnavailableError, verify_google_id_token
 
 load_dotenv()
 
 auth_router = APIRouter(
     prefix="/auth",
     tags=["Authentication"],
+    route_class=AdmissionRoute,
 )
 
 # -------------------------------------------------------------------
@@ -41,30 +47,28 @@ ASIA_KOLKATA = pytz.timezone("Asia/Kolkata")
 @auth_router.post("/register",
     response_model=UserResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register"))],
 )
 @audit_log(action="USER_REGISTER")
 async def register_user(payload: UserRegisterRequest):
 
-    users = users_collection()
+    users = users_repository()
 
     payload.email = payload.email.lower().strip()
 
-    if await users.find_one({"email": payload.email}):
+    if await users.find_by_email(payload.email, {"_id": 1}):
         raise HTTPException(
             status_code=400,
             detail="Email already registered",
         )
 
-    if await users.find_one({"university_uid": payload.university_uid}):
+    if await users.find_by_university_uid(payload.university_uid, {"_id": 1}):
         raise HTTPException(
             status_code=400,
             detail="University ID already registered",
         )
 
-    password_hash = bcrypt.hashpw(
-        payload.password.encode(),
-        bcrypt.gensalt(),
-    ).decode()
+    password_hash = await hash_password_async(payload.password)
 
     now = datetime.now(ASIA_KOLKATA)
 
@@ -78,17 +82,17 @@ async def register_user(payload: UserRegisterRequest):
         provider_id=None,
 
         email_verified=False,
-        schema_version=2,
+        schema_version=current_version("users"),
         created_at=now,
         updated_at=now,
     )
 
     user_dict = user.model_dump()
-    user_dict["_id"] = user_dict.pop("id")
+    user_dict["_id"] = encode_id(user_dict.pop("id"))
 
-    await users.insert_one(user_dict)
+    await users.insert(user_dict)
 
-    return UserResponse(**user.model_dump(exclude={"password_hash"}))
+    return to_user_response(user.model_dump(exclude={"password_hash"}))
 
 
 # -------------------------------------------------------------------
@@ -98,6 +102,7 @@ async def register_user(payload: UserRegisterRequest):
 @auth_router.post(
     "/login",
     response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("login"))],
     description="""
     ### Login Flow
     Authenticate user with email and password.
@@ -123,24 +128,17 @@ async def login_user(
     payload: LoginRequest,
     response: Response,
 ):
-    users = users_collection()
-    refresh_tokens = refresh_tokens_collection()
+    users = users_repository()
+    refresh_tokens = refresh_tokens_repository()
 
-    user = await users.find_one(
-        {
-            "email": payload.email
-        }
-    )
+    user = await users.find_by_email(payload.email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Credentials",
         )
 
-    if not bcrypt.checkpw(
-        payload.password.encode(),
-        user['password_hash'].encode()
-    ):
+    if not await check_password(payload.password, user['password_hash']):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -157,12 +155,12 @@ async def login_user(
     if new_device:
         await Logger.new_device(
             request=request,
-            user_id=user["_id"],
+            user_id=decode_id(user["_id"]),
             device_id=device_id,
         )
 
     access_token = create_access_token(
-        user_id=user["_id"],
+        user_id=decode_id(user["_id"]),
         role=UserRole(user["role"]),
     )
 
@@ -170,7 +168,7 @@ async def login_user(
     refresh_token = secrets.token_urlsafe(64)
     refresh_token_hash = hash_refresh_token(refresh_token)
 
-    await refresh_tokens.insert_one(
+    await refresh_tokens.insert(
         {
             "token_hash": refresh_token_hash,
             "user_id": user["_id"],
@@ -202,6 +200,7 @@ async def login_user(
 @auth_router.post(
     "/google-login",
     response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("google-login"))],
     description="""
     ### Google Login Flow
     Authenticate user with Google ID token.
@@ -214,12 +213,15 @@ async def google_login(
     payload: GoogleLoginRequest,
     response: Response,
 ):
-    users = users_collection()
-    refresh_tokens = refresh_tokens_collection()
+    users = users_repository()
+    refresh_tokens = refresh_tokens_repository()
 
     try:
-        decoded_token = firebase_auth.verify_id_token(
-            payload.id_token
+        decoded_token = await verify_google_id_token(payload.id_token)
+    except FirebaseUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Google login unavailable",
         )
     except Exception:
         raise HTTPException(
@@ -243,7 +245,7 @@ async def google_login(
             detail="Google email not verified",
         )
 
-    user = await users.find_one({"email": email})
+    user = await users.find_by_email(email)
 
     if not user:
         raise HTTPException(
@@ -252,10 +254,7 @@ async def google_login(
         )
 
     if not user.get("email_verified"):
-        await users.update_one(
-            {"_id": user["_id"]},
-            {"$set": {"email_verified": True}}
-        )
+        await users.update(user["_id"], {"email_verified": True}, {"_id": 1})
 
     device_id = payload.device_id or str(uuid4())
 
@@ -268,19 +267,19 @@ async def google_login(
     if new_device:
         await Logger.new_device(
             request=request,
-            user_id=user["_id"],
+            user_id=decode_id(user["_id"]),
             device_id=device_id,
         )
 
     access_token = create_access_token(
-        user_id=user["_id"],
+        user_id=decode_id(user["_id"]),
         role=UserRole(user["role"]),
     )
 
     refresh_token = secrets.token_urlsafe(64)
     refresh_token_hash = hash_refresh_token(refresh_token)
 
-    await refresh_tokens.insert_one(
+    await refresh_tokens.insert(
         {
             "token_hash": refresh_token_hash,
             "user_id": user["_id"],
@@ -343,7 +342,7 @@ async def refresh_access_token(
     )
 
     access_token = create_access_token(
-        user_id=stored_token["user_id"],
+        user_id=decode_id(stored_token["user_id"]),
         role=UserRole(stored_token["role"]),
     )
 
@@ -378,12 +377,8 @@ async def logout_user(
     refresh_token: str | None = Cookie(default=None),
 ):
     if refresh_token:
-        refresh_tokens = refresh_tokens_collection()
-        refresh_token_hash = hash_refresh_token(refresh_token)
-
-        await refresh_tokens.update_one(
-            {"token_hash": refresh_token_hash},
-            {"$set": {"revoked": True}}
+        await refresh_tokens_repository().revoke(
+            hash_refresh_token(refresh_token)
         )
 
     response.delete_cookie(
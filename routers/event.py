@@ -1,9 +1,22 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+import asyncio
+
+from bson.binary import Binary
+from fastapi import APIRouter, HTTPException, status, Depends, Request
+from pydantic import TypeAdapter
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from db.collections import event_collection
+from db.collections import event_stats_collection
+from db.repositories.backend import event_repository
+from db.codec import encode_id, decode_id, decode_ids, try_encode_id
+from core.ops.admission import AdmissionRoute
 from core.auth.dependencies import require_role
+from core.events.stats import DIMENSIONS, unescape_key
+from core.events.live import subscribe, unsubscribe, publish_counters
+from core.events.cache import PUBLISHED_EVENTS, event_details_key, event_response_cache
+from core.http.compression import CompressedBody
+from core.attendance.membership import membership_index
 from models.auth.enums import UserRole
 from models.auth.jwt import JWTPayload
 
@@ -14,13 +27,43 @@ from models.event import (
     EventDetails,
     EventDB,
     EventStatus,
+    EventStatsResponse,
 )
 
 event_router = APIRouter(
     prefix="/events",
     tags=["Events"],
+    route_class=AdmissionRoute,
 )
 
+SSE_HEARTBEAT_SECONDS = 15
+
+EVENT_LIST_ADAPTER = TypeAdapter(list[EventResponse])
+
+def event_key(event_id: str) -> Binary:
+    """
+    Stored form of an API event id; malformed ids are not found.
+    """
+    key = try_encode_id(event_id)
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found",
+        )
+    return key
+
+def to_event_doc(event: EventDB) -> dict:
+    doc = event.model_dump()
+    doc["_id"] = encode_id(doc.pop("id"))
+    doc["created_by"] = encode_id(doc["created_by"])
+    return doc
+
+def from_event_doc(doc: dict) -> dict:
+    return decode_ids(doc, "created_by")
+
+def invalidate_public_event(key: Binary) -> None:
+    event_response_cache.invalidate(PUBLISHED_EVENTS, event_details_key(key))
+
 @event_router.post(
     "",
     response_model=EventDetails,
@@ -31,7 +74,7 @@ async def create_event(
     payload: EventCreateRequest,
     current_user: JWTPayload = Depends(require_role(UserRole.core)),
 ):
-    events = event_collection()
+    events = event_repository()
     now = datetime.now(timezone.utc)
 
     event = EventDB(
@@ -44,7 +87,7 @@ async def create_event(
         updated_at=now,
     )
 
-    await events.insert_one(event.model_dump())
+    await events.insert(to_event_doc(event))
     return EventDetails(**event.model_dump())
 
 @event_router.put(
@@ -57,7 +100,7 @@ async def update_event(
     payload: EventUpdateRequest,
     current_user: JWTPayload = Depends(require_role(UserRole.core)),
 ):
-    events = event_collection()
+    events = event_repository()
     update_data = payload.model_dump(exclude_unset=True)
 
     if not update_data:
@@ -68,11 +111,7 @@ async def update_event(
 
     update_data["updated_at"] = datetime.now(timezone.utc)
 
-    result = await events.find_one_and_update(
-        {"id": event_id},
-        {"$set": update_data},
-        return_document=True,
-    )
+    result = await events.update(event_key(event_id), update_data)
 
     if not result:
         raise HTTPException(
@@ -80,7 +119,15 @@ async def update_event(
             detail="Event not found",
         )
 
-    return EventDetails(**result)
+    publish_counters(result)
+    invalidate_public_event(result["_id"])
+
+    if update_data.get("attendance_enabled") is True:
+        membership_index.warm(decode_id(result["_id"]), result["end_time"])
+    elif update_data.get("attendance_enabled") is False:
+        membership_index.evict(decode_id(result["_id"]))
+
+    return EventDetails(**from_event_doc(result))
 
 @event_router.patch(
     "/{event_id}/publish",
@@ -90,9 +137,9 @@ async def publish_event(
     event_id: str,
     current_user: JWTPayload = Depends(require_role(UserRole.core)),
 ):
-    events = event_collection()
+    events = event_repository()
 
-    event = await events.find_one({"id": event_id})
+    event = await events.get(event_key(event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -130,18 +177,16 @@ async def publish_event(
                 detail="currency is required for paid events",
             )
 
-    result = await events.find_one_and_update(
-        {"id": event_id},
+    result = await events.update(
+        event_key(event_id),
         {
-            "$set": {
-                "status": EventStatus.published,
-                "updated_at": datetime.now(timezone.utc),
-            }
+            "status": EventStatus.published,
+            "updated_at": datetime.now(timezone.utc),
         },
-        return_document=True,
     )
+    invalidate_public_event(result["_id"])
 
-    return EventDetails(**result)
+    return EventDetails(**from_event_doc(result))
 
 @event_router.patch(
     "/{event_id}/cancel",
@@ -151,21 +196,22 @@ async def cancel_event(
     event_id: str,
     current_user: JWTPayload = Depends(require_role(UserRole.core)),
 ):
-    events = event_collection()
+    events = event_repository()
 
-    result = await events.find_one_and_update(
-        {"id": event_id},
-        {"$set": {
+    result = await events.update(
+        event_key(event_id),
+        {
             "status": EventStatus.cancelled,
             "updated_at": datetime.now(timezone.utc),
-        }},
-        return_document=True,
+        },
     )
 
     if not result:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    return EventDetails(**result)
+    invalidate_public_event(result["_id"])
+
+    return EventDetails(**from_event_doc(result))
 
 @event_router.get(
     "/admin/all",
@@ -175,50 +221,121 @@ async def cancel_event(
 async def list_all_events(
     current_user: JWTPayload = Depends(require_role(UserRole.core)),
 ):
-    events = event_collection()
-
-    cursor = events.find().sort("created_at", -1)
-
-    result = []
-    async for event in cursor:
-        result.append(EventDetails(**event))
-
-    return result
+    return [
+        EventDetails(**from_event_doc(event))
+        for event in await event_repository().list_all()
+    ]
 
 @event_router.get(
     "",
     response_model=list[EventResponse],
     description="List all published events"
 )
-async def list_events():
-    events = event_collection()
+async def list_events(request: Request):
+    async def load() -> CompressedBody:
+        events = await event_repository(public_read=True).list_by_status(EventStatus.published)
+        return CompressedBody(EVENT_LIST_ADAPTER.dump_json([
+            EventResponse(**from_event_doc(event)) for event in events
+        ]))
 
-    cursor = events.find(
-        {"status": EventStatus.published}
-    ).sort("start_time", 1)
-
-    result = []
-    async for event in cursor:
-        result.append(EventResponse(**event))
-
-    return result
+    body = await event_response_cache.get(PUBLISHED_EVENTS, load)
+    return body.response(request)
 
 @event_router.get(
     "/{event_id}",
     response_model=EventDetails,
     description="Get event details"
 )
-async def get_event_details(event_id: str):
-    events = event_collection()
+async def get_event_details(event_id: str, request: Request):
+    key = event_key(event_id)
 
-    event = await events.find_one(
-        {"id": event_id, "status": EventStatus.published}
-    )
+    async def load() -> CompressedBody | None:
+        event = await event_repository(public_read=True).get(key, status=EventStatus.published)
+        if not event:
+            return None
+        return CompressedBody(EventDetails(**from_event_doc(event)).model_dump_json().encode())
 
-    if not event:
+    body = await event_response_cache.get(event_details_key(key), load)
+
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found",
+        )
+
+    return body.response(request)
+
+@event_router.get(
+    "/{event_id}/stats",
+    response_model=EventStatsResponse,
+    description="Registration and attendance statistics for an event (core only)"
+)
+async def get_event_stats(
+    event_id: str,
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    key = event_key(event_id)
+
+    stats = await event_stats_collection().find_one({"_id": key})
+
+    if not stats:
+        if not await event_repository().get(key, {"_id": 1}):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found",
+            )
+        stats = {"_id": key}
+
+    for target in DIMENSIONS.values():
+        stats[target] = {
+            unescape_key(k): v for k, v in stats.get(target, {}).items() if v
+        }
+
+    stats["event_id"] = decode_ids(stats)["id"]
+    return EventStatsResponse(**stats)
+
+@event_router.get(
+    "/{event_id}/live",
+    response_class=StreamingResponse,
+    description="""
+    ### Live Counters (Server-Sent Events)
+    Streams `counters` events with `registered_count`, `capacity` and
+    `seats_left` whenever they change, at most a few times per second.
+    Published events only; the stream ends if the event is unpublished.
+    Browsers using EventSource may pass `api_key` and `device_id` as
+    query parameters.
+    """,
+)
+async def stream_event_counters(event_id: str, request: Request):
+    subscription = await subscribe(event_key(event_id))
+
+    if subscription is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found",
         )
 
-    return EventDetails(**event)
\ No newline at end of file
+    broadcaster, queue = subscription
+
+    async def frames():
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": ping\n\n"
+                    continue
+
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            unsubscribe(broadcaster, queue)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
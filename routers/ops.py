@@ -0,0 +1,121 @@
+from fastapi import APIRouter, Depends, Response, status
+
+from core.auth.dependencies import require_role
+from core.ops.admission import admission_snapshot
+from core.ops.health import health_probe
+from core.security.rate_limit import rate_limit_snapshot
+from core.ops.startup import startup_profile
+from db.monitoring import metrics_snapshot
+from db.migrations.migrator import migration_status
+from models.auth.enums import UserRole
+from models.auth.jwt import JWTPayload
+
+ops_router = APIRouter(
+    tags=["Operations"],
+)
+
+# -------------------------------------------------------------------
+# Load balancer probes (no API key, no I/O)
+# -------------------------------------------------------------------
+
+LIVE_BODY = b'{"status":"ok"}'
+
+@ops_router.get(
+    "/healthz",
+    description="""
+    ### Liveness
+    200 while the worker's event loop is serving requests. Does not check
+    dependencies: a failing database should take the worker out of
+    rotation (see /readyz), not restart it.
+    """,
+)
+async def liveness():
+    return Response(content=LIVE_BODY, media_type="application/json")
+
+@ops_router.get(
+    "/readyz",
+    description="""
+    ### Readiness
+    200 when the worker can serve traffic, 503 otherwise, with the result
+    of the last background dependency check (MongoDB ping, ingestion
+    queues, log workers). Answered from cached state.
+    """,
+)
+async def readiness():
+    ready, body = health_probe.readiness()
+    return Response(
+        content=body,
+        media_type="application/json",
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Cache-Control": "no-store"},
+    )
+
+@ops_router.get(
+    "/ops/db-metrics",
+    description="""
+    ### Database Telemetry
+    Connection checkout wait and command latency (count, mean, p50/p95/p99,
+    max) per collection and command, for this worker since it started.
+    """,
+)
+async def get_db_metrics(
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    return metrics_snapshot()
+
+@ops_router.get(
+    "/ops/migrations",
+    description="""
+    ### Schema Migrations
+    Progress of the background schema migrator on this worker: target
+    version, state, documents migrated / written back / skipped, the
+    remaining estimate and throughput.
+    """,
+)
+async def get_migration_status(
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    return migration_status()
+
+@ops_router.get(
+    "/ops/startup",
+    description="""
+    ### Startup Profile
+    How long this worker took to import, run its lifespan startup and start
+    accepting requests, with the timing of each startup phase. Phases that
+    finished after the worker was ready (background index build, lazily
+    initialised clients) are flagged as deferred.
+    """,
+)
+async def get_startup_profile(
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    return startup_profile.report()
+
+@ops_router.get(
+    "/ops/admission",
+    description="""
+    ### Admission Control
+    Per route class (auth_cpu, db_write, public_read) on this worker: limit,
+    requests in flight and queued, and how many were admitted, shed, timed
+    out waiting or preempted by a higher priority request.
+    """,
+)
+async def get_admission_status(
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    return admission_snapshot()
+
+@ops_router.get(
+    "/ops/rate-limits",
+    description="""
+    ### Auth Rate Limits
+    Configured limits per identity (IP, email, device), attempts allowed,
+    attempts refused per endpoint and identity, and the backing store's
+    size and errors.
+    """,
+)
+async def get_rate_limit_status(
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    return rate_limit_snapshot()
@@ -0,0 +1,384 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pymongo.errors import PyMongoError
+
+from db.collections import quiz_collection
+from db.repositories.backend import users_repository
+from db.codec import encode_id, decode_id, try_encode_id
+from core.ops.admission import AdmissionRoute
+from core.auth.jwt import get_current_user
+from core.auth.dependencies import require_role
+from core.quiz.session import QuizSession, get_session, QUIZ_START_DELAY_SECONDS
+from core.quiz.payloads import get_compiled
+from models.auth.enums import UserRole
+from models.auth.jwt import JWTPayload
+
+from models.quiz import (
+    QuizCreateRequest,
+    QuizCreationResponse,
+    QuizAnswerRequest,
+    QuizAnswerResponse,
+    QuizSessionResponse,
+    LeaderboardEntry,
+    LeaderboardResponse,
+    QuizResultsResponse,
+    QuizSessionStatus,
+    AnswerStatus,
+)
+
+quiz_router = APIRouter(
+    prefix="/quizzes",
+    tags=["Quizzes"],
+    route_class=AdmissionRoute,
+)
+
+SSE_HEARTBEAT_SECONDS = 15
+
+def parse_quiz_id(quiz_id: str) -> str:
+    """
+    Canonical form of an API quiz id; malformed ids are not found.
+    """
+    key = try_encode_id(quiz_id)
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    return decode_id(key)
+
+async def require_session(quiz_id: str) -> QuizSession:
+    session = await get_session(parse_quiz_id(quiz_id))
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found or not started",
+        )
+    return session
+
+def session_response(session: QuizSession) -> QuizSessionResponse:
+    now = datetime.now(timezone.utc).timestamp()
+    index = session.question_at(now)
+
+    return QuizSessionResponse(
+        quiz_id=session.quiz_id,
+        status=session.status(now),
+        started_at=datetime.fromtimestamp(session.started_at, tz=timezone.utc),
+        ends_at=datetime.fromtimestamp(session.ends_at, tz=timezone.utc),
+        total_questions=session.total_questions,
+        question_index=index,
+        question_closes_at=(
+            datetime.fromtimestamp(session.closes_at(index), tz=timezone.utc)
+            if index is not None else None
+        ),
+    )
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+@quiz_router.post(
+    "",
+    response_model=QuizCreationResponse,
+    status_code=status.HTTP_201_CREATED,
+    description="Create a new quiz"
+)
+async def create_quiz(
+    payload: QuizCreateRequest,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    creator = await users_repository().get(
+        encode_id(current_user.sub),
+        {"_id": 0, "email": 1},
+    )
+    if not creator:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+
+    quiz_id = str(uuid4())
+    now = datetime.now(timezone.utc)
+
+    await quiz_collection().insert_one({
+        "_id": encode_id(quiz_id),
+        **payload.model_dump(),
+        "created_by": encode_id(current_user.sub),
+        "created_at": now,
+        "version": 1,
+    })
+
+    return QuizCreationResponse(
+        quiz_id=quiz_id,
+        title=payload.title,
+        description=payload.description,
+        created_by=creator["email"],
+        created_at=now,
+        schedule=payload.schedule.model_dump(),
+        settings=payload.settings.model_dump(),
+        total_questions=len(payload.questions),
+    )
+
+@quiz_router.post(
+    "/{quiz_id}/start",
+    response_model=QuizSessionResponse,
+    description=f"""
+    ### Start a Live Session
+    Opens the first question {QUIZ_START_DELAY_SECONDS} seconds from now; each
+    following question opens when the previous one's timer runs out.
+    A quiz can be started once, inside its schedule window.
+    """,
+)
+async def start_quiz(
+    quiz_id: str,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    quiz_id = parse_quiz_id(quiz_id)
+    now = datetime.now(timezone.utc)
+
+    quiz = await quiz_collection().find_one(
+        {"_id": encode_id(quiz_id)},
+        {"schedule": 1, "live": 1},
+    )
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+
+    schedule = quiz["schedule"]
+    if not as_utc(schedule["start_time"]) <= now <= as_utc(schedule["end_time"]):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Quiz is outside its schedule window",
+        )
+
+    result = await quiz_collection().update_one(
+        {"_id": encode_id(quiz_id), "live.started_at": {"$exists": False}},
+        {"$set": {
+            "live.started_at": now + timedelta(seconds=QUIZ_START_DELAY_SECONDS),
+            "live.started_by": encode_id(current_user.sub),
+        }},
+    )
+    if result.modified_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Quiz already started",
+        )
+
+    return session_response(await require_session(quiz_id))
+
+@quiz_router.get(
+    "/{quiz_id}/session",
+    response_model=QuizSessionResponse,
+    description="Current state of a live quiz on the server clock"
+)
+async def get_quiz_session(
+    quiz_id: str,
+    current_user: JWTPayload = Depends(get_current_user),
+):
+    return session_response(await require_session(quiz_id))
+
+@quiz_router.get(
+    "/{quiz_id}/paper",
+    description="""
+    ### Question Paper
+    The caller's questions without answers, in the caller's own order
+    when the quiz shuffles questions or options (stable per participant).
+    While the quiz is live only questions whose slot has opened are
+    included; with shuffled questions, live `question` events carry only
+    the slot and the question is taken from this paper.
+    """,
+)
+async def get_quiz_paper(
+    quiz_id: str,
+    current_user: JWTPayload = Depends(get_current_user),
+):
+    session = await require_session(quiz_id)
+
+    now = datetime.now(timezone.utc).timestamp()
+    if session.status(now) == QuizSessionStatus.scheduled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Quiz has not started yet",
+        )
+
+    compiled = await get_compiled(session.quiz_id)
+    if compiled is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+
+    return Response(
+        content=compiled.render(current_user.sub, through=session.question_at(now)),
+        media_type="application/json",
+    )
+
+@quiz_router.get(
+    "/{quiz_id}/live",
+    response_class=StreamingResponse,
+    description="""
+    ### Live Quiz (Server-Sent Events)
+    Streams `question` (text, options and deadline, without the answer),
+    `reveal` (correct option once the question closes) and `finished`
+    events. Clients joining late receive the current question first.
+    Browsers using EventSource may pass `api_key` and `device_id` as
+    query parameters.
+    """,
+)
+async def stream_quiz(quiz_id: str, request: Request):
+    session = await require_session(quiz_id)
+    queue = session.listen()
+
+    async def frames():
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": ping\n\n"
+                    continue
+
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            session.unsubscribe(queue)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@quiz_router.post(
+    "/{quiz_id}/answers",
+    response_model=QuizAnswerResponse,
+    description="""
+    ### Submit an Answer
+    Accepted only while the question is open (server clock, with a short
+    grace for network delay) and once per participant per question, and
+    only once the answer is saved.
+    """,
+)
+async def submit_answer(
+    quiz_id: str,
+    payload: QuizAnswerRequest,
+    current_user: JWTPayload = Depends(get_current_user),
+):
+    session = await require_session(quiz_id)
+
+    try:
+        answer_status = await session.answer(current_user.sub, payload.question_index, payload.option_id)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many answers in flight, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    except PyMongoError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Answer could not be saved, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    return QuizAnswerResponse(
+        quiz_id=session.quiz_id,
+        question_index=payload.question_index,
+        status=answer_status,
+        accepted=answer_status == AnswerStatus.accepted,
+    )
+
+@quiz_router.get(
+    "/{quiz_id}/leaderboard",
+    response_model=LeaderboardResponse,
+    description="""
+    ### Leaderboard
+    Top participants and the caller's own rank, as of the last question
+    whose answers have settled (shortly after it closes). Ranked by
+    correct answers, then by total time taken on correct answers.
+    """,
+)
+async def get_leaderboard(
+    quiz_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    current_user: JWTPayload = Depends(get_current_user),
+):
+    session = await require_session(quiz_id)
+
+    # no-op when current; restores the board on a freshly loaded worker
+    leaderboard = session.leaderboard
+    await leaderboard.catch_up(session.settled_through(datetime.now(timezone.utc).timestamp()))
+
+    board = leaderboard.board
+    me = board.entry(current_user.sub)
+
+    return LeaderboardResponse(
+        quiz_id=session.quiz_id,
+        question_index=leaderboard.applied_through if leaderboard.applied_through >= 0 else None,
+        participants=len(board),
+        top=[
+            LeaderboardEntry(rank=rank, user_id=user_id, score=score, latency_ms=latency_ms)
+            for rank, user_id, score, latency_ms in board.top(limit)
+        ],
+        me=(
+            LeaderboardEntry(rank=me[0], user_id=current_user.sub, score=me[1], latency_ms=me[2])
+            if me else None
+        ),
+    )
+
+@quiz_router.post(
+    "/{quiz_id}/score",
+    response_model=QuizResultsResponse,
+    description="""
+    ### Score a Quiz
+    Scores every participant once the quiz has finished and its answers
+    have settled: score, pass/fail against `passing_score_percentage`
+    and rank per participant, plus per-question difficulty,
+    discrimination and option distribution. Safe to re-run.
+    """,
+)
+async def score_finished_quiz(
+    quiz_id: str,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    session = await require_session(quiz_id)
+
+    now = datetime.now(timezone.utc).timestamp()
+    if session.settled_through(now) < session.total_questions - 1:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Quiz is still running",
+        )
+
+    # scoring pulls in numpy: imported on first use, not at startup
+    from core.quiz.scoring import score_quiz
+
+    summary = await score_quiz(session.quiz_id)
+    return QuizResultsResponse(quiz_id=session.quiz_id, **summary)
+
+@quiz_router.get(
+    "/{quiz_id}/results",
+    response_model=QuizResultsResponse,
+    description="Stored results of a scored quiz"
+)
+async def get_quiz_results(
+    quiz_id: str,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    quiz_id = parse_quiz_id(quiz_id)
+    quiz = await quiz_collection().find_one({"_id": encode_id(quiz_id)}, {"results": 1})
+
+    if not quiz or "results" not in quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found or not scored yet",
+        )
+
+    return QuizResultsResponse(quiz_id=quiz_id, **quiz["results"])
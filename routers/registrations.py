@@ -1,11 +1,25 @@
 
-from fastapi import APIRouter, HTTPException, status, Depends
+import asyncio
+import csv
+import io
+import json
+
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timezone
-from uuid import uuid4
-from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from db.collections import registration_collection
+from db.repositories.backend import registrations_repository, users_repository, event_repository
+from db.codec import encode_id, decode_id, try_encode_id
+from core.ops.admission import AdmissionRoute
 from core.auth.dependencies import require_role
+from core.bulk.rows import iter_rows, chunked
+from core.registrations.ingest import registration_ingestor
+from core.events.stats import record_registrations, PROFILE_PROJECTION
+from core.events.live import update_registered_count
+from core.attendance.passes import issue_pass, pass_expires_at
+from core.attendance.membership import membership_index
+from core.logging.audit import audit_log
 from models.auth.enums import UserRole
 from models.auth.jwt import JWTPayload
 
@@ -16,19 +30,53 @@ from models.registrations import (
     RegistrationResponse,
     RegistrationStatusResponse,
     RegistrationCancellationResponse,
+    RegistrationImportRow,
+    RegistrationImportReport,
+    ImportRowStatus,
+    EntryPassResponse,
 )
 
 registrations_router = APIRouter(
     prefix="/registrations",
     tags=["Registrations"],
+    route_class=AdmissionRoute,
 )
 
+IMPORT_CHUNK_SIZE = 500
+ROSTER_CHUNK_SIZE = 500
+ROSTER_FIELDS = ["university_uid", "first_name", "last_name", "email", "registered_at"]
+
 def get_registrations():
-    return registration_collection()
+    return registrations_repository()
 
 def require_logged_in():
     return Depends(require_role())
 
+def parse_event_id(event_id: str):
+    key = try_encode_id(event_id)
+    if key is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return key
+
+async def current_university_uid(current_user: JWTPayload) -> str:
+    """
+    The access token only carries the user id, so resolve the caller's
+    university UID from their profile.
+    """
+    user = await users_repository().get(
+        encode_id(current_user.sub),
+        {"university_uid": 1},
+    )
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user["university_uid"]
+
+async def require_event(event_id: str):
+    key = parse_event_id(event_id)
+    if not await event_repository().get(key, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Event not found")
+    return key
+
 @registrations_router.post(
     "",
     response_model=RegistrationResponse,
@@ -36,28 +84,41 @@ def require_logged_in():
 )
 async def register_for_event(
     payload: EventRegistrationRequest,
+    background_tasks: BackgroundTasks,
     current_user: JWTPayload = Depends(require_role()),
 ):
     registrations = get_registrations()
     now = datetime.now(timezone.utc)
 
-    event_id = ObjectId(payload.event_id)
-
-    existing = await registrations.find_one({
-        "event_id": event_id,
-        "university_uid": payload.university_uid,
-    })
-    if existing:
-        raise HTTPException(status_code=400, detail="Already registered for this event.")
+    event_id = await require_event(payload.event_id)
 
     reg_doc = {
         "event_id": event_id,
         "university_uid": payload.university_uid,
         "registered_at": now,
     }
-    await registrations.insert_one(reg_doc)
+
+    # the unique (event_id, university_uid) index rejects repeats, so
+    # no registration lookup round trip is needed
+    try:
+        if registration_ingestor.running:
+            await registration_ingestor.submit(reg_doc)
+        else:
+            await registrations.insert(reg_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already registered for this event.")
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Registrations are busy, please retry.",
+            headers={"Retry-After": "1"},
+        )
+
+    membership_index.add(decode_id(event_id), [payload.university_uid])
+    background_tasks.add_task(update_registered_count, event_id, 1)
+    background_tasks.add_task(record_registrations, event_id, [payload.university_uid], 1)
     return RegistrationResponse(
-        event_id=reg_doc["event_id"],
+        event_id=decode_id(reg_doc["event_id"]),
         university_uid=reg_doc["university_uid"],
         registered_at=reg_doc["registered_at"],
     )
@@ -71,14 +132,14 @@ async def check_registration_status(
     current_user: JWTPayload = Depends(require_role()),
 ):
     registrations = get_registrations()
-    event_id = ObjectId(payload.event_id)
-    reg = await registrations.find_one({
-        "event_id": event_id,
-        "university_uid": current_user.university_uid,
-    })
+    event_id = parse_event_id(payload.event_id)
+    is_registered = await registrations.exists(
+        event_id,
+        await current_university_uid(current_user),
+    )
     return RegistrationStatusResponse(
-        event_id=event_id,
-        is_registered=bool(reg),
+        event_id=decode_id(event_id),
+        is_registered=is_registered,
     )
 
 @registrations_router.delete(
@@ -87,16 +148,235 @@ async def check_registration_status(
 )
 async def cancel_registration(
     payload: EventRegistrationCancellation,
+    background_tasks: BackgroundTasks,
     current_user: JWTPayload = Depends(require_role()),
 ):
     registrations = get_registrations()
-    event_id = ObjectId(payload.event_id)
-    result = await registrations.delete_one({
-        "event_id": event_id,
-        "university_uid": current_user.university_uid,
-    })
-    cancelled = result.deleted_count > 0
+    event_id = parse_event_id(payload.event_id)
+    university_uid = await current_university_uid(current_user)
+    cancelled = await registrations.delete(event_id, university_uid)
+    if cancelled:
+        membership_index.discard(decode_id(event_id), university_uid)
+        background_tasks.add_task(update_registered_count, event_id, -1)
+        background_tasks.add_task(record_registrations, event_id, [university_uid], -1)
     return RegistrationCancellationResponse(
-        event_id=event_id,
+        event_id=decode_id(event_id),
         cancelled=cancelled
-    )
\ No newline at end of file
+    )
+
+# -------------------------------------------------------------------
+# BULK IMPORT
+# -------------------------------------------------------------------
+
+@registrations_router.post(
+    "/{event_id}/import",
+    response_model=RegistrationImportReport,
+    description="""
+    ### Bulk Registration Import
+    Streams a CSV (with a `university_uid` header) or NDJSON upload of
+    `{"university_uid": ...}` rows and registers every known user.
+    - Rows are validated against `users` in chunks.
+    - Returns a per-row report; existing registrations are reported, not duplicated.
+    """,
+)
+@audit_log(action="REGISTRATION_IMPORT")
+async def import_registrations(
+    event_id: str,
+    request: Request,
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    event_key = await require_event(event_id)
+    registrations = get_registrations()
+    users = users_repository()
+    now = datetime.now(timezone.utc)
+
+    report: list[RegistrationImportRow] = []
+    seen: set[str] = set()
+    total = registered = 0
+
+    async for chunk in chunked(iter_rows(request), IMPORT_CHUNK_SIZE):
+        total += len(chunk)
+        outcomes: dict[int, tuple[str | None, ImportRowStatus]] = {}
+        pending: dict[int, str] = {}
+
+        for row_number, row in chunk:
+            uid = str((row or {}).get("university_uid") or "").strip()
+
+            if not uid:
+                outcomes[row_number] = (None, ImportRowStatus.invalid_row)
+            elif uid in seen:
+                outcomes[row_number] = (uid, ImportRowStatus.duplicate_row)
+            else:
+                seen.add(uid)
+                pending[row_number] = uid
+
+        known: dict[str, dict] = {}
+        if pending:
+            known = {
+                doc["university_uid"]: doc
+                for doc in await users.find_by_university_uids(list(pending.values()), PROFILE_PROJECTION)
+            }
+
+        to_insert = []
+        for row_number, uid in pending.items():
+            if uid in known:
+                to_insert.append((row_number, uid))
+            else:
+                outcomes[row_number] = (uid, ImportRowStatus.unknown_user)
+
+        if to_insert:
+            write_errors: dict[int, int] = {}
+            try:
+                await registrations.insert_many([
+                    {"event_id": event_key, "university_uid": uid, "registered_at": now}
+                    for _, uid in to_insert
+                ])
+            except BulkWriteError as exc:
+                write_errors = {
+                    error["index"]: error["code"]
+                    for error in exc.details.get("writeErrors", [])
+                }
+
+            inserted = []
+            for index, (row_number, uid) in enumerate(to_insert):
+                code = write_errors.get(index)
+                if code is None:
+                    outcomes[row_number] = (uid, ImportRowStatus.registered)
+                    inserted.append(uid)
+                elif code == 11000:
+                    outcomes[row_number] = (uid, ImportRowStatus.already_registered)
+                else:
+                    outcomes[row_number] = (uid, ImportRowStatus.failed)
+
+            registered += len(inserted)
+            membership_index.add(decode_id(event_key), inserted)
+            await update_registered_count(event_key, len(inserted))
+            await record_registrations(event_key, inserted, 1, profiles=known)
+
+        for row_number in sorted(outcomes):
+            uid, row_status = outcomes[row_number]
+            report.append(
+                RegistrationImportRow(row=row_number, university_uid=uid, status=row_status)
+            )
+
+    return RegistrationImportReport(
+        event_id=decode_id(event_key),
+        total_rows=total,
+        registered=registered,
+        rows=report,
+    )
+
+# -------------------------------------------------------------------
+# ROSTER EXPORT
+# -------------------------------------------------------------------
+
+async def roster_lines(event_key, fmt: str):
+    registrations = get_registrations()
+    users = users_repository()
+
+    if fmt == "csv":
+        yield ",".join(ROSTER_FIELDS) + "\n"
+
+    cursor = registrations.for_event(
+        event_key,
+        {"_id": 0, "university_uid": 1, "registered_at": 1},
+        batch_size=ROSTER_CHUNK_SIZE,
+    )
+
+    async for chunk in chunked(cursor, ROSTER_CHUNK_SIZE):
+        # one users query per chunk instead of one per registrant
+        profiles = {
+            doc["university_uid"]: doc
+            for doc in await users.find_by_university_uids(
+                [reg["university_uid"] for reg in chunk],
+                {"_id": 0, "university_uid": 1, "first_name": 1, "last_name": 1, "email": 1},
+            )
+        }
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n") if fmt == "csv" else None
+
+        for reg in chunk:
+            profile = profiles.get(reg["university_uid"], {})
+            record = {
+                "university_uid": reg["university_uid"],
+                "first_name": profile.get("first_name"),
+                "last_name": profile.get("last_name"),
+                "email": profile.get("email"),
+                "registered_at": reg["registered_at"].isoformat(),
+            }
+
+            if writer:
+                writer.writerow([record[field] or "" for field in ROSTER_FIELDS])
+            else:
+                buffer.write(json.dumps(record) + "\n")
+
+        yield buffer.getvalue()
+
+@registrations_router.get(
+    "/{event_id}/roster",
+    description="""
+    ### Roster Export
+    Streams every registration for the event joined with the registrant's
+    name and email, as NDJSON (default) or CSV.
+    """,
+)
+async def export_roster(
+    event_id: str,
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(csv|ndjson)$"),
+    current_user: JWTPayload = Depends(require_role(UserRole.manager, UserRole.core)),
+):
+    event_key = await require_event(event_id)
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+    return StreamingResponse(
+        roster_lines(event_key, fmt),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="roster-{decode_id(event_key)}.{fmt}"',
+        },
+    )
+
+# -------------------------------------------------------------------
+# ENTRY PASS
+# -------------------------------------------------------------------
+
+@registrations_router.get(
+    "/{event_id}/pass",
+    response_model=EntryPassResponse,
+    description="""
+    ### Entry Pass
+    Issues the caller's signed entry pass for an event they are registered for.
+    Gate devices verify it offline with the key from `GET /attendance/passes/key`.
+    """,
+)
+async def get_entry_pass(
+    event_id: str,
+    current_user: JWTPayload = Depends(require_role()),
+):
+    key = parse_event_id(event_id)
+    university_uid = await current_university_uid(current_user)
+
+    event = await event_repository().get(key, {"end_time": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    if not await get_registrations().exists(key, university_uid):
+        raise HTTPException(status_code=403, detail="Not registered for this event.")
+
+    expires_at = pass_expires_at(event["end_time"])
+
+    try:
+        token = issue_pass(decode_id(key), university_uid, expires_at)
+    except RuntimeError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Entry passes are not configured",
+        )
+
+    return EntryPassResponse(
+        event_id=decode_id(key),
+        university_uid=university_uid,
+        expires_at=expires_at,
+        token=token,
+    )
@@ -0,0 +1,362 @@
+import asyncio
+import base64
+import json
+import re
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Query
+from pydantic import ValidationError
+from pymongo import ASCENDING
+from pymongo.collation import Collation, CollationStrength
+from pymongo.errors import BulkWriteError
+
+from db.collections import users_collection
+from db.repositories.backend import users_repository
+from db.migrations.schema import current_version, on_read, versioned_projection
+from db.codec import encode_id, try_encode_id
+from core.ops.admission import AdmissionRoute
+from core.auth.jwt import get_current_user
+from core.auth.dependencies import require_role
+from core.auth.passwords import hash_passwords_parallel
+from core.bulk.rows import iter_rows, chunked
+from core.logging.audit import audit_log
+from core.users.imports import import_lease
+from core.users.profiles import USER_RESPONSE_PROJECTION, profile_cache, to_user_response
+from models.auth.enums import UserRole
+from models.auth.jwt import JWTPayload
+from models.auth.requests import UserRegisterRequest
+
+from models.user import (
+    UserDB,
+    AuthProvider,
+    UserImportRow,
+    UserImportReport,
+    UserImportRowStatus,
+    UserResponse,
+    UserUpdateRequest,
+    UserSearchField,
+    UserDirectoryResponse,
+)
+
+users_router = APIRouter(
+    prefix="/users",
+    tags=["Users"],
+    route_class=AdmissionRoute,
+)
+
+USER_IMPORT_CHUNK_SIZE = 500
+
+# names sort and match case-insensitively, backed by indexes with the same collation
+NAME_COLLATION = Collation(locale="en", strength=CollationStrength.SECONDARY)
+NAME_FIELDS = {UserSearchField.first_name, UserSearchField.last_name}
+
+# one import at a time: each one already saturates the hashing pool.
+# The lock only covers this worker; import_lease covers every worker.
+_import_lock = asyncio.Lock()
+
+def clean_row(row: dict) -> dict:
+    # CSV cells are always strings: treat blanks as missing
+    return {key: value for key, value in row.items() if key and value not in ("", None)}
+
+def duplicate_key_status(error: dict) -> UserImportRowStatus:
+    fields = error.get("keyPattern") or error.get("keyValue") or {}
+    if "university_uid" in fields:
+        return UserImportRowStatus.university_uid_taken
+    return UserImportRowStatus.email_taken
+
+def encode_cursor(value: str, user_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, user_id]).encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[str, object]:
+    try:
+        value, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        key = try_encode_id(user_id)
+        if not isinstance(value, str) or key is None:
+            raise ValueError
+        return value, key
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+# -------------------------------------------------------------------
+# PROFILE
+# -------------------------------------------------------------------
+
+@users_router.get(
+    "/me",
+    response_model=UserResponse,
+    description="The signed-in user's profile"
+)
+async def get_my_profile(
+    current_user: JWTPayload = Depends(get_current_user),
+):
+    profile = profile_cache.get(current_user.sub)
+    if profile:
+        return profile
+
+    doc = await users_repository().get(
+        encode_id(current_user.sub),
+        USER_RESPONSE_PROJECTION,
+    )
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    profile = to_user_response(doc)
+    profile_cache.put(current_user.sub, profile)
+    return profile
+
+@users_router.patch(
+    "/me",
+    response_model=UserResponse,
+    description="Update the signed-in user's profile"
+)
+async def update_my_profile(
+    payload: UserUpdateRequest,
+    current_user: JWTPayload = Depends(get_current_user),
+):
+    update_data = payload.model_dump(exclude_unset=True)
+
+    if not update_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields provided for update",
+        )
+
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    profile_cache.invalidate(current_user.sub)
+
+    doc = await users_repository().update(
+        encode_id(current_user.sub),
+        update_data,
+        USER_RESPONSE_PROJECTION,
+    )
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    profile = to_user_response(doc)
+    profile_cache.put(current_user.sub, profile)
+    return profile
+
+# -------------------------------------------------------------------
+# DIRECTORY
+# -------------------------------------------------------------------
+
+@users_router.get(
+    "",
+    response_model=UserDirectoryResponse,
+    description="""
+    ### User Directory
+    Lists users ordered by `field`, optionally filtered to values starting
+    with `q` (case-insensitive for names and email). Pages are keyset
+    based: pass the returned `next_cursor` as `after`.
+    """,
+)
+async def list_users(
+    field: UserSearchField = UserSearchField.email,
+    q: str | None = Query(default=None, min_length=1, max_length=100),
+    after: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    name = field.value
+    collation = NAME_COLLATION if field in NAME_FIELDS else None
+    conditions = []
+
+    if q:
+        if field == UserSearchField.email:
+            q = q.lower()
+        if collation:
+            # prefix as a range so the collated index is used
+            conditions.append({name: {"$gte": q, "$lt": q + "\uffff"}})
+        else:
+            conditions.append({name: {"$regex": f"^{re.escape(q)}"}})
+
+    if after:
+        value, last_id = decode_cursor(after)
+        if collation:
+            # names are not unique: break ties on _id
+            conditions.append({"$or": [
+                {name: {"$gt": value}},
+                {name: value, "_id": {"$gt": last_id}},
+            ]})
+        else:
+            conditions.append({name: {"$gt": value}})
+
+    query = {"$and": conditions} if conditions else {}
+    sort = [(name, ASCENDING), ("_id", ASCENDING)] if collation else [(name, ASCENDING)]
+
+    docs = await users_collection().find(
+        query,
+        versioned_projection("users", USER_RESPONSE_PROJECTION),
+        sort=sort,
+        limit=limit + 1,
+        collation=collation,
+    ).to_list(length=limit + 1)
+
+    items = [
+        to_user_response(on_read("users", doc, USER_RESPONSE_PROJECTION))
+        for doc in docs[:limit]
+    ]
+    next_cursor = None
+    if len(docs) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, name), last.id)
+
+    return UserDirectoryResponse(items=items, next_cursor=next_cursor)
+
+# -------------------------------------------------------------------
+# BULK IMPORT
+# -------------------------------------------------------------------
+
+@users_router.post(
+    "/import",
+    response_model=UserImportReport,
+    description="""
+    ### Bulk User Import
+    Streams a CSV (header row with the registration fields, including
+    `password`) or NDJSON upload and creates a local account per row.
+    - Rows are validated like `POST /auth/register`.
+    - Rows whose email or university ID is already taken are reported
+      without hashing their password.
+    - Passwords are hashed across a process pool, off the event loop.
+    - Returns a per-row report.
+    """,
+)
+@audit_log(action="USER_IMPORT")
+async def import_users(
+    request: Request,
+    current_user: JWTPayload = Depends(require_role(UserRole.core)),
+):
+    if _import_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another user import is running",
+        )
+
+    async with _import_lock, import_lease():
+        users = users_collection()
+        report: list[UserImportRow] = []
+        seen_emails: set[str] = set()
+        seen_uids: set[str] = set()
+        total = created = 0
+
+        async for chunk in chunked(iter_rows(request), USER_IMPORT_CHUNK_SIZE):
+            total += len(chunk)
+            outcomes: dict[int, UserImportRow] = {}
+            pending: dict[int, UserRegisterRequest] = {}
+
+            for row_number, row in chunk:
+                if row is None:
+                    outcomes[row_number] = UserImportRow(row=row_number, status=UserImportRowStatus.invalid_row)
+                    continue
+
+                try:
+                    payload = UserRegisterRequest(**clean_row(row))
+                except ValidationError as exc:
+                    outcomes[row_number] = UserImportRow(
+                        row=row_number,
+                        email=row.get("email"),
+                        status=UserImportRowStatus.invalid_row,
+                        detail="; ".join(
+                            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                            for error in exc.errors()
+                        ),
+                    )
+                    continue
+
+                payload.email = payload.email.lower().strip()
+
+                if payload.email in seen_emails or payload.university_uid in seen_uids:
+                    outcomes[row_number] = UserImportRow(
+                        row=row_number,
+                        email=payload.email,
+                        status=UserImportRowStatus.duplicate_row,
+                    )
+                    continue
+
+                seen_emails.add(payload.email)
+                seen_uids.add(payload.university_uid)
+                pending[row_number] = payload
+
+            # skip the expensive hash for rows that would conflict anyway
+            if pending:
+                cursor = users.find(
+                    {"$or": [
+                        {"email": {"$in": [p.email for p in pending.values()]}},
+                        {"university_uid": {"$in": [p.university_uid for p in pending.values()]}},
+                    ]},
+                    {"_id": 0, "email": 1, "university_uid": 1},
+                )
+                existing = [doc async for doc in cursor]
+                taken_emails = {doc["email"] for doc in existing}
+                taken_uids = {doc["university_uid"] for doc in existing}
+
+                for row_number, payload in list(pending.items()):
+                    if payload.email in taken_emails:
+                        row_status = UserImportRowStatus.email_taken
+                    elif payload.university_uid in taken_uids:
+                        row_status = UserImportRowStatus.university_uid_taken
+                    else:
+                        continue
+
+                    del pending[row_number]
+                    outcomes[row_number] = UserImportRow(row=row_number, email=payload.email, status=row_status)
+
+            if pending:
+                rows = list(pending.items())
+                hashes = await hash_passwords_parallel([payload.password for _, payload in rows])
+                now = datetime.now(timezone.utc)
+
+                docs = []
+                for (_, payload), password_hash in zip(rows, hashes):
+                    user = UserDB(
+                        id=str(uuid4()),
+                        **payload.model_dump(exclude={"password", "device_id"}),
+                        password_hash=password_hash,
+
+                        role=UserRole.attendee,
+                        auth_provider=AuthProvider.local,
+                        provider_id=None,
+
+                        email_verified=False,
+                        schema_version=current_version("users"),
+                        created_at=now,
+                        updated_at=now,
+                    )
+                    doc = user.model_dump()
+                    doc["_id"] = encode_id(doc.pop("id"))
+                    docs.append(doc)
+
+                write_errors: dict[int, dict] = {}
+                try:
+                    await users.insert_many(docs, ordered=False)
+                except BulkWriteError as exc:
+                    write_errors = {
+                        error["index"]: error
+                        for error in exc.details.get("writeErrors", [])
+                    }
+
+                for index, (row_number, payload) in enumerate(rows):
+                    error = write_errors.get(index)
+                    if error is None:
+                        row_status = UserImportRowStatus.created
+                        created += 1
+                    elif error["code"] == 11000:
+                        row_status = duplicate_key_status(error)
+                    else:
+                        row_status = UserImportRowStatus.failed
+
+                    outcomes[row_number] = UserImportRow(row=row_number, email=payload.email, status=row_status)
+
+            report.extend(outcomes[row_number] for row_number in sorted(outcomes))
+
+        return UserImportReport(total_rows=total, created=created, rows=report)
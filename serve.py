@@ -0,0 +1,76 @@
+"""
+Production entry point.
+
+    python serve.py
+
+Runs `main:app` under uvicorn with:
+    - WEB_CONCURRENCY worker processes (default: one per core)
+    - uvloop and httptools when installed (`uvicorn[standard]`),
+      falling back to asyncio and h11
+    - a listen backlog and keep-alive sized for a load balancer in
+      front (keep-alive outlives the balancer's idle timeout, so the
+      balancer, not the app, closes idle connections)
+    - graceful shutdown: on SIGTERM each worker stops accepting, lets
+      in-flight requests finish for up to SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+      then runs the lifespan shutdown (ingestion flush, log drain, Mongo)
+
+Each worker runs the lifespan; index creation happens once per
+deployment (see db/indexes.py ensure_indexes).
+"""
+
+import importlib.util
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "5000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "75"))
+SERVER_GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+SERVER_FORWARDED_ALLOW_IPS = os.getenv("SERVER_FORWARDED_ALLOW_IPS", "127.0.0.1")
+SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "false").lower() == "true"
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def worker_count() -> int:
+    # in-memory repositories are per process: workers would not share state
+    if os.getenv("REPOSITORY_BACKEND", "mongo").lower() == "memory" and WEB_CONCURRENCY > 1:
+        print("REPOSITORY_BACKEND=memory: running a single worker")
+        return 1
+    return max(WEB_CONCURRENCY, 1)
+
+
+def main() -> None:
+    loop = "uvloop" if installed("uvloop") else "asyncio"
+    http = "httptools" if installed("httptools") else "h11"
+    workers = worker_count()
+
+    print(f"Starting {workers} worker(s) on {HOST}:{PORT} (loop={loop}, http={http})")
+
+    uvicorn.run(
+        "main:app",
+        host=HOST,
+        port=PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips=SERVER_FORWARDED_ALLOW_IPS,
+        access_log=SERVER_ACCESS_LOG,
+        server_header=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# settings the application modules read at import time; nothing here
+# connects to MongoDB (tests run against the in-memory repositories)
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "horizon_test")
+os.environ.setdefault("CLIENT_API_KEY", "test-api-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.repositories.backend import use_backend
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def repositories():
+    """
+    A fresh set of in-memory repositories, switched back to the
+    configured backend afterwards.
+    """
+    from db.repositories import backend
+
+    previous = backend._REPOSITORIES
+    yield use_backend("memory")
+    backend._REPOSITORIES = previous
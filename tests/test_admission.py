@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from core.ops.admission import AdmissionLimiter, Overloaded
+
+pytestmark = pytest.mark.anyio
+
+
+def limiter(limit: int = 1, queue: int = 1, wait_ms: int = 1000) -> AdmissionLimiter:
+    return AdmissionLimiter("test", limit=limit, queue=queue, wait_ms=wait_ms, retry_after=1)
+
+
+async def settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_admits_up_to_the_limit_then_queues():
+    admission = limiter(limit=2, queue=1)
+    await admission.acquire()
+    await admission.acquire()
+
+    waiter = asyncio.create_task(admission.acquire())
+    await settle()
+    assert not waiter.done()
+    assert admission.status()["queued"] == 1
+
+    admission.release()
+    await waiter
+    # the slot was handed over, not freed and retaken
+    assert admission.in_flight == 2
+    assert admission.admitted == 3
+
+
+async def test_sheds_when_the_queue_is_full():
+    admission = limiter(limit=1, queue=1)
+    await admission.acquire()
+    waiter = asyncio.create_task(admission.acquire())
+    await settle()
+
+    with pytest.raises(Overloaded):
+        await admission.acquire()
+
+    assert admission.shed == 1
+    admission.release()
+    await waiter
+
+
+async def test_priority_request_preempts_the_newest_lower_priority_waiter():
+    admission = limiter(limit=1, queue=2)
+    await admission.acquire()
+
+    older = asyncio.create_task(admission.acquire(priority=1))
+    await settle()
+    newer = asyncio.create_task(admission.acquire(priority=1))
+    await settle()
+    refresh = asyncio.create_task(admission.acquire(priority=0))
+    await settle()
+
+    with pytest.raises(Overloaded):
+        await newer
+    assert admission.preempted == 1
+
+    # the priority request is admitted first, then the older waiter
+    admission.release()
+    await refresh
+    assert not older.done()
+
+    admission.release()
+    await older
+
+
+async def test_priority_request_is_shed_when_nothing_can_be_preempted():
+    admission = limiter(limit=1, queue=1)
+    await admission.acquire()
+    waiter = asyncio.create_task(admission.acquire(priority=0))
+    await settle()
+
+    with pytest.raises(Overloaded):
+        await admission.acquire(priority=0)
+
+    admission.release()
+    await waiter
+
+
+async def test_waiter_times_out():
+    admission = limiter(limit=1, queue=1, wait_ms=20)
+    await admission.acquire()
+
+    with pytest.raises(Overloaded):
+        await admission.acquire()
+
+    assert admission.timed_out == 1
+    assert admission.status()["queued"] == 0
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    admission = limiter(limit=1, queue=1)
+    await admission.acquire()
+    waiter = asyncio.create_task(admission.acquire())
+    await settle()
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert admission.status()["queued"] == 0
+    admission.release()
+    assert admission.in_flight == 0
+
+
+async def test_cancelled_after_handover_gives_the_slot_back():
+    admission = limiter(limit=1, queue=1)
+    await admission.acquire()
+    waiter = asyncio.create_task(admission.acquire())
+    await settle()
+
+    # handed the slot, then cancelled before it could run
+    admission.release()
+    waiter.cancel()
+    try:
+        await waiter
+    except asyncio.CancelledError:
+        pass
+    else:
+        # wait_for may still return the result: the caller then holds
+        # the slot and releases it as usual
+        admission.release()
+
+    assert admission.in_flight == 0
+    assert admission.status()["queued"] == 0
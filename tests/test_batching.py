@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError, DuplicateKeyError, WriteError
+
+from db.batching import BatchWriter
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeWriter(BatchWriter):
+    """
+    Unique on `k`. `outages` whole-batch failures come first; `rejected`
+    keys fail with a non-duplicate write error on every attempt.
+    """
+
+    def __init__(self, outages: int = 0, rejected: set = frozenset(), land_on_outage: bool = False, attempts: int = 3):
+        super().__init__(max_queue=100, flush_interval_ms=1, max_batch=100, attempts=attempts, backoff_ms=1)
+        self.outages = outages
+        self.rejected = rejected
+        self.land_on_outage = land_on_outage
+        self.stored: dict = {}
+        self.calls: list[list] = []
+
+    def _store(self, docs):
+        errors = []
+        for index, doc in enumerate(docs):
+            if doc["k"] in self.rejected:
+                errors.append({"index": index, "code": 121, "errmsg": "validation"})
+            elif doc["k"] in self.stored:
+                errors.append({"index": index, "code": 11000, "errmsg": "duplicate"})
+            else:
+                self.stored[doc["k"]] = doc
+        return errors
+
+    async def _insert(self, docs):
+        self.calls.append([doc["k"] for doc in docs])
+        if self.outages:
+            self.outages -= 1
+            if self.land_on_outage:
+                self._store(docs)
+            raise AutoReconnect("primary stepped down")
+
+        errors = self._store(docs)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": []})
+
+
+async def submit_all(writer: BatchWriter, keys) -> list:
+    writer.start()
+    try:
+        return await asyncio.gather(*(writer.submit({"k": k}) for k in keys), return_exceptions=True)
+    finally:
+        await writer.stop()
+
+
+async def test_batches_concurrent_submits():
+    writer = FakeWriter()
+
+    assert await submit_all(writer, range(10)) == [None] * 10
+    assert writer.calls == [list(range(10))]
+
+
+async def test_duplicates_are_reported_and_not_retried():
+    writer = FakeWriter()
+    writer.stored["a"] = {"k": "a"}
+
+    results = await submit_all(writer, ["a", "b"])
+
+    assert isinstance(results[0], DuplicateKeyError)
+    assert results[1] is None
+    assert len(writer.calls) == 1
+
+
+async def test_outage_is_retried_until_written():
+    writer = FakeWriter(outages=2)
+
+    assert await submit_all(writer, ["a", "b"]) == [None, None]
+    assert writer.calls == [["a", "b"]] * 3
+    assert set(writer.stored) == {"a", "b"}
+    assert writer.retried == 4
+
+
+async def test_write_that_landed_before_the_error_counts_as_written():
+    writer = FakeWriter(outages=1, land_on_outage=True)
+
+    assert await submit_all(writer, ["a"]) == [None]
+    assert len(writer.calls) == 2
+
+
+async def test_only_failed_documents_are_retried():
+    writer = FakeWriter(rejected={"b"})
+
+    results = await submit_all(writer, ["a", "b", "c"])
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], WriteError)
+    assert writer.calls == [["a", "b", "c"], ["b"], ["b"]]
+    assert writer.failed == 1
+
+
+async def test_outage_longer_than_the_attempts_fails_every_submitter():
+    writer = FakeWriter(outages=5)
+
+    results = await submit_all(writer, ["a", "b"])
+
+    assert all(isinstance(result, AutoReconnect) for result in results)
+    assert writer.failed == 2 and writer.stored == {}
+
+
+async def test_stop_writes_what_is_queued():
+    writer = FakeWriter(outages=1)
+    writer.start()
+    pending = [asyncio.ensure_future(writer.submit({"k": k})) for k in "abc"]
+    await asyncio.sleep(0)
+
+    await writer.stop()
+
+    assert [task.result() for task in pending] == [None] * 3
+    assert set(writer.stored) == set("abc")
@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from core.events.cache import EventResponseCache
+from core.http.compression import CompressedBody, CompressionMiddleware, choose_encoding
+
+pytestmark = pytest.mark.anyio
+
+LARGE = {"items": [{"id": i, "title": "event title"} for i in range(200)]}
+
+
+async def large(request):
+    return JSONResponse(LARGE)
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def stream(request):
+    async def chunks():
+        yield b"data: 1\n\n"
+        yield b"data: 2\n\n"
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+async def precompressed(request):
+    return CompressedBody(json.dumps(LARGE).encode()).response(request)
+
+
+app = CompressionMiddleware(Starlette(routes=[
+    Route("/large", large),
+    Route("/small", small),
+    Route("/stream", stream),
+    Route("/auth/large", large),
+    Route("/cached", precompressed),
+]))
+
+
+async def get(path: str, accept_encoding: str = "gzip") -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("*", "gzip"),
+        ("gzip;q=0, *", None),
+        ("deflate", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+async def test_large_json_is_gzipped():
+    response = await get("/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(json.dumps(LARGE))
+    assert response.json() == LARGE
+
+
+async def test_small_and_unaccepted_bodies_are_not_compressed():
+    assert "content-encoding" not in (await get("/small")).headers
+    assert "content-encoding" not in (await get("/large", accept_encoding="identity")).headers
+
+
+async def test_auth_and_streamed_responses_pass_through():
+    assert "content-encoding" not in (await get("/auth/large")).headers
+
+    response = await get("/stream")
+    assert "content-encoding" not in response.headers
+    assert response.text == "data: 1\n\ndata: 2\n\n"
+
+
+async def test_precompressed_body_is_not_compressed_twice():
+    response = await get("/cached")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == LARGE
+
+
+async def test_compressed_body_reuses_variants_for_the_same_content():
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    first = CompressedBody(json.dumps(LARGE).encode())
+    first.response(Request(scope))
+
+    same = CompressedBody(first.body)
+    same.adopt(first)
+    changed = CompressedBody(b"{}")
+    changed.adopt(first)
+
+    assert same._variants is first._variants
+    assert changed._variants == {}
+    assert gzip.decompress(same.encoded("gzip")) == first.body
+
+
+async def test_event_cache_shares_one_load_between_concurrent_misses():
+    cache = EventResponseCache(ttl=60)
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return CompressedBody(b"[]")
+
+    bodies = await asyncio.gather(*(cache.get("published", load) for _ in range(10)))
+
+    assert loads == 1
+    assert all(body is bodies[0] for body in bodies)
+    assert await cache.get("published", load) is bodies[0]
+
+
+async def test_event_cache_does_not_store_a_load_started_before_invalidation():
+    cache = EventResponseCache(ttl=60)
+    release = asyncio.Event()
+
+    async def stale():
+        await release.wait()
+        return CompressedBody(b'["old"]')
+
+    pending = asyncio.create_task(cache.get("published", stale))
+    await asyncio.sleep(0)
+    cache.invalidate("published")
+    release.set()
+    assert (await pending).body == b'["old"]'
+
+    async def fresh():
+        return CompressedBody(b'["new"]')
+
+    assert (await cache.get("published", fresh)).body == b'["new"]'
+
+
+async def test_event_cache_does_not_cache_not_found():
+    cache = EventResponseCache(ttl=60)
+    loads = 0
+
+    async def missing():
+        nonlocal loads
+        loads += 1
+        return None
+
+    assert await cache.get("event:00", missing) is None
+    assert await cache.get("event:00", missing) is None
+    assert loads == 2
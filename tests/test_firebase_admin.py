@@ -0,0 +1,16 @@
+import pytest
+
+from core.auth import firebase_admin
+from core.auth.firebase_admin import FirebaseUnavailableError, get_firebase_app
+
+
+def test_missing_credentials_are_reported_once(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(firebase_admin, "FIREBASE_CREDENTIALS_PATH", str(tmp_path / "missing.json"))
+    monkeypatch.setattr(firebase_admin, "_APP", None)
+    monkeypatch.setattr(firebase_admin, "_reported_error", None)
+
+    for _ in range(3):
+        with pytest.raises(FirebaseUnavailableError):
+            get_firebase_app()
+
+    assert capsys.readouterr().out.count("Google login unavailable") == 1
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+from core.users import imports
+
+pytestmark = pytest.mark.anyio
+
+
+class LeaseCollection:
+    """
+    update_one for the lease's filter shapes: {_id, owner} or
+    {_id, $or: [lease_until missing, lease_until < now]}, with upsert.
+    """
+
+    def __init__(self):
+        self.docs: dict = {}
+
+    def _matches(self, doc, query):
+        if "owner" in query and doc.get("owner") != query["owner"]:
+            return False
+        if "$or" in query:
+            now = query["$or"][1]["lease_until"]["$lt"]
+            return "lease_until" not in doc or doc["lease_until"] < now
+        return True
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is None:
+            if upsert:
+                self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+            return
+        if not self._matches(doc, query):
+            if upsert:
+                raise DuplicateKeyError("E11000 duplicate key error", 11000)
+            return
+        doc.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+
+
+@pytest.fixture
+def deployments(monkeypatch):
+    collection = LeaseCollection()
+    monkeypatch.setattr(imports, "deployments_collection", lambda: collection)
+    return collection
+
+
+async def test_second_import_is_refused_while_the_first_runs(deployments):
+    async with imports.import_lease():
+        with pytest.raises(HTTPException) as exc:
+            async with imports.import_lease():
+                pass
+        assert exc.value.status_code == 409
+
+
+async def test_lease_is_released_after_the_import(deployments):
+    async with imports.import_lease():
+        pass
+    assert "lease_until" not in deployments.docs["user_import"]
+
+    async with imports.import_lease():
+        pass
+
+
+async def test_lease_is_released_when_the_import_fails(deployments):
+    with pytest.raises(ValueError):
+        async with imports.import_lease():
+            raise ValueError
+
+    async with imports.import_lease():
+        pass
+
+
+async def test_expired_lease_of_a_dead_worker_is_taken_over(deployments):
+    deployments.docs["user_import"] = {
+        "_id": "user_import",
+        "owner": "dead-worker",
+        "lease_until": datetime(2000, 1, 1, tzinfo=timezone.utc),
+    }
+
+    async with imports.import_lease():
+        assert deployments.docs["user_import"]["owner"] != "dead-worker"
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from core.quiz.leaderboard import Leaderboard, RankIndex
+
+
+def test_rank_index_matches_a_sorted_list():
+    rng = random.Random(7)
+    index, expected = RankIndex(), []
+
+    for _ in range(2000):
+        if expected and rng.random() < 0.4:
+            key = rng.choice(expected)
+            index.remove(key)
+            expected.remove(key)
+        else:
+            key = rng.random()
+            index.insert(key)
+            expected.append(key)
+        expected.sort()
+
+    assert len(index) == len(expected)
+    assert index.first(len(expected)) == expected
+    for position in rng.sample(range(len(expected)), 50):
+        assert index.rank(expected[position]) == position
+
+
+def test_rank_index_remove_missing_key_raises():
+    index = RankIndex()
+    index.insert(1)
+
+    with pytest.raises(KeyError):
+        index.remove(2)
+
+
+def test_leaderboard_orders_by_score_then_latency_then_user_id():
+    board = Leaderboard()
+    board.set("b", 3, 900)
+    board.set("a", 3, 900)
+    board.set("c", 3, 500)
+    board.set("d", 4, 2000)
+
+    assert [user_id for _, user_id, _, _ in board.top(4)] == ["d", "c", "a", "b"]
+    assert board.entry("b") == (4, 3, 900)
+
+
+def test_leaderboard_add_accumulates_and_moves_the_participant():
+    board = Leaderboard()
+    board.set("a", 1, 100)
+    board.set("b", 1, 200)
+
+    board.add("b", 1, 300)
+
+    assert board.entry("b") == (1, 2, 500)
+    assert board.entry("a") == (2, 1, 100)
+    assert board.entry("missing") is None
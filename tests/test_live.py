@@ -0,0 +1,77 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from core.events import live
+from db.codec import encode_id
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def broadcasters():
+    yield
+    live.close_broadcasters()
+
+
+async def add_event(repositories, status: str) -> bytes:
+    key = encode_id(str(uuid4()))
+    await repositories.events.insert({
+        "_id": key,
+        "status": status,
+        "registered_count": 3,
+        "capacity": 10,
+    })
+    return key
+
+
+async def test_published_event_streams_counters(repositories):
+    key = await add_event(repositories, "published")
+
+    broadcaster, queue = await live.subscribe(key)
+
+    frame = queue.get_nowait()
+    assert '"registered_count": 3' in frame and '"seats_left": 7' in frame
+    live.unsubscribe(broadcaster, queue)
+    assert live._broadcasters == {}
+
+
+async def test_draft_event_does_not_stream(repositories):
+    key = await add_event(repositories, "draft")
+
+    assert await live.subscribe(key) is None
+    assert live._broadcasters == {}
+
+
+async def test_missing_event_does_not_stream(repositories):
+    assert await live.subscribe(encode_id(str(uuid4()))) is None
+
+
+async def test_failed_load_raises_instead_of_not_found(repositories, monkeypatch):
+    key = await add_event(repositories, "published")
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("mongo down")
+
+    monkeypatch.setattr(repositories.events, "get", unavailable)
+
+    results = await asyncio.gather(live.subscribe(key), live.subscribe(key), return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert live._broadcasters == {}
+
+
+async def test_unpublishing_ends_the_stream(repositories, monkeypatch):
+    monkeypatch.setattr(live, "LIVE_REFRESH_SECONDS", 0.01)
+    key = await add_event(repositories, "published")
+    _, queue = await live.subscribe(key)
+
+    await repositories.events.update(key, {"status": "draft"})
+
+    async def until_closed():
+        while await queue.get() is not None:
+            pass
+
+    await asyncio.wait_for(until_closed(), 1)
+    assert live._broadcasters == {}
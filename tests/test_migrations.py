@@ -0,0 +1,310 @@
+import copy
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from db.migrations import migrator, schema
+from db.migrations.migrator import SchemaMigrator
+from db.migrations.schema import (
+    current_version,
+    migration,
+    on_read,
+    take_dirty,
+    upgrade,
+    upgrade_update,
+    version_filter,
+    versioned_projection,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+# -------------------------------------------------------------------
+# A sample collection with two steps
+# -------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    """
+    Registers "widgets" (base version 1) with two steps, and puts the
+    global registry back afterwards.
+    """
+    saved = (
+        dict(schema._BASE_VERSIONS),
+        {name: dict(steps) for name, steps in schema._STEPS.items()},
+        {name: set(ids) for name, ids in schema._dirty.items()},
+    )
+    schema.declare("widgets", 1)
+
+    @migration("widgets", 2)
+    def rename_name_to_title(doc):
+        if "name" in doc:
+            doc["title"] = doc.pop("name")
+        return doc
+
+    @migration("widgets", 3)
+    def add_slug(doc):
+        if "title" in doc:
+            doc["slug"] = doc["title"].lower().replace(" ", "-")
+        return doc
+
+    yield
+    schema._BASE_VERSIONS, schema._STEPS, schema._dirty = saved
+
+
+def test_steps_chain_from_the_base_version():
+    doc = {"_id": 1, "name": "Blue Widget", "price": 3}
+
+    upgraded = upgrade("widgets", doc)
+
+    assert upgraded == {"_id": 1, "title": "Blue Widget", "slug": "blue-widget", "price": 3, "schema_version": 3}
+    # the read document is left as it was
+    assert doc == {"_id": 1, "name": "Blue Widget", "price": 3}
+
+
+def test_only_pending_steps_run():
+    doc = {"_id": 1, "title": "Already Renamed", "schema_version": 2}
+
+    assert upgrade("widgets", doc) == {
+        "_id": 1, "title": "Already Renamed", "slug": "already-renamed", "schema_version": 3,
+    }
+
+
+def test_current_document_is_returned_as_is():
+    doc = {"_id": 1, "title": "t", "slug": "t", "schema_version": 3}
+
+    assert upgrade("widgets", doc) is doc
+
+
+def test_duplicate_or_stale_steps_are_refused():
+    with pytest.raises(ValueError):
+        migration("widgets", 3)(lambda doc: doc)
+    with pytest.raises(ValueError):
+        migration("widgets", 1)(lambda doc: doc)
+
+
+def test_gap_in_the_steps_is_an_error():
+    migration("widgets", 5)(lambda doc: doc)
+
+    assert current_version("widgets") == 5
+    with pytest.raises(RuntimeError, match="version 4"):
+        upgrade("widgets", {"_id": 1, "schema_version": 3})
+
+
+def test_projected_reads_fetch_the_version():
+    assert versioned_projection("widgets", {"title": 1}) == {"title": 1, "schema_version": 1}
+    # exclusion projections and full reads already return it
+    assert versioned_projection("widgets", {"_id": 0}) == {"_id": 0}
+    assert versioned_projection("widgets", None) is None
+    # no steps: nothing to do
+    assert versioned_projection("users", {"email": 1}) == {"email": 1}
+
+
+def test_projected_reads_are_upgraded_but_not_written_back():
+    projection = {"name": 1, "title": 1}
+    doc = on_read("widgets", {"_id": 1, "name": "Blue Widget"}, projection)
+
+    assert doc["title"] == "Blue Widget" and doc["schema_version"] == 3
+    assert take_dirty("widgets", 10) == []
+
+
+def test_full_reads_queue_old_documents_for_write_back():
+    on_read("widgets", {"_id": 1, "name": "a"})
+    on_read("widgets", {"_id": 2, "title": "b", "slug": "b", "schema_version": 3})
+
+    assert take_dirty("widgets", 10) == [1]
+
+
+def test_write_back_is_the_diff():
+    before = {"_id": 1, "name": "Blue Widget", "price": 3}
+
+    assert upgrade_update(before, upgrade("widgets", before)) == {
+        "$set": {"title": "Blue Widget", "slug": "blue-widget", "schema_version": 3},
+        "$unset": {"name": ""},
+    }
+    assert upgrade_update(before, before) == {}
+
+
+def test_write_back_is_guarded_by_the_read_version():
+    assert version_filter({"_id": 1, "schema_version": 2}) == {"_id": 1, "schema_version": 2}
+    assert version_filter({"_id": 1}) == {"_id": 1, "schema_version": {"$exists": False}}
+
+
+# -------------------------------------------------------------------
+# The background migrator, on an in-memory collection
+# -------------------------------------------------------------------
+
+
+def _check(present: bool, value, condition: dict) -> bool:
+    for op, arg in condition.items():
+        if op == "$exists":
+            ok = present == arg
+        elif op == "$not":
+            ok = not _check(present, value, arg)
+        elif op == "$in":
+            ok = present and value in arg
+        elif op == "$gt":
+            ok = present and value > arg
+        elif op == "$gte":
+            ok = present and value >= arg
+        elif op == "$lt":
+            ok = present and value < arg
+        else:
+            raise NotImplementedError(op)
+        if not ok:
+            return False
+    return True
+
+
+def matches(doc: dict, query: dict) -> bool:
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, option) for option in condition):
+                return False
+        elif isinstance(condition, dict) and all(op.startswith("$") for op in condition):
+            if not _check(key in doc, doc.get(key), condition):
+                return False
+        elif doc.get(key, ...) != condition:
+            return False
+    return True
+
+
+class Cursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self):
+        return self.docs
+
+
+class FakeCollection:
+    """
+    The slice of AsyncCollection the migrator uses.
+    """
+
+    def __init__(self, docs=()):
+        self.docs = {doc["_id"]: dict(doc) for doc in docs}
+
+    def find(self, query=None, sort=None, limit=0):
+        docs = [copy.deepcopy(doc) for doc in self.docs.values() if matches(doc, query or {})]
+        if sort:
+            docs.sort(key=lambda doc: doc["_id"])
+        return Cursor(docs[:limit] if limit else docs)
+
+    async def count_documents(self, query):
+        return sum(matches(doc, query) for doc in self.docs.values())
+
+    def _update(self, query, update, upsert):
+        doc = next((doc for doc in self.docs.values() if matches(doc, query)), None)
+        if doc is None:
+            if not upsert:
+                return None, 0
+            if query["_id"] in self.docs:
+                raise DuplicateKeyError("E11000 duplicate key error", 11000)
+            doc = self.docs[query["_id"]] = {"_id": query["_id"], **update.get("$setOnInsert", {})}
+
+        doc.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+        return doc, 1
+
+    async def update_one(self, query, update, upsert=False):
+        _, modified = self._update(query, update, upsert)
+        return SimpleNamespace(modified_count=modified)
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        doc, _ = self._update(query, update, upsert)
+        return copy.deepcopy(doc)
+
+    async def bulk_write(self, ops, ordered=True):
+        modified = 0
+        for op in ops:
+            modified += self._update(op._filter, op._doc, op._upsert)[1]
+        return SimpleNamespace(modified_count=modified)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    collections = {
+        "widgets": FakeCollection({"_id": i, "name": f"Widget {i}"} for i in range(1, 6)),
+        "schema_migrations": FakeCollection(),
+    }
+    monkeypatch.setattr(migrator, "get_collection", lambda name: collections[name])
+    monkeypatch.setattr(migrator, "schema_migrations_collection", lambda: collections["schema_migrations"])
+    monkeypatch.setattr(migrator, "MIGRATION_BATCH_SIZE", 2)
+    return collections
+
+
+async def test_walk_upgrades_in_batches_and_checkpoints(db):
+    walker = SchemaMigrator("widgets")
+
+    assert await walker._walk()
+    assert walker.remaining == 3
+    checkpoint = db["schema_migrations"].docs["widgets"]
+    assert checkpoint["last_id"] == 2 and checkpoint["target_version"] == 3
+
+    while await walker._walk():
+        pass
+
+    assert walker.state == "completed" and walker.migrated == 5
+    assert all(doc["schema_version"] == 3 and "name" not in doc for doc in db["widgets"].docs.values())
+
+
+async def test_walk_resumes_from_the_checkpoint(db):
+    await SchemaMigrator("widgets")._walk()
+    # changed behind the checkpoint: a restarted walk must not revisit it
+    db["widgets"].docs[1] = {"_id": 1, "name": "Widget 1"}
+
+    restarted = SchemaMigrator("widgets")
+    while await restarted._walk():
+        pass
+
+    assert restarted.migrated == 5
+    assert db["widgets"].docs[1] == {"_id": 1, "name": "Widget 1"}
+    assert db["widgets"].docs[5]["schema_version"] == 3
+
+
+async def test_new_steps_restart_the_walk(db):
+    await SchemaMigrator("widgets")._walk()
+
+    migration("widgets", 4)(lambda doc: doc)
+    restarted = SchemaMigrator("widgets")
+    while await restarted._walk():
+        pass
+
+    assert all(doc["schema_version"] == 4 for doc in db["widgets"].docs.values())
+
+
+async def test_walk_waits_while_another_worker_holds_the_lease(db, monkeypatch):
+    await SchemaMigrator("widgets")._walk()
+
+    monkeypatch.setattr(migrator, "_WORKER_ID", "another-worker")
+    other = SchemaMigrator("widgets")
+
+    assert not await other._walk()
+    assert other.state == "waiting"
+
+
+async def test_guarded_write_skips_a_document_upgraded_meanwhile(db):
+    walker = SchemaMigrator("widgets")
+    stale = db["widgets"].find({"_id": 1}).docs
+    # another worker upgrades it after our read
+    db["widgets"].docs[1] = {"_id": 1, "title": "Renamed Elsewhere", "slug": "x", "schema_version": 3}
+
+    assert await walker._apply(stale) == 0
+    assert walker.skipped == 1
+    assert db["widgets"].docs[1]["title"] == "Renamed Elsewhere"
+
+
+async def test_documents_read_in_full_are_written_back(db):
+    on_read("widgets", copy.deepcopy(db["widgets"].docs[3]))
+
+    walker = SchemaMigrator("widgets")
+    assert await walker._write_back()
+
+    assert walker.written_back == 1
+    assert db["widgets"].docs[3]["schema_version"] == 3
+    assert not await walker._write_back()
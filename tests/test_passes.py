@@ -0,0 +1,150 @@
+import base64
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from core.attendance import passes
+from core.attendance.passes import issue_pass, pass_expires_at, verify_pass
+
+EXPIRES = datetime(2026, 3, 1, 18, 0, tzinfo=timezone.utc)
+
+
+def use_key(monkeypatch, key: Ed25519PrivateKey) -> None:
+    pem = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    # as in .env: one line with escaped newlines
+    monkeypatch.setenv("PASS_SIGNING_KEY", pem.replace("\n", "\\n"))
+    monkeypatch.setattr(passes, "_private_key", None)
+
+
+@pytest.fixture(autouse=True)
+def signing_key(monkeypatch):
+    use_key(monkeypatch, Ed25519PrivateKey.generate())
+
+
+def b64decode(token: str) -> bytes:
+    return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+
+
+def b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def test_round_trip():
+    event_id = str(uuid4())
+    token = issue_pass(event_id, "12345678", EXPIRES)
+
+    claims = verify_pass(token, at=EXPIRES - timedelta(hours=1))
+
+    assert claims.event_id == event_id
+    assert claims.university_uid == "12345678"
+    assert claims.expires_at == EXPIRES
+    # fits comfortably in a QR code
+    assert len(token) < 140
+
+
+def test_expired_pass_is_rejected():
+    token = issue_pass(str(uuid4()), "12345678", EXPIRES)
+
+    assert verify_pass(token, at=EXPIRES).expires_at == EXPIRES
+    with pytest.raises(ValueError, match="expired"):
+        verify_pass(token, at=EXPIRES + timedelta(seconds=1))
+
+
+def test_grace_period_covers_late_check_outs(monkeypatch):
+    monkeypatch.setattr(passes, "PASS_GRACE_HOURS", 6)
+    event_end = datetime(2026, 3, 1, 12, 0)
+
+    expires_at = pass_expires_at(event_end)
+    token = issue_pass(str(uuid4()), "12345678", expires_at)
+
+    assert expires_at == datetime(2026, 3, 1, 18, 0, tzinfo=timezone.utc)
+    verify_pass(token, at=expires_at - timedelta(minutes=1))
+    with pytest.raises(ValueError, match="expired"):
+        verify_pass(token, at=expires_at + timedelta(minutes=1))
+
+
+@pytest.mark.parametrize("offset", [0, 1, 17, 21, 23, -1, -64])
+def test_any_flipped_byte_is_rejected(offset):
+    data = bytearray(b64decode(issue_pass(str(uuid4()), "12345678", EXPIRES)))
+    data[offset] ^= 0x01
+
+    with pytest.raises(ValueError):
+        verify_pass(b64encode(bytes(data)), at=EXPIRES - timedelta(hours=1))
+
+
+def test_swapped_university_uid_is_rejected():
+    data = b64decode(issue_pass(str(uuid4()), "12345678", EXPIRES))
+    forged = data.replace(b"12345678", b"87654321")
+
+    with pytest.raises(ValueError, match="signature"):
+        verify_pass(b64encode(forged), at=EXPIRES - timedelta(hours=1))
+
+
+def test_extended_expiry_is_rejected():
+    data = bytearray(b64decode(issue_pass(str(uuid4()), "12345678", EXPIRES)))
+    # expires_at follows the version byte and the 16-byte event id
+    data[17:21] = int((EXPIRES + timedelta(days=365)).timestamp()).to_bytes(4, "big")
+
+    with pytest.raises(ValueError, match="signature"):
+        verify_pass(b64encode(bytes(data)), at=EXPIRES)
+
+
+def test_pass_signed_with_another_key_is_rejected(monkeypatch):
+    token = issue_pass(str(uuid4()), "12345678", EXPIRES)
+    use_key(monkeypatch, Ed25519PrivateKey.generate())
+
+    with pytest.raises(ValueError, match="signature"):
+        verify_pass(token, at=EXPIRES - timedelta(hours=1))
+
+
+@pytest.mark.parametrize("token", ["", "not-a-pass", "@@@@", b64encode(b"\x01" * 40)])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(ValueError):
+        verify_pass(token)
+
+
+def test_truncated_and_padded_passes_are_rejected():
+    data = b64decode(issue_pass(str(uuid4()), "12345678", EXPIRES))
+
+    for forged in (data[:-1], data + b"\x00", data[:-65] + data[-64:]):
+        with pytest.raises(ValueError):
+            verify_pass(b64encode(forged), at=EXPIRES - timedelta(hours=1))
+
+
+def test_unknown_version_is_rejected():
+    data = bytearray(b64decode(issue_pass(str(uuid4()), "12345678", EXPIRES)))
+    data[0] = 2
+
+    with pytest.raises(ValueError, match="Malformed"):
+        verify_pass(b64encode(bytes(data)), at=EXPIRES - timedelta(hours=1))
+
+
+def test_missing_signing_key_is_a_configuration_error(monkeypatch):
+    monkeypatch.delenv("PASS_SIGNING_KEY")
+    monkeypatch.setattr(passes, "_private_key", None)
+
+    with pytest.raises(RuntimeError):
+        issue_pass(str(uuid4()), "12345678", EXPIRES)
+
+
+def test_non_ed25519_key_is_refused(monkeypatch):
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    pem = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    monkeypatch.setenv("PASS_SIGNING_KEY", pem)
+    monkeypatch.setattr(passes, "_private_key", None)
+
+    with pytest.raises(RuntimeError, match="Ed25519"):
+        issue_pass(str(uuid4()), "12345678", EXPIRES)
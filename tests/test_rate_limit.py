@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.security import rate_limit
+from core.security.rate_limit import MemoryRateLimitStore, RateLimiter, normalize_email
+
+pytestmark = pytest.mark.anyio
+
+# a window boundary for 60 s windows
+START = 1_000_020.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=START)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def limiter(limit: int = 3, window: int = 60) -> RateLimiter:
+    return RateLimiter(MemoryRateLimitStore(), {"ip": (limit, window), "email": (limit, window)})
+
+
+async def test_allows_up_to_the_limit(clock):
+    limits = limiter()
+
+    for _ in range(3):
+        assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+
+    clock.value += 15
+    assert await limits.check("login", {"ip": "10.0.0.1"}) == 45
+    assert limits.limited == {"login:ip": 1}
+
+
+async def test_rejected_attempts_are_not_counted(clock):
+    limits = limiter(limit=2)
+    for _ in range(2):
+        await limits.check("login", {"ip": "10.0.0.1"})
+    for _ in range(5):
+        assert await limits.check("login", {"ip": "10.0.0.1"}) is not None
+
+    # previous window (2) weighted by its overlap: 2 * 0.5 = 1 < 2
+    clock.value += 90
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+    # 1 + 1 = 2: full again
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is not None
+
+
+async def test_previous_window_weighs_by_its_overlap(clock):
+    limits = limiter(limit=4)
+    for _ in range(4):
+        await limits.check("login", {"ip": "10.0.0.1"})
+
+    # 15 s into the next window: 4 * 0.75 = 3 < 4, one more fits
+    clock.value += 75
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+    assert await limits.check("login", {"ip": "10.0.0.1"}) == 45
+
+    # 45 s in: 4 * 0.25 + 1 = 2, two more fit
+    clock.value += 30
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+    assert await limits.check("login", {"ip": "10.0.0.1"}) == 15
+
+
+async def test_windows_older_than_one_window_are_forgotten(clock):
+    limits = limiter(limit=1)
+    await limits.check("login", {"ip": "10.0.0.1"})
+
+    clock.value += 120
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+
+
+async def test_any_identity_over_its_limit_rejects_and_counts_none(clock):
+    limits = limiter(limit=2)
+    for ip in ("10.0.0.1", "10.0.0.2"):
+        await limits.check("login", {"ip": ip, "email": "a@example.com"})
+
+    # the email budget is spent; the new IP must not be charged for it
+    assert await limits.check("login", {"ip": "10.0.0.3", "email": "a@example.com"}) is not None
+    assert await limits.check("login", {"ip": "10.0.0.3"}) is None
+    assert await limits.check("login", {"ip": "10.0.0.3"}) is None
+    assert await limits.check("login", {"ip": "10.0.0.3"}) is not None
+
+
+async def test_scopes_have_separate_budgets(clock):
+    limits = limiter(limit=1)
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+    assert await limits.check("register", {"ip": "10.0.0.1"}) is None
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is not None
+
+
+async def test_memory_store_evicts_least_recently_used(clock):
+    store = MemoryRateLimitStore(max_keys=2)
+    await store.hit([("a", START + 60)], [])
+    await store.hit([("b", START + 60)], [])
+    await store.hit([("a", START + 60)], [])
+    await store.hit([("c", START + 60)], [])
+
+    assert store.evicted == 1
+    assert await store.hit([("a", START + 60)], ["b"]) == {"a": 3}
+
+
+async def test_store_errors_fail_open(clock):
+    class BrokenStore(MemoryRateLimitStore):
+        async def hit(self, windows, previous):
+            raise ConnectionError("down")
+
+    limits = RateLimiter(BrokenStore(), {"ip": (1, 60)})
+    assert await limits.check("login", {"ip": "10.0.0.1"}) is None
+    assert limits.errors == 1
+
+
+def test_normalize_email_folds_case_and_plus_tags():
+    assert normalize_email(" Jane.Doe+spam@Example.COM ") == "jane.doe@example.com"
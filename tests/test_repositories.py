@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from db.codec import encode_id
+
+pytestmark = pytest.mark.anyio
+
+
+def user(email: str, university_uid: str) -> dict:
+    return {"_id": encode_id(uuid4()), "email": email, "university_uid": university_uid}
+
+
+def token(token_hash: str, user_id, expires_in: timedelta, device_id: str = "device-1") -> dict:
+    return {
+        "token_hash": token_hash,
+        "user_id": user_id,
+        "device_id": device_id,
+        "revoked": False,
+        "expires_at": datetime.now(timezone.utc) + expires_in,
+    }
+
+
+async def test_duplicate_user_email_raises_duplicate_key_error(repositories):
+    await repositories.users.insert(user("a@example.com", "U1"))
+
+    with pytest.raises(DuplicateKeyError) as error:
+        await repositories.users.insert(user("a@example.com", "U2"))
+
+    assert error.value.code == 11000
+    assert error.value.details["keyPattern"] == {"email": 1}
+    assert error.value.details["keyValue"] == {"email": "a@example.com"}
+
+
+async def test_duplicate_university_uid_names_its_index(repositories):
+    await repositories.users.insert(user("a@example.com", "U1"))
+
+    with pytest.raises(DuplicateKeyError) as error:
+        await repositories.users.insert(user("b@example.com", "U1"))
+
+    assert error.value.details["keyPattern"] == {"university_uid": 1}
+
+
+async def test_update_into_a_taken_email_is_rejected(repositories):
+    first, second = user("a@example.com", "U1"), user("b@example.com", "U2")
+    await repositories.users.insert(first)
+    await repositories.users.insert(second)
+
+    with pytest.raises(DuplicateKeyError):
+        await repositories.users.update(second["_id"], {"email": "a@example.com"})
+
+    assert (await repositories.users.get(second["_id"]))["email"] == "b@example.com"
+
+
+async def test_unordered_insert_many_reports_duplicates_like_mongo(repositories):
+    event_id = encode_id(uuid4())
+    await repositories.registrations.insert({"event_id": event_id, "university_uid": "U1"})
+
+    with pytest.raises(BulkWriteError) as error:
+        await repositories.registrations.insert_many([
+            {"event_id": event_id, "university_uid": "U1"},
+            {"event_id": event_id, "university_uid": "U2"},
+            {"event_id": event_id, "university_uid": "U2"},
+            {"event_id": event_id, "university_uid": "U3"},
+        ])
+
+    details = error.value.details
+    assert [e["index"] for e in details["writeErrors"]] == [0, 2]
+    assert all(e["code"] == 11000 for e in details["writeErrors"])
+    assert details["writeErrors"][0]["keyPattern"] == {"event_id": 1, "university_uid": 1}
+    # unordered: the rest of the batch is still written
+    assert details["nInserted"] == 2
+    assert await repositories.registrations.exists(event_id, "U3")
+
+
+async def test_projection_matches_mongo(repositories):
+    doc = user("a@example.com", "U1")
+    await repositories.users.insert({**doc, "password_hash": "secret"})
+
+    included = await repositories.users.get(doc["_id"], {"email": 1})
+    assert included == {"_id": doc["_id"], "email": "a@example.com"}
+
+    excluded = await repositories.users.get(doc["_id"], {"password_hash": 0, "_id": 0})
+    assert excluded == {"email": "a@example.com", "university_uid": "U1"}
+
+
+async def test_expired_refresh_tokens_are_gone(repositories):
+    user_id = encode_id(uuid4())
+    tokens = repositories.refresh_tokens
+    await tokens.insert(token("expired", user_id, timedelta(seconds=-1)))
+    await tokens.insert(token("active", user_id, timedelta(days=7)))
+
+    now = datetime.now(timezone.utc)
+    assert await tokens.find_active("expired", now) is None
+    assert (await tokens.find_active("active", now))["token_hash"] == "active"
+
+    # the expired hash can be reused, as after the TTL index removed it
+    await tokens.insert(token("expired", user_id, timedelta(days=7)))
+
+
+async def test_device_has_no_active_token_once_all_expire(repositories):
+    user_id = encode_id(uuid4())
+    tokens = repositories.refresh_tokens
+    await tokens.insert(token("soon", user_id, timedelta(seconds=-1)))
+
+    assert not await tokens.has_active_device(user_id, "device-1")
+
+    await tokens.insert(token("later", user_id, timedelta(days=7)))
+    assert await tokens.has_active_device(user_id, "device-1")
+
+    await tokens.revoke("later")
+    assert not await tokens.has_active_device(user_id, "device-1")
+
+
+async def test_rotated_expiry_is_honoured(repositories):
+    user_id = encode_id(uuid4())
+    tokens = repositories.refresh_tokens
+    await tokens.insert(token("rotating", user_id, timedelta(days=7)))
+
+    await tokens.update("rotating", {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+
+    assert await tokens.find_active("rotating", datetime.now(timezone.utc)) is None
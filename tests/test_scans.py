@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+
+from core.attendance.scans import scan_time
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_missing_scan_time_is_now():
+    assert scan_time(None, NOW) == NOW
+
+
+def test_naive_scan_time_is_taken_as_utc():
+    scanned_at = scan_time(datetime(2026, 3, 1, 11, 30), NOW)
+
+    assert scanned_at == datetime(2026, 3, 1, 11, 30, tzinfo=timezone.utc)
+    assert scanned_at.tzinfo is timezone.utc
+
+
+def test_other_timezones_are_converted_to_utc():
+    ist = timezone(timedelta(hours=5, minutes=30))
+
+    scanned_at = scan_time(datetime(2026, 3, 1, 17, 0, tzinfo=ist), NOW)
+
+    assert scanned_at == datetime(2026, 3, 1, 11, 30, tzinfo=timezone.utc)
+    assert scanned_at.tzinfo is timezone.utc
+
+
+def test_future_scan_time_is_capped_at_now():
+    assert scan_time(NOW + timedelta(hours=2), NOW) == NOW
+    assert scan_time((NOW + timedelta(minutes=5)).replace(tzinfo=None), NOW) == NOW